@@ -223,3 +223,83 @@ window.updateProgressBar = (progress_bar_id, progress) => {
 // }
 
 //#endregion
+
+//#region Background jobs
+
+// Jobs which are pending or running, by job ID. Each has a line in the
+// progress modal with a cancel button.
+const running_jobs = {};
+
+function job_line(job) {
+    const line = document.createElement('p');
+    line.classList.add('job_status');
+
+    const text = document.createElement('span');
+    line.appendChild(text);
+
+    const cancel_button = document.createElement('button');
+    cancel_button.type = 'button';
+    cancel_button.classList.add('btn', 'btn-sm', 'btn-outline-danger', 'ms-2');
+    cancel_button.innerText = 'Cancel';
+    cancel_button.addEventListener('click', () => {
+        cancel_button.disabled = true;
+        window.pywebview.api.cancel_job(job.job_id);
+    });
+    line.appendChild(cancel_button);
+
+    progress_modal_text_element.appendChild(line);
+    return line;
+}
+
+/**
+ * job_update
+ *
+ * Called from python whenever a background job starts, makes progress or
+ * finishes. Other components can listen for the `lawchecker-job` event.
+ *
+ * @param {object} job
+ */
+window.job_update = (job) => {
+    window.dispatchEvent(new CustomEvent('lawchecker-job', { detail: job }));
+
+    if (job.state === 'pending' || job.state === 'running') {
+        if (!progress_modal._isShown) {
+            progress_modal.show();
+        }
+        const line = running_jobs[job.job_id] ?? job_line(job);
+        running_jobs[job.job_id] = line;
+
+        let text = `${job.name}: ${job.message || job.state}`;
+        if (job.percent !== null) {
+            text += ` (${job.percent}%)`;
+        }
+        line.querySelector('span').innerText = text;
+        return;
+    }
+
+    // finished
+    const line = running_jobs[job.job_id];
+    delete running_jobs[job.job_id];
+    if (line) {
+        line.remove();
+    }
+
+    if (job.state === 'done') {
+        // e.g. 'Report created successfully.'
+        if (typeof job.result === 'string' && job.result) {
+            progress_modal_update(`${job.name}: ${job.result}`);
+        } else {
+            progress_modal_update(`${job.name} finished.`);
+        }
+    } else if (job.state === 'failed') {
+        progress_modal_update(`ERROR: ${job.name} failed: ${job.error}`);
+    } else if (job.state === 'cancelled') {
+        progress_modal_update(`${job.name} cancelled.`);
+    }
+
+    if (Object.keys(running_jobs).length === 0) {
+        enable_progress_modal_ok_button_element();
+    }
+}
+
+//#endregion
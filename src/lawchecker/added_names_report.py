@@ -9,14 +9,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from lawchecker import (
-    anr_post_processing_html,
-    anr_spo_rest,
-    lawchecker_logger,
-    settings,
-)
+from lawchecker import lawchecker_logger, settings
 from lawchecker.lawchecker_logger import logger
-from lawchecker.settings import GLOBAL_VARS, HTML_TEMPLATE
+from lawchecker.settings import GLOBAL_VARS
 
 
 def main():
@@ -63,6 +58,13 @@ def main():
         default=settings.DEFAULT_OUTPUT_NAME,
     )
 
+    parser.add_argument(
+        '--debug-files',
+        action='store_true',
+        help='Also save the intermediate XML and a copy of the input XML '
+        'in the report folder.',
+    )
+
     args = parser.parse_args(sys.argv[1:])
 
     input_Path = Path(args.file.name)
@@ -76,6 +78,7 @@ def main():
         input_Path,
         parameter=marshal,
         output_file_name=args.output,
+        debug_files=args.debug_files,
     )
 
 
@@ -107,9 +110,21 @@ def run_xslts(
     input_Path: Path,
     parameter: Optional[Path] = None,
     output_file_name: str = settings.DEFAULT_OUTPUT_NAME,
+    debug_files: bool = False,
 ):
+    """
+    Create the added names report. The dashboard XML is parsed once and
+    passed between the transformations in memory. If debug_files is True
+    the intermediate XML and a copy of the input are saved too.
+    """
+    # imported here so that the command line help is quick
+    from lawchecker import anr_post_processing_html, anr_spo_rest, mnis_members
+
     logger.info(f'{input_Path=} {parameter=}')
 
+    # download the member list (if needed) while the report is built
+    mnis_members.get_member_cache().start_refresh()
+
     formated_date = extract_date(input_Path)
 
     intermediate_file_name = f'{formated_date}_intermediate.xml'
@@ -117,7 +132,8 @@ def run_xslts(
 
     if GLOBAL_VARS.anr_working_folder is None:
         # TODO: change this it should not be formatted date and instead should just have the date
-        dated_folder_Path = settings.REPORTS_FOLDER.joinpath(formated_date).resolve()
+        reports_folder = settings.get_settings().reports_folder
+        dated_folder_Path = reports_folder.joinpath(formated_date).resolve()
     else:
         dated_folder_Path = GLOBAL_VARS.anr_working_folder.resolve()
 
@@ -131,20 +147,26 @@ def run_xslts(
 
     logger.info(f'{intermediate_Path=}   {out_html_Path=}')
 
-    # Resave the input file
-    resave_Path = xml_folder_Path.joinpath(input_file_resave_name)
-    if input_Path != resave_Path:
-        shutil.copy(input_Path, resave_Path)
-    logger.info(f'Resaved: {resave_Path}')
+    if debug_files:
+        # Resave the input file
+        resave_Path = xml_folder_Path.joinpath(input_file_resave_name)
+        if input_Path != resave_Path:
+            shutil.copy(input_Path, resave_Path)
+        logger.info(f'Resaved: {resave_Path}')
 
     # --- 1st Transformation - Intermediate XML ---
     logger.info('Running first transformation')
-    anr_spo_rest.main(str(input_Path), str(intermediate_Path))
+    intermediate_root = anr_spo_rest.stream_transform(str(input_Path))
+    if debug_files:
+        anr_spo_rest.save_intermediate(intermediate_root, intermediate_Path)
 
     # --- 2nd Transformation - HTML report ---
     logger.info('Running second transformation')
     anr_post_processing_html.main(
-        str(HTML_TEMPLATE), str(intermediate_Path), str(parameter), str(out_html_Path)
+        str(settings.get_settings().html_template),
+        intermediate_root,
+        str(parameter),
+        str(out_html_Path),
     )
 
     # --- Finished Transforms ---
@@ -0,0 +1,145 @@
+"""
+Compressed, line-delimited storage for amendments downloaded from the
+Bills API.
+
+The JSON made by check_web_amdts.get_amendments_detailed_json is a single
+object with some bill and stage metadata and a (large) list of amendments
+in 'items'. Saved as indented JSON this can be tens of megabytes and has to
+be read into memory in one go before any amendment can be parsed.
+
+Instead, amendments are saved as gzip compressed JSON lines:
+
+    {"format": "lawchecker-amdts", "version": 1, "billId": ..., ...}
+    {"amendmentId": ..., ...}
+    {"amendmentId": ..., ...}
+
+The first line is a header record holding everything except the items.
+Every following line is one amendment, so files can be read one amendment
+at a time and passed straight on to AmdtContainer.from_json.
+
+Plain .json files written by older versions are still read.
+"""
+
+import gzip
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+FORMAT_NAME = 'lawchecker-amdts'
+FORMAT_VERSION = 1
+
+# suffix used for the compressed format
+SUFFIX = '.jsonl.gz'
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# a modest compression level. Level 9 is much slower for very little gain
+COMPRESS_LEVEL = 6
+
+
+def is_compressed(path: Path) -> bool:
+    """True if the file at path is gzip compressed (whatever its name)."""
+
+    with open(path, 'rb') as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+def with_suffix(path: Path) -> Path:
+    """Return path with the suffix of the compressed format."""
+
+    name = path.name
+    for suffix in (SUFFIX, '.json'):
+        if name.endswith(suffix):
+            name = name.removesuffix(suffix)
+            break
+    return path.with_name(name + SUFFIX)
+
+
+def save_amdts(json_data: dict[str, Any], path: Path) -> None:
+    """
+    Save amendments JSON. Paths ending .json are written as (indented)
+    plain JSON, anything else is written in the compressed format.
+    """
+
+    path = Path(path)
+
+    if path.suffix == '.json':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(json_data, f, indent=2, ensure_ascii=False)
+        return
+
+    header = {key: value for key, value in json_data.items() if key != 'items'}
+    header = {'format': FORMAT_NAME, 'version': FORMAT_VERSION, **header}
+
+    # write to a temporary file so a failed save does not
+    # destroy the file from a previous run
+    tmp_path = path.with_name(path.name + '.tmp')
+    with gzip.open(
+        tmp_path, 'wt', encoding='utf-8', compresslevel=COMPRESS_LEVEL
+    ) as f:
+        f.write(_dumps(header))
+        for item in json_data.get('items') or []:
+            f.write(_dumps(item))
+
+    tmp_path.replace(path)
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def iter_amdts(path: Path) -> tuple[dict[str, Any], Iterator[dict[str, Any]]]:
+    """
+    Read the header of a compressed amendments file and return it with an
+    iterator over the amendments. The amendments are read from the file as
+    the iterator is consumed.
+
+    Raises:
+        ValueError: if the file is not in the expected format
+    """
+
+    f = gzip.open(path, 'rt', encoding='utf-8')
+    try:
+        header = json.loads(f.readline() or 'null')
+        if not isinstance(header, dict) or header.get('format') != FORMAT_NAME:
+            raise ValueError(f'{path} is not a compressed amendments file')
+        if header.get('version', 0) > FORMAT_VERSION:
+            raise ValueError(
+                f'{path} was saved by a newer version of lawchecker'
+                f' (format version {header["version"]})'
+            )
+    except BaseException:
+        f.close()
+        raise
+
+    del header['format']
+    del header['version']
+
+    def items() -> Iterator[dict[str, Any]]:
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, items()
+
+
+def load_amdts(path: Path, stream: bool = False) -> dict[str, Any]:
+    """
+    Load amendments JSON saved by save_amdts, in either format.
+
+    The result has the same shape as the JSON returned by
+    get_amendments_detailed_json. If stream is True and the file is
+    compressed, 'items' is an iterator which reads amendments from the file
+    as it is consumed (so can only be used once), otherwise it is a list.
+    """
+
+    path = Path(path)
+
+    if not is_compressed(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    header, items = iter_amdts(path)
+    return {**header, 'items': items if stream else list(items)}
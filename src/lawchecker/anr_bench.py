@@ -0,0 +1,168 @@
+"""
+Benchmark the added names report transformations on a synthetic SharePoint
+export.
+
+The export has the same shape as the XML downloaded from the added names
+dashboard, with rows made up from a small pool of realistic cell values (in
+real exports the same amendment numbers and names recur constantly).
+
+    python -m lawchecker.anr_bench --rows 20000
+    python -m lawchecker.anr_bench --rows 5000 --save export.xml
+"""
+
+import argparse
+import io
+import random
+import time
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+from lawchecker import anr_spo_rest
+
+FEED_START = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<feed xml:base="https://example.sharepoint.com/sites/example/_api/"'
+    ' xmlns="http://www.w3.org/2005/Atom"'
+    ' xmlns:d="http://schemas.microsoft.com/ado/2007/08/dataservices"'
+    ' xmlns:m="http://schemas.microsoft.com/ado/2007/08/dataservices/metadata">'
+    '<id>08d8f344-881b-40a1-af13-b4f917c83362</id><title />'
+    '<updated>2023-06-28T18:15:20Z</updated>'
+)
+
+BILLS = [
+    'Victims and Prisoners Bill',
+    'Energy Bill [HL]',
+    'Online Safety Bill',
+    'Levelling-up and Regeneration Bill',
+    "Renters' Reform Bill",
+]
+
+AMENDMENTS = [
+    'NC1',
+    '3',
+    '3, 4 and 7',
+    'Amendments 12-15',
+    'NC3 to NC5',
+    'New clause 2',
+    'Amdt 42',
+    '101–104, NC7',
+    'NS1',
+    '5 (if not moved)',
+    'Amendments 20, 21, 22 and New Clauses 9 to 11',
+]
+
+NAMES = [
+    'Tulip Siddiq',
+    'Layla Moran\nSarah Champion',
+    'Wera Hobhouse, Ian Lavery MP',
+    '- Rosie Duffield\n- Kim Leadbeater',
+    'Sir Stephen Timms and Dame Diana Johnson',
+    'Mr Tobias Ellwood',
+    'Carolyn Harris, Richard Thomson, Stella Creasy',
+]
+
+COMMENTS = [
+    None,
+    None,
+    'Checked with the member’s office.',
+    'Name to be added to all three amendments.\nPlease check NC3 as well.',
+]
+
+
+def _cell(name: str, value: str | None) -> str:
+    if value is None:
+        return f'<d:{name} m:null="true" />'
+    return f'<d:{name}>{escape(value)}</d:{name}>'
+
+
+def synthetic_entry(row_id: int, rng: random.Random) -> str:
+    names_to_remove = rng.choice([None, None, None, 'Tulip Siddiq'])
+    properties = ''.join(
+        (
+            '<d:FileSystemObjectType m:type="Edm.Int32">0</d:FileSystemObjectType>',
+            f'<d:Id m:type="Edm.Int32">{row_id}</d:Id>',
+            _cell('Bill', rng.choice(BILLS)),
+            _cell('Amendments', rng.choice(AMENDMENTS)),
+            _cell('Names', rng.choice(NAMES)),
+            _cell('Namestoremove', names_to_remove),
+            _cell('Comments', rng.choice(COMMENTS)),
+            '<d:PPU_x002d_omitfromreport m:type="Edm.Boolean">'
+            f'{"true" if rng.random() < 0.05 else "false"}'
+            '</d:PPU_x002d_omitfromreport>',
+            f'<d:ID m:type="Edm.Int32">{row_id}</d:ID>',
+        )
+    )
+    return (
+        '<entry m:etag="&quot;2&quot;">'
+        f'<id>entry-{row_id}</id><title /><updated>2023-06-28T18:15:20Z</updated>'
+        '<author><name /></author>'
+        f'<content type="application/xml"><m:properties>{properties}'
+        '</m:properties></content></entry>'
+    )
+
+
+def synthetic_export(rows: int, seed: int = 0) -> bytes:
+    """A SharePoint (OData Atom) export of the added names list with rows rows."""
+
+    rng = random.Random(seed)
+    entries = (synthetic_entry(row_id, rng) for row_id in range(1, rows + 1))
+    return f'{FEED_START}{"".join(entries)}</feed>'.encode('utf-8')
+
+
+def bench(rows: int, repeat: int, seed: int = 0, save: Path | None = None) -> None:
+    export = synthetic_export(rows, seed)
+    if save is not None:
+        save.write_bytes(export)
+        print(f'Saved: {save}')
+
+    print(f'{rows} rows, {len(export) / 1024 / 1024:.1f} MB')
+
+    start = time.perf_counter()
+    tree = etree.ElementTree(etree.fromstring(export))
+    print(f'Parse:     {time.perf_counter() - start:.3f}s')
+
+    timings = []
+    for _ in range(repeat):
+        anr_spo_rest.clear_token_cache()
+        start = time.perf_counter()
+        anr_spo_rest.transform(tree)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f'Transform: {best:.3f}s best of {repeat} ({rows / best:,.0f} rows/s)')
+
+    timings = []
+    for _ in range(repeat):
+        anr_spo_rest.clear_token_cache()
+        start = time.perf_counter()
+        anr_spo_rest.stream_transform(io.BytesIO(export))
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(
+        f'Stream parse and transform: {best:.3f}s best of {repeat}'
+        f' ({rows / best:,.0f} rows/s)'
+    )
+    for name, info in anr_spo_rest.token_cache_info().items():
+        print(f'  {name}: {info.hits} hits, {info.misses} misses')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the added names report on a synthetic export.'
+    )
+    parser.add_argument('--rows', type=int, default=20_000, help='Rows in the export')
+    parser.add_argument('--repeat', type=int, default=3, help='Times to run')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument(
+        '--save', type=Path, help='Also save the synthetic export to this file'
+    )
+    args = parser.parse_args()
+
+    bench(args.rows, args.repeat, args.seed, args.save)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Index of the marshalling XML (from LawMaker) used by the added names report.
+
+The index is built in a single pass over each marshal file and records, for
+each bill, the amendment numbers in marshalled order and the names of the
+proposer and supporters of each amendment. Ordering the report and adding the
+ticks and crosses are then dictionary lookups rather than XPath queries over
+every file for every name.
+
+The marshal files are parsed once per run, on a thread pool (lxml releases
+the GIL while parsing). Files for bills which are not in the dashboard data
+are skipped after reading only their header.
+"""
+
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from lxml import etree
+
+from lawchecker.lawchecker_logger import logger
+from lawchecker.mnis_members import normalise_name
+
+UKL_DNUM = '{https://www.legislation.gov.uk/namespaces/UK-AKN}dnum'
+SPONSOR_BLOCKS = ('proposer', 'supporters')
+
+
+def normalise_title(title: str) -> str:
+    return ' '.join(title.replace('’', "'").split())
+
+
+def _local_name(element) -> str:
+    return etree.QName(element).localname
+
+
+def _bill_title(root) -> str | None:
+    for concept in root.iter('{*}TLCConcept'):
+        if concept.get('eId') == 'varBillTitle':
+            return concept.get('showAs')
+    return None
+
+
+def sniff_bill_title(file_path: str | Path) -> str | None:
+    """
+    Read the bill title from the <meta> at the top of a marshal file without
+    parsing the rest of the file.
+    """
+
+    context = etree.iterparse(
+        str(file_path), events=('end',), tag=('{*}TLCConcept', '{*}meta')
+    )
+    try:
+        for _, element in context:
+            if _local_name(element) == 'meta':
+                # the first meta is the document's, and has been read
+                return None
+            if element.get('eId') == 'varBillTitle':
+                return element.get('showAs')
+    finally:
+        del context
+    return None
+
+
+def _parse_marshal_file(file_path: Path, bill_titles: set[str] | None):
+    """Parse file_path, or return None if it is for a bill we don't need."""
+
+    if bill_titles is not None:
+        try:
+            bill_title = sniff_bill_title(file_path)
+        except etree.XMLSyntaxError:
+            # let the full parse report the error
+            bill_title = None
+        if bill_title and normalise_title(bill_title) not in bill_titles:
+            logger.info(f'Skipped XML file for {bill_title}: {file_path}')
+            return None
+
+    try:
+        tree = etree.parse(str(file_path))
+    except etree.XMLSyntaxError as e:
+        logger.error(f'Failed to parse XML file at {file_path}: {e}')
+        return None
+    except Exception as e:
+        logger.error(f'Unexpected error while loading {file_path}: {e}')
+        return None
+
+    logger.info(f'Loaded XML file: {file_path}')
+    return tree
+
+
+def load_marshal_files(
+    folder_path: str | Path,
+    bill_titles: Iterable[str] | None = None,
+    max_workers: int | None = None,
+) -> list[etree._ElementTree]:
+    """
+    Parse the XML files in folder_path, in parallel. If bill_titles is
+    given, files for other bills are skipped. Trees are returned in file
+    name order.
+    """
+
+    folder = Path(folder_path)
+    xml_files = sorted(folder.glob('*.xml')) if folder.is_dir() else []
+
+    if not xml_files:
+        logger.info(f'No XML files found in the folder: {folder_path}')
+        return []
+
+    wanted = None
+    if bill_titles is not None:
+        wanted = {normalise_title(title) for title in bill_titles}
+
+    if max_workers is None:
+        max_workers = min(len(xml_files), (os.cpu_count() or 1) + 4)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        trees = executor.map(
+            _parse_marshal_file, xml_files, [wanted] * len(xml_files)
+        )
+        return [tree for tree in trees if tree is not None]
+
+
+@dataclass
+class BillAmendments:
+    # amendment numbers in marshalled order
+    order: list[str] = field(default_factory=list)
+    # amendment number -> normalised names of the proposer and supporters
+    names: dict[str, set[str]] = field(default_factory=dict)
+
+
+@dataclass
+class MarshalIndex:
+    # normalised bill title -> amendments
+    bills: dict[str, BillAmendments] = field(default_factory=dict)
+    # names of the marshal files indexed
+    files: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_trees(cls, trees) -> 'MarshalIndex':
+        index = cls()
+        for tree in trees:
+            index.add(tree)
+        return index
+
+    @classmethod
+    def from_folder(
+        cls, folder_path: str | Path, bill_titles: Iterable[str] | None = None
+    ) -> 'MarshalIndex':
+        """Load and index the marshal files in folder_path."""
+        return cls.from_trees(load_marshal_files(folder_path, bill_titles))
+
+    def add(self, tree) -> None:
+        """Add a parsed marshal file to the index."""
+
+        root = tree.getroot() if isinstance(tree, etree._ElementTree) else tree
+        file_name = Path(root.base).name if root.base else 'Unknown file'
+        self.files.append(file_name)
+
+        bill_title = _bill_title(root)
+        if not bill_title:
+            logger.debug(f'No bill-title found in {file_name}')
+            return
+
+        bill = self.bills.setdefault(normalise_title(bill_title), BillAmendments())
+
+        for body in root.iter('{*}amendmentBody'):
+            num = next((n for n in body.iter('{*}num') if n.get(UKL_DNUM)), None)
+            if num is None or not num.text:
+                continue
+            amendment_number = num.text.strip()
+
+            names = bill.names.get(amendment_number)
+            if names is None:
+                bill.order.append(amendment_number)
+                names = bill.names[amendment_number] = set()
+
+            for block in body.iterfind('{*}amendmentHeading/{*}block'):
+                if block.get('name') not in SPONSOR_BLOCKS:
+                    continue
+                for sponsor in block:
+                    if not isinstance(sponsor.tag, str):
+                        continue
+                    if _local_name(sponsor) in ('docIntroducer', 'docProponent'):
+                        if sponsor.text:
+                            names.add(normalise_name(sponsor.text))
+
+        logger.debug(
+            f'Indexed {len(bill.order)} amendments to {bill_title} from {file_name}'
+        )
+
+    def bill(self, bill_title: str) -> BillAmendments | None:
+        return self.bills.get(normalise_title(bill_title))
+
+    def marshalled_order(self, bill_title: str) -> list[str]:
+        bill = self.bill(bill_title)
+        return bill.order if bill else []
+
+    def has_name(self, bill_title: str, amendment_number: str, name: str) -> bool:
+        """True if name is a proposer or supporter of the amendment."""
+
+        bill = self.bill(bill_title)
+        if bill is None:
+            return False
+        return normalise_name(name) in bill.names.get(amendment_number, ())
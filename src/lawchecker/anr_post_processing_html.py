@@ -1,166 +1,44 @@
-import glob
-import os
 import re
 import sys
 import traceback
 
-import httpx
-from httpx import HTTPError
 from lxml import etree as ET
 from lxml.etree import iselement
 
-from lawchecker.check_web_amdts import DEFAULT_TIMEOUT
+from lawchecker.anr_marshal import MarshalIndex
 from lawchecker.lawchecker_logger import logger
-
-
-def get_marshal_xml(folder_path):
-    """Load additional XML files for checking amendments."""
-    marshal_files = []
-
-    # Get all XML files in the folder
-    xml_files = glob.glob(os.path.join(folder_path, '*.xml'))
-
-    if not xml_files:
-        logger.info(f'No XML files found in the folder: {folder_path}')
-        return marshal_files
-
-    for file_path in xml_files:
-        try:
-            tree = ET.parse(file_path)
-            marshal_files.append(tree)
-            logger.info(f'Loaded XML file: {file_path}')
-        except ET.XMLSyntaxError as e:
-            logger.error(f'Failed to parse XML file at {file_path}: {e}')
-        except Exception as e:
-            logger.error(f'Unexpected error while loading {file_path}: {e}')
-
-    return marshal_files
+from lawchecker.mnis_members import get_member_cache
 
 
 def fetch_eligible_members():
-    """Returns the member names from MNIS API for name checking."""
-
-    # TODO: cache the response for a certain period of time
-
-    url = 'https://data.parliament.uk/membersdataplatform/services/mnis/members/query/House=Commons|IsEligible=true/'
-    try:
-        response = httpx.get(url, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        members_tree = ET.fromstring(response.content)
-    except HTTPError:
-        logger.info('Failed to fetch data from MNIS API.')
-        return set()
-        # Extract <DisplayAs> text for each <Member> in the API response
-        return {
-            member.find(
-                'DisplayAs'
-            ).text  # TODO: would it be better to use .findtext()?
-            for member in members_tree.findall('.//Member')
-            if member.find('DisplayAs') is not None
-        }
-    else:
-        logger.info('Failed to fetch data from MNIS API.')
-        return set()
-
-
-def check_amendment_in_files(amendment_num, bill_title, marshal_files):
     """
-    Matches an amendment number and bill title in the provided checking files.
+    Returns the member names from MNIS API for name checking. The names are
+    cached, see mnis_members.
     """
-    for file_tree in marshal_files:
-        namespaces = {
-            k if k else 'default': v for k, v in file_tree.getroot().nsmap.items()
-        }
-        tlc_query = f"//*[local-name()='TLCConcept' and @eId='varBillTitle'][@showAs='{bill_title}']"
-        amendments_query = f"//*[local-name()='num' and @ukl:dnum='{amendment_num}']"
-
-        tlc_elements = file_tree.xpath(tlc_query, namespaces=namespaces)
-        if tlc_elements:
-            amendment_elements = file_tree.xpath(
-                amendments_query, namespaces=namespaces
-            )
-            if amendment_elements:
-                logger.debug(
-                    f"Found amendment '{amendment_num}' in bill '{bill_title}'"
-                )
-                return True
-            else:
-                logger.debug(
-                    f"Amendment '{amendment_num}' not found for bill '{bill_title}' in checking XML."
-                )
-        else:
-            logger.debug(f"Bill '{bill_title}' not found in checking XML.")
-    return False
+    return get_member_cache().get()
 
 
-def reorder_amendments(marshal_files, bill_title, amendment_groups):
+def reorder_amendments(marshal_index, bill_title, amendment_groups):
     """
-    Reorder amendment groups based on checking XML files with debugging.
+    Reorder amendment groups into the marshalled order from the marshal index.
     """
     ordered_amendment_groups = []
     remaining_amendments = amendment_groups.copy()
     was_reordered = False  # Track if any reordering occurred
 
-    for checking_file in marshal_files:
-        root = checking_file.getroot()
-        namespaces = {
-            'akn': 'http://docs.oasis-open.org/legaldocml/ns/akn/3.0',
-            'ukl': 'https://www.legislation.gov.uk/namespaces/UK-AKN',
-        }
-
-        # Match bill-title
-        bill_title_match = root.xpath(
-            ".//akn:TLCConcept[@eId='varBillTitle']/@showAs", namespaces=namespaces
-        )
-        if not bill_title_match:
-            logger.debug(f'No bill-title found in {checking_file.docinfo.URL}')
-            continue
-
-        # Normalize apostrophes for comparison
-        normalized_bill_title = bill_title.replace('’', "'")
-        normalized_bill_title_match = bill_title_match[0].replace('’', "'")
-
-        if normalized_bill_title != normalized_bill_title_match:
-            logger.debug(
-                f"Bill title '{normalized_bill_title}' does not match '{normalized_bill_title_match}' in {checking_file.docinfo.URL}"
+    amendment_order = marshal_index.marshalled_order(bill_title)
+    if not amendment_order:
+        logger.debug(f"Bill '{bill_title}' not found in marshalling XML.")
+    logger.debug(f'Amendment Order from Checking Files: {amendment_order}')
+
+    # Order amendment groups based on checking file order
+    for amendment_number in amendment_order:
+        if amendment_number in remaining_amendments:
+            logger.debug(f'Found matching amendment: {amendment_number}')
+            ordered_amendment_groups.append(
+                (amendment_number, remaining_amendments.pop(amendment_number))
             )
-            continue
-
-        logger.debug(
-            f'Matched Bill Title: {normalized_bill_title_match} in {checking_file.docinfo.URL}'
-        )
-
-        all_nums = root.xpath(
-            './/akn:num[@ukl:dnum]',
-            namespaces={
-                'akn': 'http://docs.oasis-open.org/legaldocml/ns/akn/3.0',
-                'ukl': 'https://www.legislation.gov.uk/namespaces/UK-AKN',
-            },
-        )
-        logger.debug(f'Found {len(all_nums)} <num> elements in the XML.')
-        for num in all_nums:
-            logger.debug(
-                f'<num>: {ET.tostring(num, pretty_print=True, encoding="unicode")}'.strip()
-            )
-
-        # Extract amendment order from checking file
-        amendment_order = root.xpath(
-            './/akn:num[@ukl:dnum]/text()', namespaces=namespaces
-        )
-        logger.debug(f'Amendment Order from Checking File: {amendment_order}')
-
-        # Order amendment groups based on checking file order
-        for amendment_number in amendment_order:
-            if amendment_number in remaining_amendments:
-                logger.debug(f'Found matching amendment: {amendment_number}')
-                ordered_amendment_groups.append(
-                    (amendment_number, remaining_amendments.pop(amendment_number))
-                )
-                was_reordered = True  # Mark as reordered
-            else:
-                logger.debug(
-                    f"Amendment '{amendment_number}' not found in amendment groups."
-                )
+            was_reordered = True  # Mark as reordered
 
     # Always process remaining amendments
     if remaining_amendments:
@@ -175,23 +53,63 @@ def reorder_amendments(marshal_files, bill_title, amendment_groups):
     return ordered_amendment_groups, was_reordered
 
 
-def generate_html(xml_file, checking_file_paths, eligible_members):
+def _xml_root(xml_file):
+    """Root element of xml_file, which may be a path, tree or element."""
+    if iselement(xml_file):
+        return xml_file
+    if isinstance(xml_file, ET._ElementTree):
+        return xml_file.getroot()
+    return ET.parse(xml_file).getroot()
+
+
+def group_items(root):
+    """
+    Group the items in the intermediate XML, in a single pass, by bill and
+    then amendment number. Each group is a dict with the items, their
+    dashboard IDs and their comment paragraphs. Bills and amendments are in
+    the order they first appear.
+    """
+    bills = {}
+    for item in root.iter('item'):
+        amendment_groups = bills.setdefault(item.findtext('bill'), {})
+        dashboard_id = item.findtext('dashboard-id')
+        comments = item.find('.//comments')
+        paragraphs = comments.findall('p') if comments is not None else []
+
+        for amd_no in item.iterfind('.//matched-numbers/amd-no'):
+            group = amendment_groups.get(amd_no.text)
+            if group is None:
+                group = amendment_groups[amd_no.text] = {
+                    'items': [],
+                    'dashboard_ids': [],
+                    'comments': [],
+                }
+            # Add the item and comments
+            group['items'].append(item)
+            group['dashboard_ids'].append(dashboard_id)
+            group['comments'].extend(paragraphs)
+    return bills
+
+
+def to_html_string(element):
+    return ET.tostring(element, pretty_print=True, method='html', encoding='unicode')
+
+
+def generate_html(xml_file, marshal_index, eligible_members):
     """
     Generates HTML content, splitting it into summary and bill sections.
 
     Args:
-        xml_file (str): Path to the input XML file.
-        checking_file_paths (list): Paths to parsed marshalling XML files.
-        eligible_members (set): Set of eligible members from the API.
+        xml_file: The intermediate XML. Either a path or the tree/element
+            returned by anr_spo_rest.transform.
+        marshal_index (MarshalIndex): Index of the marshalling XML files.
+        eligible_members (MemberDirectory): Eligible members from the API.
 
     Returns:
-        tuple: The summary section and the bill section as HTML strings.
+        tuple: The summary section and the bill section as HTML elements.
     """
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-
-    # Load checking files
-    checking_files = get_marshal_xml(checking_file_paths)
+    root = _xml_root(xml_file)
+    grouped_items = group_items(root)
 
     # Initialize the root element for dynamic content
     html = ET.Element('div', {'class': 'dynamic-content'})
@@ -201,7 +119,7 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
     report_date = root.findtext('.//downloaded')
     if report_date:
         ET.SubElement(main_summary_div, 'h1').text = f'{report_date}'
-    paper_count = len(set(item.find('bill').text for item in root.findall('.//item')))
+    paper_count = len(grouped_items)
     if paper_count > 1:
         ET.SubElement(
             main_summary_div, 'p'
@@ -213,8 +131,8 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
 
     # List of bills
     bill_list = ET.SubElement(main_summary_div, 'ul')
-    bills = set(item.find('bill').text for item in root.findall('.//item'))
-    for bill in sorted(bills):
+    bills = sorted(grouped_items)
+    for bill in bills:
         li = ET.SubElement(bill_list, 'li')
         ET.SubElement(
             li,
@@ -223,7 +141,7 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
         ).text = bill
 
     # Explanatory text
-    if checking_files:
+    if marshal_index.files:
         explanatory_text_1 = ET.SubElement(main_summary_div, 'p')
         explanatory_text_1.text = 'If you provide LawMaker XML: '
         ET.SubElement(explanatory_text_1, 'span', {'class': 'green'}).text = ' ✔'
@@ -254,43 +172,21 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
             {'id': 'collapsible-xml-files', 'style': 'display: none;'},
         )
         ul = ET.SubElement(collapsible_div, 'ul')
-        for checking_file in checking_files:
+        for file_name in marshal_index.files:
             li = ET.SubElement(ul, 'li')
-            li.text = (
-                os.path.basename(checking_file.getroot().base)
-                if checking_file.getroot().base
-                else 'Unknown file'
-            )
+            li.text = file_name
     else:
         explanatory_text = ET.SubElement(main_summary_div, 'p')
         explanatory_text.text = 'No marshalling XML found.'
 
-    summary_section = ET.tostring(
-        main_summary_div, pretty_print=True, method='html', encoding='unicode'
-    )
-
     # Make a div for each bill
-    for bill in sorted(bills):
+    for bill in bills:
         bill_div = ET.SubElement(
             html, 'div', {'class': 'bill', 'id': bill.lower().replace(' ', '-')}
         )
         ET.SubElement(bill_div, 'h1', {'class': 'bill-title'}).text = bill
 
-        # Initialize amendment_groups as a dictionary
-        amendment_groups = {}
-        for item in root.findall('.//item'):
-            if item.findtext('bill') == bill:
-                for amd_no in item.findall('.//matched-numbers/amd-no'):
-                    amd_number = amd_no.text
-                    if amd_number not in amendment_groups:
-                        amendment_groups[amd_number] = {'items': [], 'comments': []}
-                    # Add the item and comments
-                    amendment_groups[amd_number]['items'].append(item)
-                    comments = item.find('.//comments')
-                    if comments is not None:
-                        amendment_groups[amd_number]['comments'].extend(
-                            comments.findall('p')
-                        )
+        amendment_groups = grouped_items[bill]
 
         # Provide a count of amendment groups in each bill;
         number_summary_count_div = ET.SubElement(
@@ -301,9 +197,9 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
         ET.SubElement(p, 'b').text = str(len(amendment_groups))
 
         # Check for checking files and reorder amendments if available
-        if checking_files:
+        if marshal_index.files:
             ordered_amendments, was_reordered = reorder_amendments(
-                checking_files, bill, amendment_groups
+                marshal_index, bill, amendment_groups
             )
         else:
             # Fall back to unordered amendments
@@ -326,7 +222,7 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
                 h2 = ET.SubElement(num_info, 'h2', {'class': 'amendment-number'})
 
                 # Add fallback warning if amendments are not reordered
-                if not checking_files or not was_reordered:
+                if not marshal_index.files or not was_reordered:
                     h2.text = f'{amd_number}'
                     warning_span = ET.SubElement(
                         h2,
@@ -352,7 +248,9 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
                 )
                 ET.SubElement(names_to_add_div, 'h4').text = 'Names to add'
 
-                for item in group['items']:
+                for item, dashboard_id in zip(
+                    group['items'], group['dashboard_ids']
+                ):
                     matched_names = item.find('.//names-to-add/matched-names')
                     if not iselement(matched_names):
                         continue
@@ -374,12 +272,28 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
                             name_span,
                             'a',
                             {
-                                'title': f'Dashboard ID:{item.find("dashboard-id").text}',
-                                'href': f'https://hopuk.sharepoint.com/sites/bct-ppu/Lists/AddNames/DispForm.aspx?ID={item.find("dashboard-id").text}',
+                                'title': f'Dashboard ID:{dashboard_id}',
+                                'href': f'https://hopuk.sharepoint.com/sites/bct-ppu/Lists/AddNames/DispForm.aspx?ID={dashboard_id}',
                                 'style': style,
                             },
                         ).text = name_text
 
+                        # Suggest the closest member's name from MNIS
+                        if name_text and name_text not in eligible_members:
+                            suggestion = eligible_members.suggest(name_text)
+                            if suggestion is not None:
+                                ET.SubElement(
+                                    name_span,
+                                    'span',
+                                    {
+                                        'class': 'did-you-mean',
+                                        'title': (
+                                            'Closest name in MNIS (similarity'
+                                            f' {suggestion.score:.0%})'
+                                        ),
+                                    },
+                                ).text = f'Did you mean {suggestion.name}?'
+
                 # Render names to remove
 
                 if any(
@@ -390,7 +304,9 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
                         amendment_div, 'div', {'class': 'names-to-remove'}
                     )
                     ET.SubElement(names_to_remove_div, 'h4').text = 'Names to remove'
-                    for item in group['items']:
+                    for item, dashboard_id in zip(
+                        group['items'], group['dashboard_ids']
+                    ):
                         matched_names = item.find('.//names-to-remove/matched-names')
                         if not iselement(matched_names):
                             continue
@@ -406,8 +322,8 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
                                 name_span,
                                 'a',
                                 {
-                                    'title': f'Dashboard ID:{item.find("dashboard-id").text}',
-                                    'href': f'https://hopuk.sharepoint.com/sites/bct-ppu/Lists/AddNames/DispForm.aspx?ID={item.find("dashboard-id").text}',
+                                    'title': f'Dashboard ID:{dashboard_id}',
+                                    'href': f'https://hopuk.sharepoint.com/sites/bct-ppu/Lists/AddNames/DispForm.aspx?ID={dashboard_id}',
                                     'style': style,
                                 },
                             ).text = name_text
@@ -489,11 +405,7 @@ def generate_html(xml_file, checking_file_paths, eligible_members):
                     checkbox_label = ET.SubElement(checkbox_div, 'label')
                     checkbox_label.text = 'Checked'
 
-    bill_section = ET.tostring(
-        html, pretty_print=True, method='html', encoding='unicode'
-    )
-
-    return summary_section, bill_section
+    return main_summary_div, html
 
 
 def inject_html_template(template_path, output_path, summary_content, dynamic_content):
@@ -529,21 +441,32 @@ def ticks_and_crosses(output_html_file_path, marshal_file_dir):
         logger.error(f'Failed to load HTML file: {e}')
         return
 
-    # Collect marshal XML files
-    checking_files = []
-    if os.path.isdir(marshal_file_dir):  # TODO: change to Path
-        for file_name in os.listdir(marshal_file_dir):
-            if file_name.endswith('.xml'):
-                try:
-                    checking_files.append(
-                        (file_name, ET.parse(os.path.join(marshal_file_dir, file_name)))
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to parse checking file '{file_name}': {e}")
+    marshal_index = MarshalIndex.from_folder(marshal_file_dir)
+    if not annotate_names(html_tree, marshal_index):
+        return
 
-    if not checking_files:
+    # Save the updated HTML
+    try:
+        with open(output_html_file_path, 'wb') as output_file:
+            output_file.write(
+                ET.tostring(
+                    html_tree, pretty_print=True, method='html', encoding='utf-8'
+                )
+            )
+    except Exception as e:
+        logger.error(f'Failed to save annotated HTML: {e}')
+
+
+def annotate_names(html_tree, marshal_index):
+    """
+    Add indicators (✔/✘) to the names in html_tree (the bill section from
+    generate_html, or a whole report) in place. Returns False if there were
+    no marshal XML files to check against.
+    """
+
+    if not marshal_index.files:
         logger.info('No valid checking files found. Skipping annotations.')
-        return
+        return False
 
     # Annotate the HTML file
     for bill_div in html_tree.xpath("//div[@class='bill']"):
@@ -572,68 +495,11 @@ def ticks_and_crosses(output_html_file_path, marshal_file_dir):
                     )
                     continue
                 name_text = name_anchor.text.strip()
-                annotation = '✘'
-
-                logger.debug(
-                    f'Checking name: {name_text} for amendment {amendment_number} in bill {bill_name}'
-                )
-
-                for file_name, checking_file in checking_files:
-                    logger.debug(f'Processing checking file: {file_name}')
-                    try:
-                        root = checking_file.getroot()
-
-                        # Check if bill name matches
-                        bill_matches = root.xpath(
-                            f'/akomaNtoso/amendmentList/meta/references/TLCConcept[@showAs="{bill_name}"]',  # HOTFIX: switch quote mark types to handle apostrophes in bill
-                            namespaces={
-                                'akn': 'http://docs.oasis-open.org/legaldocml/ns/akn/3.0'
-                            },
-                        )
-                        if not bill_matches:
-                            logger.debug(
-                                f'No match for bill: {bill_name} in file: {file_name}.'
-                            )
-                            continue
-
-                        # Match the amendment by number using <num> element with @ukl:dnum
-                        amendment_numbers = [
-                            elem.text.strip()
-                            for elem in root.xpath(
-                                '/akomaNtoso/amendmentList/component/amendment/amendmentBody/akn:num[@ukl:dnum]',
-                                namespaces={
-                                    'akn': 'http://docs.oasis-open.org/legaldocml/ns/akn/3.0',
-                                    'ukl': 'https://www.legislation.gov.uk/namespaces/UK-AKN',
-                                },
-                            )
-                        ]
-                        if amendment_number not in amendment_numbers:
-                            logger.debug(
-                                f'Amendment number {amendment_number} not found in file: {file_name}.'
-                            )
-                            continue
 
-                        # Match the name in proposer/supporter blocks
-                        proposer_supporter_blocks = root.xpath(
-                            f"/akomaNtoso/amendmentList/component/amendment[amendmentBody/akn:num[text()='{amendment_number}']]"
-                            "/amendmentHeading/block[@name='proposer' or @name='supporters']",
-                            namespaces={
-                                'akn': 'http://docs.oasis-open.org/legaldocml/ns/akn/3.0'
-                            },
-                        )
-                        for block in proposer_supporter_blocks:
-                            if any(
-                                name_text == elem.text.strip()
-                                for elem in block.xpath(
-                                    './/docIntroducer | .//docProponent'
-                                )
-                            ):
-                                annotation = '✔'
-                                break
-                    except Exception as e:
-                        logger.error(
-                            f'Error processing checking file: {file_name}, error: {e}'
-                        )
+                if marshal_index.has_name(bill_name, amendment_number, name_text):
+                    annotation = '✔'
+                else:
+                    annotation = '✘'
 
                 # Add annotation span
                 annotation_span = ET.SubElement(
@@ -650,37 +516,44 @@ def ticks_and_crosses(output_html_file_path, marshal_file_dir):
                 )
                 annotation_span.text = f' {annotation}'
 
-    # Save the updated HTML
-    try:
-        with open(output_html_file_path, 'wb') as output_file:
-            output_file.write(
-                ET.tostring(
-                    html_tree, pretty_print=True, method='html', encoding='utf-8'
-                )
-            )
-    except Exception as e:
-        logger.error(f'Failed to save annotated HTML: {e}')
+    return True
 
 
 def main(template_path, xml_file_path, marshal_file_dir, output_html_file_path):
-    """Main function to execute the transformation."""
+    """
+    Main function to execute the transformation.
+
+    xml_file_path is the intermediate XML, either a path or the element
+    returned by anr_spo_rest.transform. The report is built and annotated
+    in memory and serialised once, into the template.
+    """
     try:
         # Fetch eligible members from MNIS API
         eligible_members = fetch_eligible_members()
 
+        xml_root = _xml_root(xml_file_path)
+
+        # Index the marshalling XML (used for the order and ticks and crosses)
+        # Files for bills not in the dashboard data are not loaded
+        bill_titles = set(xml_root.xpath('//item/bill/text()'))
+        marshal_index = MarshalIndex.from_folder(marshal_file_dir, bill_titles)
+
         # Generate HTML content
-        summary_content, bill_content = generate_html(
-            xml_file_path, marshal_file_dir, eligible_members
+        summary_div, bill_div = generate_html(
+            xml_root, marshal_index, eligible_members
         )
 
+        # Annotate ticks and crosses
+        annotate_names(bill_div, marshal_index)
+
         # Inject content into the HTML template
         inject_html_template(
-            template_path, output_html_file_path, summary_content, bill_content
+            template_path,
+            output_html_file_path,
+            to_html_string(summary_div),
+            to_html_string(bill_div),
         )
 
-        # Annotate ticks and crosses
-        ticks_and_crosses(output_html_file_path, marshal_file_dir)
-
     except Exception as e:
         logger.error(f'{e}')
         traceback.print_exc()
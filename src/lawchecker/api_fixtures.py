@@ -0,0 +1,376 @@
+"""
+Record and replay Bills API responses.
+
+RecordingTransport saves real responses from the Bills API into a fixture
+folder. ReplayTransport serves those fixtures back without a network
+connection, with optional latency, error injection and 429 rate limiting,
+so BillsApiClient and the amendment download functions can be tested and
+benchmarked offline and reproducibly.
+
+Both are httpx transports and are passed to BillsApiClient:
+
+    client = BillsApiClient(transport=ReplayTransport(fixture_dir), cache_dir=None)
+
+From the command line:
+
+    python -m lawchecker.api_fixtures record <bill_id> <stage_id> <fixture_dir>
+    python -m lawchecker.api_fixtures bench <bill_id> <stage_id> <fixture_dir>
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from lawchecker import bills_api, lawchecker_logger
+from lawchecker.lawchecker_logger import logger
+
+# headers kept with the recorded body
+RECORDED_HEADERS = ('content-type', 'etag', 'last-modified', 'date', 'retry-after')
+
+# headers which no longer apply once the body has been decoded
+DECODED_BODY_HEADERS = frozenset(
+    {'content-encoding', 'content-length', 'transfer-encoding'}
+)
+
+
+def fixture_name(url: httpx.URL) -> str:
+    """
+    File name for the fixture of a request. The path is kept readable
+    (e.g. Bills_123_Stages_45_Amendments.json) and the query string,
+    if any, is added as a short hash.
+    """
+
+    path = url.path
+    # remove the common prefix so names are shorter
+    path = re.sub(r'^/api/v\d+/', '', path).strip('/')
+    name = re.sub(r'[^A-Za-z0-9]+', '_', path) or 'root'
+
+    query = sorted(url.params.multi_items())
+    if query:
+        digest = hashlib.sha256(repr(query).encode('utf-8')).hexdigest()[:12]
+        name = f'{name}__{digest}'
+
+    return f'{name}.json'
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests on to the real API and save every response."""
+
+    def __init__(
+        self,
+        fixture_dir: Path,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.fixture_dir = Path(fixture_dir)
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        self.transport = transport or httpx.AsyncHTTPTransport(http2=True)
+        self.recorded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        body = await response.aread()
+
+        fixture = {
+            'url': str(request.url),
+            'status_code': response.status_code,
+            'headers': {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            'body': body.decode('utf-8', errors='replace'),
+        }
+
+        fixture_path = self.fixture_dir / fixture_name(request.url)
+        with open(fixture_path, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f, ensure_ascii=False)
+        self.recorded += 1
+
+        # the body has been read (and decompressed) so return a new response
+        # with the same content, without the headers which describe the
+        # encoded body, or it would be decompressed again
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in DECODED_BODY_HEADERS
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+@dataclass
+class ReplayStats:
+    requests: int = 0
+    served: int = 0
+    not_found: int = 0
+    injected_errors: int = 0
+    rate_limited: int = 0
+    peak_in_flight: int = 0
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serve recorded fixtures as a stand-in for the Bills API.
+
+    Args:
+        fixture_dir: Folder of fixtures made by RecordingTransport
+        latency: Seconds to wait before each response. Either a number
+            or a (min, max) tuple for a random latency.
+        error_rate: Fraction of requests answered with a 503
+        network_error_rate: Fraction of requests which raise a network error
+        max_in_flight: Answer with 429 when more than this many requests
+            are in progress (None for no limit)
+        retry_after: Value of the Retry-After header sent with 429s
+        seed: Seed for the random number generator, for repeatable runs
+    """
+
+    def __init__(
+        self,
+        fixture_dir: Path,
+        latency: float | tuple[float, float] = 0.0,
+        error_rate: float = 0.0,
+        network_error_rate: float = 0.0,
+        max_in_flight: int | None = None,
+        retry_after: float | None = 1.0,
+        seed: int | None = None,
+    ):
+        self.fixture_dir = Path(fixture_dir)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.network_error_rate = network_error_rate
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.in_flight = 0
+        self.stats = ReplayStats()
+
+        # load all fixtures up front so disk access is not part of the timings
+        self.fixtures: dict[str, dict] = {}
+        for fixture_path in self.fixture_dir.glob('*.json'):
+            with open(fixture_path, encoding='utf-8') as f:
+                self.fixtures[fixture_path.name] = json.load(f)
+
+        logger.info(f'Loaded {len(self.fixtures)} fixtures from {self.fixture_dir}')
+
+    def _latency(self) -> float:
+        if isinstance(self.latency, tuple):
+            return self.random.uniform(*self.latency)
+        return self.latency
+
+    def _response(
+        self,
+        request: httpx.Request,
+        status_code: int,
+        headers: dict[str, str] | None = None,
+        content: str = '',
+    ) -> httpx.Response:
+        self.stats.status_codes[status_code] = (
+            self.stats.status_codes.get(status_code, 0) + 1
+        )
+        return httpx.Response(
+            status_code, headers=headers, content=content.encode(), request=request
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.requests += 1
+        self.in_flight += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.in_flight)
+
+        try:
+            # check the limit before waiting, like a server would
+            over_limit = (
+                self.max_in_flight is not None and self.in_flight > self.max_in_flight
+            )
+
+            await asyncio.sleep(self._latency())
+
+            if self.random.random() < self.network_error_rate:
+                self.stats.injected_errors += 1
+                raise httpx.ConnectError('Injected network error', request=request)
+
+            if over_limit:
+                self.stats.rate_limited += 1
+                headers = {}
+                if self.retry_after is not None:
+                    headers['Retry-After'] = str(self.retry_after)
+                return self._response(request, 429, headers)
+
+            if self.random.random() < self.error_rate:
+                self.stats.injected_errors += 1
+                return self._response(request, 503)
+
+            fixture = self.fixtures.get(fixture_name(request.url))
+            if fixture is None:
+                self.stats.not_found += 1
+                logger.warning(f'No fixture for {request.url}')
+                return self._response(request, 404)
+
+            self.stats.served += 1
+            return self._response(
+                request,
+                fixture['status_code'],
+                fixture['headers'],
+                fixture['body'],
+            )
+        finally:
+            self.in_flight -= 1
+
+
+async def download_amendments(
+    bill_id: int, stage_id: int, client: bills_api.BillsApiClient
+) -> int:
+    """Download the amendments for a bill stage. Returns the number downloaded."""
+
+    # imported here as check_web_amdts imports a lot
+    from lawchecker.check_web_amdts import (
+        get_amendments_detailed_json,
+        get_amendments_summary_json,
+    )
+
+    summary = await get_amendments_summary_json(bill_id, stage_id, client)
+    detailed = await get_amendments_detailed_json(summary, bill_id, stage_id, client)
+    return len(detailed['items'])  # type: ignore
+
+
+async def record(bill_id: int, stage_id: int, fixture_dir: Path) -> None:
+    transport = RecordingTransport(fixture_dir)
+    async with bills_api.BillsApiClient(transport=transport, cache_dir=None) as client:
+        count = await download_amendments(bill_id, stage_id, client)
+
+    print(f'Recorded {transport.recorded} responses ({count} amendments)')
+
+
+async def bench(
+    bill_id: int,
+    stage_id: int,
+    fixture_dir: Path,
+    transport_kwargs: dict,
+    max_concurrency: int,
+) -> None:
+    transport = ReplayTransport(fixture_dir, **transport_kwargs)
+    async with bills_api.BillsApiClient(
+        transport=transport, cache_dir=None, max_concurrency=max_concurrency
+    ) as client:
+        start = time.perf_counter()
+        count = await download_amendments(bill_id, stage_id, client)
+        elapsed = time.perf_counter() - start
+        concurrency = client.scheduler.concurrency
+        http_stats = client.stats.format_table()
+
+    stats = transport.stats
+    print(f'Amendments downloaded: {count}')
+    print(f'Time: {elapsed:.2f}s')
+    print(f'Requests: {stats.requests} (served {stats.served})')
+    print(f'Not found: {stats.not_found}')
+    print(f'Injected errors: {stats.injected_errors}')
+    print(f'Rate limited (429): {stats.rate_limited}')
+    print(f'Peak in flight: {stats.peak_in_flight}')
+    print(f'Final client concurrency: {concurrency}')
+    print(f'Status codes: {dict(sorted(stats.status_codes.items()))}')
+    print()
+    print(http_stats)
+
+
+def main():
+    lawchecker_logger.setup_lawchecker_logging()
+    parser = argparse.ArgumentParser(
+        description='Record Bills API responses and replay them offline.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser(
+        'record', help='Download amendments for a bill stage and save the responses.'
+    )
+    bench_parser = subparsers.add_parser(
+        'bench', help='Download amendments from recorded responses and time it.'
+    )
+
+    for sub in (record_parser, bench_parser):
+        sub.add_argument('bill_id', type=int, help='Bill ID in the Bills API')
+        sub.add_argument('stage_id', type=int, help='Stage ID in the Bills API')
+        sub.add_argument('fixture_dir', type=Path, help='Folder for the fixtures')
+
+    bench_parser.add_argument(
+        '--latency',
+        type=float,
+        nargs='+',
+        default=[0.05],
+        metavar='SECONDS',
+        help='Response latency, or min and max for a random latency',
+    )
+    bench_parser.add_argument(
+        '--error-rate', type=float, default=0.0, help='Fraction of 503 responses'
+    )
+    bench_parser.add_argument(
+        '--network-error-rate',
+        type=float,
+        default=0.0,
+        help='Fraction of requests which fail with a network error',
+    )
+    bench_parser.add_argument(
+        '--max-in-flight',
+        type=int,
+        default=None,
+        help='Respond with 429 when more requests than this are in progress',
+    )
+    bench_parser.add_argument(
+        '--retry-after',
+        type=float,
+        default=1.0,
+        help='Retry-After value sent with 429 responses',
+    )
+    bench_parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=16,
+        help='BillsApiClient concurrency cap',
+    )
+    bench_parser.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    args = parser.parse_args(sys.argv[1:])
+
+    if args.command == 'record':
+        asyncio.run(record(args.bill_id, args.stage_id, args.fixture_dir))
+        return
+
+    latency = args.latency[0] if len(args.latency) == 1 else tuple(args.latency[:2])
+    transport_kwargs = {
+        'latency': latency,
+        'error_rate': args.error_rate,
+        'network_error_rate': args.network_error_rate,
+        'max_in_flight': args.max_in_flight,
+        'retry_after': args.retry_after,
+        'seed': args.seed,
+    }
+    asyncio.run(
+        bench(
+            args.bill_id,
+            args.stage_id,
+            args.fixture_dir,
+            transport_kwargs,
+            args.max_concurrency,
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
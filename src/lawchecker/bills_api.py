@@ -4,17 +4,43 @@ API documentation: https://bills-api.parliament.uk
 """
 
 import asyncio
+import atexit
+import concurrent.futures
 import logging
+import math
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Literal
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal, TypeVar
 
 import httpx
 
+from lawchecker import jobs
+from lawchecker.http_cache import (
+    DEFAULT_CACHE_DIR,
+    CacheEntry,
+    ResponseCache,
+    cache_key,
+    ttl_for_url,
+)
+from lawchecker.http_stats import HttpStats, RequestTrace
 from lawchecker.lawchecker_logger import logger
 
 BASE_URL = 'https://bills-api.parliament.uk/api/v1'
 
+T = TypeVar('T')
+
+# status codes which are worth retrying after a delay
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# how often (seconds) ClientSession.run checks if its job has been cancelled
+CANCEL_POLL_INTERVAL = 0.2
+
 
 # ============================================================================
 # Type Aliases and Enums
@@ -733,6 +759,249 @@ class StageReference:
         )
 
 
+# ============================================================================
+# Request Scheduling
+# ============================================================================
+
+
+class RequestScheduler:
+    """Limits how quickly and how many requests are sent to the API.
+
+    Combines a concurrency cap with a token bucket rate limiter. The
+    concurrency limit adapts to the responses seen (additive increase,
+    multiplicative decrease): it grows slowly while requests succeed
+    quickly and shrinks when latency rises or the API returns errors.
+    It shrinks at most once per generation of requests: responses to
+    requests which started before the last decrease are already accounted
+    for by it, so a burst of slow or throttled responses only counts once.
+
+    Example:
+        async with scheduler.slot() as ticket:
+            response = await session.get(url)
+            ticket.record(response.status_code)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        initial_concurrency: int = 8,
+        requests_per_second: float = 20.0,
+        burst: int | None = None,
+        latency_tolerance: float = 3.0,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialise the scheduler.
+
+        Args:
+            max_concurrency: Upper bound on concurrent requests
+            min_concurrency: Lower bound on concurrent requests
+            initial_concurrency: Concurrency limit to start with
+            requests_per_second: Token bucket refill rate
+            burst: Token bucket size (defaults to max_concurrency)
+            latency_tolerance: Shrink the limit when a request takes longer
+                than this multiple of the fastest latency seen
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_cap: Maximum backoff delay in seconds
+            clock: Returns the time in seconds (replaceable in tests)
+        """
+        self.clock = clock
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(
+            min(max(initial_concurrency, self.min_concurrency), self.max_concurrency)
+        )
+        self.rate = requests_per_second
+        self.capacity = float(burst or self.max_concurrency)
+        self.latency_tolerance = latency_tolerance
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self.in_flight = 0
+        self._tokens = self.capacity
+        self._last_refill = clock()
+        # no requests are started before this time (set by Retry-After)
+        self._paused_until = 0.0
+        self._min_latency: float | None = None
+        # when the limit was last decreased (-inf so the first can happen)
+        self._last_decrease = -math.inf
+        self._condition: asyncio.Condition | None = None
+
+    @property
+    def concurrency(self) -> int:
+        """The current concurrency limit."""
+        return max(self.min_concurrency, math.floor(self.limit))
+
+    def _get_condition(self) -> asyncio.Condition:
+        # created lazily so the scheduler can be made outside an event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def _acquire(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.concurrency)
+            self.in_flight += 1
+
+        # wait for a token (and for any Retry-After pause to end)
+        try:
+            while True:
+                now = self.clock()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+        except BaseException:
+            await self._release()
+            raise
+
+    async def _release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator['RequestTicket']:
+        """Wait for permission to send a request.
+
+        Yields:
+            RequestTicket: Used to record the outcome of the request
+        """
+        await self._acquire()
+        ticket = RequestTicket(self, self.clock())
+        try:
+            yield ticket
+        finally:
+            if not ticket.recorded:
+                # the request raised before a status code was recorded
+                ticket.record(None)
+            await self._release()
+
+    def _decrease(self, new_limit: float, started: float | None) -> None:
+        if started is not None and started <= self._last_decrease:
+            # sent before the last decrease, which has already allowed for it
+            return
+        self.limit = max(self.min_concurrency, new_limit)
+        self._last_decrease = self.clock()
+
+    def on_success(self, latency: float, started: float | None = None) -> None:
+        """Adjust the concurrency limit after a successful request.
+
+        Args:
+            latency: Seconds the request took
+            started: When the request started (by clock), so that the limit
+                is only decreased once per generation of requests
+        """
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+
+        if latency > self._min_latency * self.latency_tolerance:
+            # the API is slowing down, back off gently
+            self._decrease(self.limit - 1, started)
+        else:
+            # grow by roughly one for every `limit` fast responses
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def on_failure(self, started: float | None = None) -> None:
+        """Halve the concurrency limit after a throttled or failed request."""
+        self._decrease(self.limit / 2, started)
+
+    def pause(self, seconds: float) -> None:
+        """Stop any new requests from starting for `seconds`."""
+        self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+    def backoff_delay(
+        self, attempt: int, response: httpx.Response | None = None
+    ) -> float:
+        """Delay before the next retry.
+
+        Uses the Retry-After header if the response has one, otherwise
+        exponential backoff with full jitter.
+
+        Args:
+            attempt: Zero based number of the attempt which failed
+            response: The failed response (if there was one)
+
+        Returns:
+            float: Number of seconds to wait
+        """
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = min(retry_after, self.backoff_cap)
+                # all requests should respect Retry-After, not just this one
+                self.pause(delay)
+                return delay
+
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+
+class RequestTicket:
+    """Records the outcome of a single request made through a RequestScheduler."""
+
+    def __init__(self, scheduler: RequestScheduler, started: float):
+        self.scheduler = scheduler
+        self.started = started
+        self.recorded = False
+
+    def record(self, status_code: int | None) -> None:
+        """Record the response status code (None for timeouts and network errors)."""
+        if self.recorded:
+            return
+        self.recorded = True
+
+        scheduler = self.scheduler
+        if status_code is None or status_code in RETRYABLE_STATUS_CODES:
+            scheduler.on_failure(self.started)
+        else:
+            scheduler.on_success(scheduler.clock() - self.started, self.started)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header value into a number of seconds.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        float | None: Seconds to wait or None if value is missing or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 # ============================================================================
 # Async Client
 # ============================================================================
@@ -749,13 +1018,43 @@ class BillsApiClient:
             bills = await client.get_bills(current_house='Commons')
     """
 
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        max_concurrency: int = 16,
+        requests_per_second: float = 20.0,
+        max_retries: int = 4,
+        scheduler: RequestScheduler | None = None,
+        cache_dir: Path | None = DEFAULT_CACHE_DIR,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         """Initialize the Bills API client.
 
         Args:
             base_url: Base URL for the Bills API
+            max_concurrency: Maximum number of requests in flight at once
+            requests_per_second: Maximum sustained request rate
+            max_retries: Number of times to retry a failed request
+            scheduler: Use this scheduler instead of creating one
+            cache_dir: Folder for the on-disk response cache.
+                None disables caching.
+            transport: Custom httpx transport, e.g. to record or replay
+                responses (see lawchecker.api_fixtures)
         """
         self.base_url = base_url
+        self.stats = HttpStats()
+        self.cache: ResponseCache | None = None
+        if cache_dir is not None:
+            try:
+                self.cache = ResponseCache(cache_dir)
+            except OSError as e:
+                logger.warning(f'HTTP cache disabled: {e!r}')
+        self.max_retries = max_retries
+        self.scheduler = scheduler or RequestScheduler(
+            max_concurrency=max_concurrency,
+            initial_concurrency=min(8, max_concurrency),
+            requests_per_second=requests_per_second,
+        )
         self.session = httpx.AsyncClient(
             timeout=httpx.Timeout(15.0, connect=5.0),
             limits=httpx.Limits(
@@ -764,10 +1063,18 @@ class BillsApiClient:
                 keepalive_expiry=30.0,
             ),
             http2=True,
+            transport=transport,
         )
 
     async def close(self) -> None:
         """Close the HTTP session."""
+        if self.cache is not None:
+            logger.info(
+                f'HTTP cache: {self.cache.hits} hits, '
+                f'{self.cache.revalidated} not modified, {self.cache.misses} misses'
+            )
+        if self.stats.endpoints:
+            logger.info(f'HTTP statistics:\n{self.stats.format_table()}')
         await self.session.aclose()
 
     async def __aenter__(self):
@@ -794,9 +1101,14 @@ class BillsApiClient:
     async def _make_request(
         self, url: str, params: dict[str, Any] | None = None
     ) -> httpx.Response:
-        """Make an HTTP request with automatic retry on timeout/network errors.
+        """Make an HTTP request through the response cache and request scheduler.
+
+        Fresh cached responses are returned without touching the network.
+        Stale cached responses are revalidated with a conditional GET.
 
-        Retries once on timeout or network errors, then raises the exception.
+        Timeouts, network errors and throttling responses (429, 502, 503,
+        504) are retried with exponential backoff and jitter, or after the
+        delay given in a Retry-After header.
 
         Args:
             url: The full URL to request
@@ -810,24 +1122,84 @@ class BillsApiClient:
             httpx.NetworkError: If network error occurs after retries
             httpx.HTTPStatusError: If response has error status code
         """
-        max_retries = 2
+        max_retries = self.max_retries
+
+        endpoint_stats = self.stats.endpoint(url)
+
+        key: str | None = None
+        entry: CacheEntry | None = None
+        headers: dict[str, str] | None = None
+        if self.cache is not None:
+            key = cache_key(url, params)
+            entry = self.cache.get(key)
+            if entry is not None:
+                if entry.is_fresh(ttl_for_url(url)):
+                    self.cache.hits += 1
+                    endpoint_stats.cache_hits += 1
+                    return entry.to_response(
+                        httpx.Request('GET', url, params=params)
+                    )
+                headers = entry.conditional_headers()
 
         for attempt in range(max_retries + 1):
+            response: httpx.Response | None = None
+            if attempt > 0:
+                endpoint_stats.retries += 1
             try:
-                response = await self.session.get(url, params=params)
+                async with self.scheduler.slot() as ticket:
+                    self.stats.request_started(endpoint_stats)
+                    started = time.monotonic()
+                    try:
+                        response = await self.session.get(
+                            url,
+                            params=params,
+                            headers=headers,
+                            extensions={'trace': RequestTrace(endpoint_stats)},
+                        )
+                    finally:
+                        self.stats.request_finished(
+                            endpoint_stats, time.monotonic() - started, response
+                        )
+                    ticket.record(response.status_code)
+
+                if response.status_code == 304 and entry is not None:
+                    # not modified, so the cached body is still good
+                    self.cache.revalidated += 1  # type: ignore
+                    self.cache.touch(key)  # type: ignore
+                    return entry.to_response(response.request)
+
                 response.raise_for_status()
+
+                if self.cache is not None and key is not None:
+                    self.cache.misses += 1
+                    if response.status_code == 200:
+                        self.cache.put(key, response)
+
                 return response
+            except httpx.HTTPStatusError:
+                if (
+                    response is None
+                    or response.status_code not in RETRYABLE_STATUS_CODES
+                    or attempt == max_retries
+                ):
+                    raise
+                logger.info(
+                    f'HTTP {response.status_code} from {url} '
+                    f'(attempt {attempt + 1}/{max_retries + 1}), retrying...'
+                )
             except (httpx.TimeoutException, httpx.NetworkError):
                 if attempt == max_retries:
                     logger.error(
                         f'Request failed after {max_retries + 1} attempts: {url}'
                     )
                     raise
-                if attempt == max_retries - 1:
-                    logger.warning(
-                        f'Request timeout/network error '
-                        f'(attempt {attempt + 1}/{max_retries + 1}), final retry...'
-                    )
+                logger.info(
+                    f'Request timeout/network error '
+                    f'(attempt {attempt + 1}/{max_retries + 1}), retrying...'
+                )
+
+            await asyncio.sleep(self.scheduler.backoff_delay(attempt, response))
+
         # Should never reach here due to raise in exception handler
         raise RuntimeError('Unexpected code path in _make_request')
 
@@ -1535,6 +1907,149 @@ class BillsApiClient:
         return [StageReference.from_json(item) for item in items]
 
 
+# ============================================================================
+# Long-lived Session
+# ============================================================================
+
+
+class ClientSession:
+    """A BillsApiClient which lives on its own background event loop.
+
+    Synchronous code (e.g. the GUI) can run many queries through the same
+    client, so HTTP/2 connections, the response cache and the request
+    scheduler's limits are shared between queries instead of being set up
+    again each time.
+
+    Example:
+        session = ClientSession()
+        bills = session.run(lambda client: client.get_bills(search_term='Energy'))
+        session.close()
+    """
+
+    def __init__(self, **client_kwargs: Any):
+        """Initialise the session. The loop and client start on first use.
+
+        Args:
+            client_kwargs: Keyword arguments passed to BillsApiClient
+        """
+        self._client_kwargs = client_kwargs
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._client: BillsApiClient | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    @property
+    def stats(self) -> HttpStats | None:
+        """HTTP statistics of the client (None if it has not started)."""
+        return self._client.stats if self._client is not None else None
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name='BillsApiClientLoop', daemon=True
+        )
+        thread.start()
+
+        async def create_client() -> BillsApiClient:
+            # create the client on the loop which will use it
+            return BillsApiClient(**self._client_kwargs)
+
+        self._client = asyncio.run_coroutine_threadsafe(create_client(), loop).result()
+        self._loop = loop
+        self._thread = thread
+        logger.info('Started background Bills API client')
+
+    def run(self, coro_factory: Callable[['BillsApiClient'], Awaitable[T]]) -> T:
+        """Run a coroutine on the background loop and wait for the result.
+
+        If this is called from a GUI job which is then cancelled, the
+        coroutine is cancelled and jobs.JobCancelled is raised.
+
+        Args:
+            coro_factory: Called with the shared client, returns the
+                coroutine to run
+
+        Returns:
+            The result of the coroutine
+        """
+        with self._lock:
+            if not self.is_running:
+                self._start()
+
+        assert self._loop is not None and self._client is not None
+
+        job = jobs.current_job()
+
+        async def wrapper() -> T:
+            # the query is part of the caller's job (if any) so it reports
+            # progress to the job and stops when the job is cancelled
+            with jobs.job_context(job):
+                return await coro_factory(self._client)  # type: ignore
+
+        future = asyncio.run_coroutine_threadsafe(wrapper(), self._loop)
+
+        # in a GUI job, stop waiting (and cancel the query) if it is cancelled
+        while job is not None and not future.done():
+            concurrent.futures.wait([future], timeout=CANCEL_POLL_INTERVAL)
+            if job.cancel_requested and not future.done():
+                future.cancel()
+                raise jobs.JobCancelled(job.name)
+
+        return future.result()
+
+    def close(self) -> None:
+        """Close the client and stop the background loop."""
+        with self._lock:
+            loop, client, thread = self._loop, self._client, self._thread
+            self._loop = self._client = self._thread = None
+
+        if loop is None:
+            return
+
+        try:
+            if client is not None:
+                asyncio.run_coroutine_threadsafe(client.close(), loop).result(
+                    timeout=10
+                )
+        except Exception as e:
+            logger.warning(f'Error closing Bills API client: {e!r}')
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout=10)
+            loop.close()
+            logger.info('Stopped background Bills API client')
+
+
+_shared_session: ClientSession | None = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> ClientSession:
+    """Return the process wide ClientSession, creating it if needed."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = ClientSession()
+        return _shared_session
+
+
+def close_shared_session() -> None:
+    """Close the process wide ClientSession (if one was created)."""
+    global _shared_session
+    with _shared_session_lock:
+        session, _shared_session = _shared_session, None
+    if session is not None:
+        session.close()
+
+
+atexit.register(close_shared_session)
+
+
 # Helpers
 async def print_stages() -> None:
     async with BillsApiClient() as client:
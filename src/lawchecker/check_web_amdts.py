@@ -1,12 +1,13 @@
 import argparse
-import asyncio
 import csv
+import functools
 import json
 import logging
 import math
 import os
 import re
 import sys
+import time
 import urllib.parse
 import webbrowser
 from collections.abc import Mapping
@@ -14,7 +15,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import StrEnum
 from pathlib import Path
-from typing import Any, Iterable, NamedTuple
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple
 
 from lxml import etree, html
 from lxml.etree import QName, _Element, iselement
@@ -22,26 +23,32 @@ from lxml.html import HtmlElement
 
 from lawchecker import (
     __version__,
-    bills_api,
-    common,
+    amdt_storage,
     lawchecker_logger,
     pp_xml_lxml,
+    progress,
     templates,
     utils,
 )
 from lawchecker import xpath_helpers as xp
 from lawchecker.compare_bill_numbering import clean as clean_filename
+from lawchecker.jobs import check_cancelled, report_progress
 from lawchecker.lawchecker_logger import logger
 from lawchecker.settings import (
     AMENDMENT_DETAILS_URL_TEMPLATE,
     AMENDMENTS_URL_TEMPLATE,
-    COMPARE_REPORT_TEMPLATE,
     NSMAP,
     NSMAP2,
     PARSER,
     UKL,
+    get_settings,
 )
 from lawchecker.stars import NO_STAR, Star
+from lawchecker.watch import FileWatcher, wait_for_changes
+
+if TYPE_CHECKING:
+    # asyncio and the Bills API (with httpx) are imported when first used
+    from lawchecker import bills_api
 
 JSON = int | str | float | bool | None | list['JSON'] | dict[str, 'JSON']
 JSONObject = dict[str, JSON]
@@ -127,6 +134,27 @@ class ReportMetadata:
     generation_timestamp: datetime | None = None
 
 
+@dataclass(frozen=True)
+class ApiTarget:
+    """The bill and stage in the Bills API which an amendment paper belongs to."""
+
+    bill_id: int
+    stage_id: int
+    bill_short_title: str
+    stage_description: str
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return self.bill_id, self.stage_id
+
+    @property
+    def json_file_name(self) -> str:
+        """Name of the file the amendments for this stage are saved in."""
+        _short_title = clean_filename(self.bill_short_title, file_name_safe=True)
+        _stage = clean_filename(self.stage_description, file_name_safe=True)
+        return f'{_short_title}_{_stage}_amdts{amdt_storage.SUFFIX}'
+
+
 class Decision:
     similar_decisions = [
         ['Agreed', 'Agreed To', 'Added', 'Agreed to on division'],
@@ -232,41 +260,20 @@ class AmdtRef:
 
 
 def progress_bar(iterable: Iterable, total: int) -> list:
-    # also add the progress bar to the webview
-    active_window = common.RunTimeEnv.webview_window
-    progress_bar_id = ''
+    # the bar is drawn in the console and the webview by the progress bus
+    bus = progress.get_bus()
+    bar_id = bus.new_bar(total)
 
-    if active_window is not None:
-        progress_bar_id = active_window.evaluate_js('newProgressBar()')
-        logger.info(f'Progress bar id: {progress_bar_id}')
     output = []
     count = 0
-    bar_len = 50
 
-    sys.stdout.write('\r')
-
-    last_percent = 0
     for item in iterable:
         output.append(item)
         count += 1
-        filled_len = int(round(bar_len * count / total))
-        percents = round(100.0 * count / total)
-
-        if percents == last_percent:
-            continue
-        last_percent = percents
-
-        bar = '#' * filled_len + '-' * (bar_len - filled_len)
-        sys.stdout.write(f'[{bar}] {percents}%\r')
-        sys.stdout.flush()
-
-        if active_window is None:
-            continue
-
-        # consider window.evaluate_js which raises exceptions on js errors
-        active_window.run_js(f'updateProgressBar("{progress_bar_id}", {percents})')
+        bus.progress(bar_id, count, total)
+        report_progress(done=count, total=total)
 
-    sys.stdout.write('\n')
+    bus.end_bar(bar_id)
 
     return output
 
@@ -274,60 +281,49 @@ def progress_bar(iterable: Iterable, total: int) -> list:
 async def async_progress_bar(
     tasks: Iterable,
     error_prefix: str = 'Task failed',
-    bar_len: int = 50,
     log_level: int = logging.ERROR,
+    on_result: Callable[[Any], None] | None = None,
 ) -> list:
-    """Execute async tasks with a console progress bar.
+    """Execute async tasks with a progress bar.
+
+    The bar is drawn in the console and the webview by the progress bus,
+    which only redraws it a few times a second however quickly tasks finish.
 
     Args:
         tasks: Iterable of async tasks/coroutines to execute.
         error_prefix: Prefix for error log messages when a task fails.
-        bar_len: Length of the progress bar in characters.
         log_level: Logging level for error messages (default: logging.ERROR).
+        on_result: Called with each successful result as soon as it arrives.
 
     Returns:
         List of results, with exceptions for failed tasks.
     """
 
-    # also add the progress bar to the webview
-    active_window = common.RunTimeEnv.webview_window
-    progress_bar_id = ''
-
-    if active_window is not None:
-        progress_bar_id = active_window.evaluate_js('newProgressBar()')
-        logger.info(f'Progress bar id: {progress_bar_id}')
+    import asyncio
 
     tasks_list = list(tasks)
     responses = []
     total = len(tasks_list)
     count = 0
 
-    print('\n', end='', flush=True)
-    last_percents: int = -1
+    bus = progress.get_bus()
+    bar_id = bus.new_bar(total)
+
     for coro in asyncio.as_completed(tasks_list):
         try:
             result = await coro
             responses.append(result)
+            if on_result is not None:
+                on_result(result)
         except Exception as e:
             logger.log(log_level, f'{error_prefix}: {repr(e)}')
             responses.append(e)
 
         count += 1
-        filled_len = int(round(bar_len * count / total))
-        percents = int(round(100.0 * count / total))
-        if percents != last_percents:
-            last_percents = percents
-            bar = '#' * filled_len + '-' * (bar_len - filled_len)
-            sys.stdout.write(f'[{bar}] {percents}%\r')
-            sys.stdout.flush()
-
-        if active_window is None:
-            continue
+        bus.progress(bar_id, count, total)
+        report_progress(done=count, total=total)
 
-        # consider window.evaluate_js which raises exceptions on js errors
-        active_window.run_js(f'updateProgressBar("{progress_bar_id}", {percents})')
-
-    sys.stdout.write('\n')
+    bus.end_bar(bar_id)
 
     return responses
 
@@ -350,7 +346,8 @@ class Sponsor:
         is_lead: bool,
         sort_order: int,
     ):
-        self.name = name
+        # the same few hundred names appear over and over on big papers
+        self.name = sys.intern(name)
         self.is_lead = is_lead
         self.sort_order = sort_order
         self.member_id = member_id
@@ -383,7 +380,8 @@ class Sponsor:
         return self.name < other.name
 
     def __hash__(self) -> int:
-        return hash(self.name)
+        # must be consistent with __eq__ so sponsors can be used in sets
+        return hash(self.member_id)
 
     @classmethod
     def from_json(cls, sponsor: dict[str, Any]) -> 'Sponsor':
@@ -459,10 +457,18 @@ class Amendment:
         self.id = id
         self.dnum = dnum.strip().casefold()
         self.key = AmdtRef(num=self.num, dnum=self.dnum)
+        self._sponsor_ids: frozenset[int] | None = None
 
         # we might need to come up with an amendment id that is the same for both
         # the API and the XML... in particular a problem with amendments to amendments
 
+    @property
+    def sponsor_ids(self) -> frozenset[int]:
+        """MNIS IDs of the sponsors"""
+        if self._sponsor_ids is None:
+            self._sponsor_ids = frozenset(s.member_id for s in self.sponsors)
+        return self._sponsor_ids
+
     def __eq__(self, other: 'Amendment') -> bool:
         if not isinstance(other, Amendment):
             return NotImplemented
@@ -482,63 +488,33 @@ class Amendment:
     def from_json(
         cls, amendment_json: dict, parent: 'AmdtContainer | None' = None
     ) -> 'Amendment':
-        amendment_text_gen = (
-            f'{t.get("hangingIndentation", "") or ""} {t.get("text", "")}'.strip()
-            for t in amendment_json.get('amendmentLines', [])
-        )
-        amendment_text = '<div>' + '\n'.join(amendment_text_gen) + '</div>'
-        html_element = html.fromstring(amendment_text)
-
-        # add space after any span with a class of
-        # "sub-para-num" this will be important later
-        for span in html_element.xpath(".//span[@class='sub-para-num']"):
-            if span.tail:
-                span.tail = f' {span.tail}'
-            else:
-                span.tail = ' '
-        # amendment_text = utils.normalise_text(
-        #     xp.text_content(utils.clean_json_html_amdt(html_element))
-        # )
-        utils.normalise_table_newlines(html_element)
-        amendment_text = utils.normalise_text(xp.text_content(html_element))
+        return cls.from_record(decode_amendment_json(amendment_json), parent)
 
-        explanatory_text_html = amendment_json.get('explanatoryText', '')
-        if explanatory_text_html:
-            explanatory_text = utils.normalise_text(
-                xp.text_content(html.fromstring(f'<div>{explanatory_text_html}</div>'))
-            )
-        else:
-            explanatory_text = ''
-
-        amendmet_number: str = amendment_json.get(
-            'marshalledListText', ''
-        )  # amendment_no
-        decision: Decision = Decision(amendment_json.get('decision', ''))
-        # self.decision_explanation: str = amendment_json.get("decisionExplanation", "")
-        sponsors = [
-            Sponsor.from_json(item) for item in amendment_json.get('sponsors', [])
-        ]
+    @classmethod
+    def from_record(
+        cls, record: dict[str, Any], parent: 'AmdtContainer | None' = None
+    ) -> 'Amendment':
+        """Create an amendment from a record made by decode_amendment_json."""
 
-        _star: str | None = amendment_json.get('statusIndicator', None)
+        decision: Decision = Decision(record['decision'])
+        sponsors = [Sponsor.from_json(item) for item in record['sponsors']]
+
+        _star: str | None = record['statusIndicator']
         if _star is None:
             star: Star = Star.none()
         else:
             star = Star(_star)
 
-        _id = amendment_json.get('amendmentId', '')
-
-        dnum = amendment_json.get('dNum', '')
-
         return cls(
-            amendment_text,
-            explanatory_text,
-            amendmet_number,
+            record['amendmentText'],
+            record['explanatoryText'],
+            record['marshalledListText'],
             decision,
             sponsors,
             parent,
             star,
-            _id,
-            dnum,
+            record['amendmentId'],
+            record['dNum'],
         )
 
     @classmethod
@@ -668,6 +644,108 @@ class Amendment:
         )
 
 
+# fields kept from the sponsors JSON when decoding an amendment
+SPONSOR_FIELDS = ('name', 'memberId', 'isLead', 'sortOrder')
+
+# amendments per chunk when decoding in worker processes
+DECODE_CHUNK_SIZE = 250
+
+
+def decode_amendment_json(amendment_json: dict) -> dict[str, Any]:
+    """
+    Do the slow part of Amendment.from_json: turn the amendment and
+    explanatory statement HTML into normalised text.
+
+    Returns a compact record of builtin types (so it can be sent back from
+    a worker process) to pass to Amendment.from_record.
+    """
+
+    amendment_text_gen = (
+        f'{t.get("hangingIndentation", "") or ""} {t.get("text", "")}'.strip()
+        for t in amendment_json.get('amendmentLines', [])
+    )
+    amendment_text = '<div>' + '\n'.join(amendment_text_gen) + '</div>'
+    html_element = html.fromstring(amendment_text)
+
+    # add space after any span with a class of
+    # "sub-para-num" this will be important later
+    for span in html_element.xpath(".//span[@class='sub-para-num']"):
+        if span.tail:
+            span.tail = f' {span.tail}'
+        else:
+            span.tail = ' '
+    # amendment_text = utils.normalise_text(
+    #     xp.text_content(utils.clean_json_html_amdt(html_element))
+    # )
+    utils.normalise_table_newlines(html_element)
+    amendment_text = utils.normalise_text(xp.text_content(html_element))
+
+    explanatory_text_html = amendment_json.get('explanatoryText', '')
+    if explanatory_text_html:
+        explanatory_text = utils.normalise_text(
+            xp.text_content(html.fromstring(f'<div>{explanatory_text_html}</div>'))
+        )
+    else:
+        explanatory_text = ''
+
+    return {
+        'amendmentText': amendment_text,
+        'explanatoryText': explanatory_text,
+        'marshalledListText': amendment_json.get('marshalledListText', ''),
+        'decision': amendment_json.get('decision', ''),
+        'sponsors': [
+            {key: item.get(key) for key in SPONSOR_FIELDS}
+            for item in amendment_json.get('sponsors', [])
+        ],
+        'statusIndicator': amendment_json.get('statusIndicator', None),
+        'amendmentId': amendment_json.get('amendmentId', ''),
+        'dNum': amendment_json.get('dNum', ''),
+    }
+
+
+def decode_amendment_chunk(chunk: list[dict]) -> list[dict[str, Any]]:
+    return [decode_amendment_json(amendment_json) for amendment_json in chunk]
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Number of worker processes to use. 0 (or less) means one per CPU."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def decode_amendments(
+    amendments_json: list[dict],
+    jobs: int = 1,
+    chunk_size: int = DECODE_CHUNK_SIZE,
+) -> list[dict[str, Any]]:
+    """
+    Decode amendments with decode_amendment_json, split into chunks over
+    a pool of worker processes. Records are returned in the original order.
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = resolve_jobs(jobs)
+    if jobs == 1 or len(amendments_json) <= chunk_size:
+        return decode_amendment_chunk(amendments_json)
+
+    chunks = [
+        amendments_json[i : i + chunk_size]
+        for i in range(0, len(amendments_json), chunk_size)
+    ]
+    jobs = min(jobs, len(chunks))
+    logger.info(
+        f'Decoding {len(amendments_json)} amendments in {jobs} worker processes'
+    )
+
+    records: list[dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for chunk_records in executor.map(decode_amendment_chunk, chunks):
+            records.extend(chunk_records)
+    return records
+
+
 def normalise_amendments_xml(amendment_xml: _Element) -> _Element:
     raise NotImplementedError
 
@@ -743,6 +821,12 @@ class AmdtContainer(Mapping):
         self.stage_id = stage_id
         self.stage_name = stage_name
 
+        # secondary indexes, populated by _create_amdt_map
+        # dnum -> first key with that dnum
+        self._dnum_index: dict[str, AmdtRef] = {}
+        # num -> all keys with that num
+        self._num_index: dict[str, list[AmdtRef]] = {}
+
         self._dict: dict[AmdtRef, Amendment] = self._create_amdt_map()
         self.amdt_set: set[AmdtRef] = set(self._dict.keys())
         # {utils.clean_amendment_number(amdt.num) for amdt in self.amendments}
@@ -768,7 +852,20 @@ class AmdtContainer(Mapping):
         json_data: dict[str, JSON],
         container_type: ContainerType = ContainerType.AMDTS_FROM_API,
         resource_identifier: str = 'Api Amendments',
+        parsed_amendments: dict[int, Amendment] | None = None,
+        jobs: int = 1,
     ) -> 'AmdtContainer':
+        """
+        Create a container from the JSON made by get_amendments_detailed_json.
+
+        parsed_amendments can contain Amendment objects already created from
+        some of the items (keyed by amendmentId) so they are not parsed again.
+
+        If jobs is not 1 the amendments are decoded in that many worker
+        processes (0 for one per CPU), see decode_amendments.
+        """
+        parsed_amendments = parsed_amendments or {}
+
         bill_id: int | None = json_data.get('billId', None)  # type: ignore
         stage_id: int | None = json_data.get('stageId', None)  # type: ignore
         stage_name: str | None = json_data.get('stageDescription', None)  # type: ignore
@@ -782,14 +879,35 @@ class AmdtContainer(Mapping):
             logger.error('No amendments found in JSON data')
             return cls([])
 
+        # records decoded up front by worker processes, in the same order
+        # as the amendments which still need parsing
+        records: Iterator[dict[str, Any]] | None = None
+        if jobs != 1:
+            amendment_dicts = list(amendment_dicts)  # type: ignore
+            to_decode = [
+                amendment
+                for amendment in amendment_dicts
+                if len(amendment) != 0  # type: ignore
+                and amendment.get('amendmentId') not in parsed_amendments  # type: ignore
+            ]
+            records = iter(decode_amendments(to_decode, jobs))  # type: ignore
+
         for i, amendment in enumerate(amendment_dicts):  # type: ignore
+            check_cancelled()
             # amendmet_dicts can be completely empty
             # ... possibly http error when getting the amendments
             if len(amendment) == 0:
                 logger.warning(f'Empty amendment JSON data at index {i}')
                 continue
+            parsed = parsed_amendments.get(amendment.get('amendmentId'))  # type: ignore
+            if parsed is not None:
+                amendments.append(parsed)
+                continue
             try:
-                amendment = Amendment.from_json(amendment)
+                if records is None:
+                    amendment = Amendment.from_json(amendment)
+                else:
+                    amendment = Amendment.from_record(next(records))
                 amendments.append(amendment)
             except InvalidDataError as e:
                 logger.warning(repr(e))
@@ -814,6 +932,7 @@ class AmdtContainer(Mapping):
         amendments: list[Amendment] = []
 
         for amdt_xml in xp.get_amendments(xml_element):
+            check_cancelled()
             try:
                 # TODO: fix this
                 amendment = Amendment.from_xml(amdt_xml)
@@ -916,21 +1035,31 @@ class AmdtContainer(Mapping):
                 ' This should never happen and will confuse this app:'
             )
 
+        for key in _amdt_map:
+            if key.dnum:
+                self._dnum_index.setdefault(key.dnum, key)
+            if key.num:
+                self._num_index.setdefault(key.num, []).append(key)
+
+        self.duplicate_amdt_nums = [
+            num for num, keys in self._num_index.items() if len(keys) > 1
+        ]
+
         return _amdt_map
 
     def __getitem__(self, key: AmdtRef) -> Amendment:
         if key in self._dict:
             return self._dict[key]
-        for k in self._dict:
-            if k.dnum == key.dnum:
-                msg = f'Found amendment with matching dnum but different num: {k} vs {key}'
-                # This can happen with lords running lists which do not
-                # normally have amendment numbers...
-                # it's possible that while the XML does not have amendment numbers
-                # the API does have amendment numbers
-                # (if updated since the XML was created)
-                logger.info(msg)
-                return self._dict[k]
+        k = self._dnum_index.get(key.dnum) if key.dnum else None
+        if k is not None:
+            msg = f'Found amendment with matching dnum but different num: {k} vs {key}'
+            # This can happen with lords running lists which do not
+            # normally have amendment numbers...
+            # it's possible that while the XML does not have amendment numbers
+            # the API does have amendment numbers
+            # (if updated since the XML was created)
+            logger.info(msg)
+            return self._dict[k]
         raise KeyError(f'Amendment with key {key} not found')
 
     def __iter__(self):
@@ -957,8 +1086,8 @@ class Report:
 
     def __init__(
         self,
-        xml: Path | _Element,
-        json_amdts: dict[str, JSON],
+        xml: 'Path | _Element | AmdtContainer',
+        json_amdts: 'dict[str, JSON] | AmdtContainer',
         metadata: ReportMetadata | None = None,
     ):
         self.metadata = metadata
@@ -969,22 +1098,28 @@ class Report:
             self.xml_file_path = None
 
         try:
-            self.html_tree = html.parse(COMPARE_REPORT_TEMPLATE)
+            self.html_tree = html.parse(get_settings().compare_report_template)
             self.html_root = self.html_tree.getroot()
         except Exception as e:
             logger.error(f'Error parsing HTML template file: {e}')
             raise
 
         # create AmdtContainer object for xml amendments
-        if isinstance(xml, Path):
+        if isinstance(xml, AmdtContainer):
+            # already created e.g. by fetch_and_parse
+            self.xml_amdts = xml
+        elif isinstance(xml, Path):
             self.xml_amdts = AmdtContainer.from_xml_file(xml)
         elif iselement(xml):
             self.xml_amdts = AmdtContainer.from_xml_element(xml)
         else:
-            raise TypeError('xml must be a Path or an Element')
+            raise TypeError('xml must be a Path, an Element or an AmdtContainer')
 
         # create AmdtContainer object for json amendments
-        self.json_amdts = AmdtContainer.from_json(json_amdts)
+        if isinstance(json_amdts, AmdtContainer):
+            self.json_amdts = json_amdts
+        else:
+            self.json_amdts = AmdtContainer.from_json(json_amdts)
 
         # here we will put all amendments that arn't correctly in the API
         # including missing amendments, amendments with incorrect content,
@@ -1041,6 +1176,7 @@ class Report:
         # for each amendment in the document
         # populate the star check, name changes and changes to existing amendments
         for key, xml_amdt in self.xml_amdts.items():
+            check_cancelled()
             if key not in self.json_amdts:
                 # the star check only happens when there is no coresponding
                 # amendment in previous document
@@ -1612,11 +1748,14 @@ class Report:
         if self.duplicate_names_in_xml:
             logger.warning(f'Duplicate names found in {xml_amdt.key.long_ref} in XML')
 
+        # sponsors are matched on MNIS ID (not name) see Sponsor.__eq__
+        json_ids = json_amdt.sponsor_ids
+        xml_ids = xml_amdt.sponsor_ids
         added_names = [
-            item.name for item in xml_amdt.sponsors if item not in json_amdt.sponsors
+            item.name for item in xml_amdt.sponsors if item.member_id not in json_ids
         ]
         removed_names = [
-            item.name for item in json_amdt.sponsors if item not in xml_amdt.sponsors
+            item.name for item in json_amdt.sponsors if item.member_id not in xml_ids
         ]
 
         if not added_names and not removed_names:
@@ -2154,22 +2293,48 @@ class Report:
 
 
 def sync_query_bills_api(
-    amend_xml_path: Path, save_json: bool = True
+    amend_xml_path: Path, save_json: bool = True, incremental: bool = False
 ) -> dict[str, JSON] | None:
     """
-    Synchronous wrapper for async_query_bills_api.
+    Synchronous wrapper for async_query_bills_api. Queries are run on the
+    shared background client so connections are reused between calls.
     """
 
-    return asyncio.run(async_query_bills_api(amend_xml_path, save_json))
+    from lawchecker import bills_api
+
+    return bills_api.get_shared_session().run(
+        lambda client: async_query_bills_api(
+            amend_xml_path, save_json, incremental, client=client
+        )
+    )
 
 
 async def async_query_bills_api(
-    amend_xml_path: Path, save_json: bool = True
+    amend_xml_path: Path,
+    save_json: bool = True,
+    incremental: bool = False,
+    client: 'bills_api.BillsApiClient | None' = None,
+    on_amendment: Callable[[JSONObject], None] | None = None,
 ) -> dict[str, JSON] | None:
     """
     Query the API for the bill XML files related to the amendment XML file.
+
+    If incremental is True, the JSON saved by a previous run (next to the
+    XML file) is used and only new or changed amendments are downloaded.
+
+    If no client is given, one is created for the duration of the query.
+
+    on_amendment is passed on to get_amendments_detailed_json.
     """
 
+    from lawchecker import bills_api
+
+    if client is None:
+        async with bills_api.BillsApiClient() as client:
+            return await async_query_bills_api(
+                amend_xml_path, save_json, incremental, client, on_amendment
+            )
+
     if not amend_xml_path:
         logger.error('No amendment XML file selected.')
         return
@@ -2180,8 +2345,26 @@ async def async_query_bills_api(
         logger.error(f'Amendment XML file is not valid XML: {amend_xml_path}')
         return
 
-    # find the bill title from the amendment XML
     amdt_xml_root = amend_xml.getroot()
+    target = await resolve_api_target(amdt_xml_root, client)
+    if target is None:
+        return
+
+    file_path = amend_xml_path.parent / target.json_file_name
+    return await fetch_target_amendments(
+        target, client, file_path, save_json, incremental, on_amendment
+    )
+
+
+async def resolve_api_target(
+    amdt_xml_root: _Element, client: 'bills_api.BillsApiClient'
+) -> ApiTarget | None:
+    """
+    Find the bill and stage in the Bills API which an amendment paper
+    (or proceedings paper) belongs to.
+    """
+
+    # find the bill title from the amendment XML
     try:
         bill_title = amdt_xml_root.xpath(
             '//xmlns:TLCConcept[@eId="varBillTitle"]/@showAs', namespaces=NSMAP
@@ -2205,13 +2388,12 @@ async def async_query_bills_api(
     #     logger.error(f'Error querying the API: {e}')
     #     return
 
-    async with bills_api.BillsApiClient() as client:
-        # TODO: remember to normalise the bill title
-        try:
-            bills = await client.get_bills(search_term=bill_title)
-        except Exception as e:
-            logger.error(f'Error querying the API asynchronously: {e}')
-            return
+    # TODO: remember to normalise the bill title
+    try:
+        bills = await client.get_bills(search_term=bill_title)
+    except Exception as e:
+        logger.error(f'Error querying the API asynchronously: {e}')
+        return
 
     # file_name = "amendments_details.json"
     # json.dump(response_json, open(file_name, "w"), indent=2, ensure_ascii=False)
@@ -2249,13 +2431,12 @@ async def async_query_bills_api(
             f'Stage in amendment XML ({stage}) does not match current stage in API ({api_stage_description}).'
         )
         # look thorugh all other stages to get the correct one
-        async with bills_api.BillsApiClient() as client:
-            try:
-                stages = await client.get_bill_stages(bill_id)
-            except Exception as e:
-                logger.error('Error getting stages from API asynchronously.')
-                logger.error(repr(e))
-                return
+        try:
+            stages = await client.get_bill_stages(bill_id)
+        except Exception as e:
+            logger.error('Error getting stages from API asynchronously.')
+            logger.error(repr(e))
+            return
         for item in stages:
             description = item.description
             if description.casefold().strip() == stage.casefold().strip():
@@ -2272,37 +2453,486 @@ async def async_query_bills_api(
         logger.error('Could not get bill ID or stage ID from the API.')
         return
 
-    async with bills_api.BillsApiClient() as client:
-        amendments_summary_json = await get_amendments_summary_json(
-            bill_id, stage_id, client
+    return ApiTarget(
+        bill_id,
+        stage_id,
+        str(api_bill_short_title),
+        api_stage_description,
+    )
+
+
+async def fetch_target_amendments(
+    target: ApiTarget,
+    client: 'bills_api.BillsApiClient',
+    json_file_path: Path | None = None,
+    save_json: bool = True,
+    incremental: bool = False,
+    on_amendment: Callable[[JSONObject], None] | None = None,
+) -> dict[str, JSON]:
+    """
+    Download the amendments for a bill stage.
+
+    If save_json is True the amendments are saved to json_file_path. If
+    incremental is True, the file saved there by a previous run is used and
+    only new or changed amendments are downloaded.
+    """
+
+    previous_json = load_previous_amdts_json(json_file_path) if incremental else None
+
+    amendments_summary_json = await get_amendments_summary_json(
+        target.bill_id, target.stage_id, client
+    )
+    amdts_json = await get_amendments_detailed_json(
+        amendments_summary_json,
+        target.bill_id,
+        target.stage_id,
+        client,
+        target.stage_description,
+        target.bill_short_title,
+        previous_json=previous_json,
+        on_amendment=on_amendment,
+    )
+
+    if save_json and json_file_path:
+        save_json_to_file(amdts_json, json_file_path)
+
+    return amdts_json
+
+
+def sync_fetch_and_parse(
+    amend_xml_path: Path,
+    save_json: bool = True,
+    incremental: bool = False,
+    jobs: int = 1,
+) -> tuple[AmdtContainer, AmdtContainer] | None:
+    """
+    Synchronous wrapper for async_fetch_and_parse.
+    """
+
+    from lawchecker import bills_api
+
+    return bills_api.get_shared_session().run(
+        lambda client: async_fetch_and_parse(
+            amend_xml_path, save_json, incremental, client=client, jobs=jobs
+        )
+    )
+
+
+async def async_fetch_and_parse(
+    amend_xml_path: Path,
+    save_json: bool = True,
+    incremental: bool = False,
+    client: 'bills_api.BillsApiClient | None' = None,
+    jobs: int = 1,
+) -> tuple[AmdtContainer, AmdtContainer] | None:
+    """
+    Query the API for the amendments related to the amendment XML file
+    while the XML file is parsed in a worker thread.
+
+    Each amendment is turned into an Amendment object (in a worker thread,
+    off the event loop) as soon as it is downloaded, so the parsing happens
+    while waiting on the network. If jobs is not 1 the amendments are
+    instead decoded by worker processes once downloaded, which is quicker
+    when the download is quick (e.g. when most responses are cached).
+
+    Returns:
+        (xml amendments, api amendments) or None if the API query failed.
+    """
+
+    import asyncio
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    # the XML is parsed in a thread while the API is queried
+    xml_task = asyncio.create_task(
+        asyncio.to_thread(AmdtContainer.from_xml_file, amend_xml_path)
+    )
+
+    parsed_amendments: dict[int, Amendment] = {}
+
+    def parse_one(amendment_json: JSONObject) -> None:
+        try:
+            amendment = Amendment.from_json(amendment_json)
+        except InvalidDataError:
+            # try again (and log the error) in AmdtContainer.from_json
+            return
+        parsed_amendments[amendment_json.get('amendmentId')] = amendment  # type: ignore
+
+    # parsing is CPU work, so it must not hold up the event loop (which is
+    # shared with the other requests being downloaded)
+    parser = ThreadPoolExecutor(max_workers=1, thread_name_prefix='amdt-parse')
+    parse_futures: list[Future[None]] = []
+
+    def parse_amendment(amendment_json: JSONObject) -> None:
+        parse_futures.append(parser.submit(parse_one, amendment_json))
+
+    try:
+        amdts_json = await async_query_bills_api(
+            amend_xml_path,
+            save_json,
+            incremental,
+            client=client,
+            on_amendment=parse_amendment if jobs == 1 else None,
+        )
+    except BaseException:
+        xml_task.cancel()
+        parser.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    # wait for the amendments which are still being parsed
+    await asyncio.to_thread(parser.shutdown)
+    xml_amdts = await xml_task
+
+    # pass on any unexpected error from the parse thread
+    for future in parse_futures:
+        future.result()
+
+    if not amdts_json:
+        return None
+
+    if jobs != 1:
+        json_amdts = await asyncio.to_thread(
+            AmdtContainer.from_json, amdts_json, jobs=jobs
+        )
+        return xml_amdts, json_amdts
+
+    logger.info(f'{len(parsed_amendments)} API amendments parsed while downloading.')
+    json_amdts = await asyncio.to_thread(
+        AmdtContainer.from_json, amdts_json, parsed_amendments=parsed_amendments
+    )
+
+    return xml_amdts, json_amdts
+
+
+@dataclass
+class BatchPaper:
+    """An amendment paper in a batch run and what was found for it."""
+
+    xml_path: Path
+    xml_amdts: AmdtContainer | None = None
+    json_amdts: AmdtContainer | None = None
+    target: ApiTarget | None = None
+    error: str | None = None
+
+
+def find_xml_files(paths: Iterable[Path]) -> list[Path]:
+    """
+    Expand folders into the XML files they contain. Files are returned in
+    the order given (folder contents sorted by name) without duplicates.
+    """
+
+    xml_files: dict[Path, None] = {}
+    for path in paths:
+        if path.is_dir():
+            for xml_file in sorted(path.glob('*.xml')):
+                xml_files.setdefault(xml_file.resolve())
+        else:
+            xml_files.setdefault(path.resolve())
+    return list(xml_files)
+
+
+async def prepare_paper(paper: BatchPaper, client: 'bills_api.BillsApiClient') -> None:
+    """
+    Parse the XML for a paper and find its bill and stage in the Bills API.
+    Sets the paper's error if either fails.
+    """
+
+    import asyncio
+
+    try:
+        # parsers can't be shared between threads so use a copy
+        tree = await asyncio.to_thread(etree.parse, str(paper.xml_path), PARSER.copy())
+    except (etree.XMLSyntaxError, OSError) as e:
+        paper.error = f'Could not parse XML: {e}'
+        return
+
+    root = tree.getroot()
+    xml_task = asyncio.create_task(
+        asyncio.to_thread(
+            AmdtContainer.from_xml_element,
+            root,
+            resource_identifier=paper.xml_path.name,
+        )
+    )
+    paper.target = await resolve_api_target(root, client)
+    paper.xml_amdts = await xml_task
+
+    if paper.target is None:
+        paper.error = 'Could not find the bill and stage in the Bills API'
+
+
+@dataclass
+class StageAmendments:
+    """The amendments downloaded for a bill stage."""
+
+    target: ApiTarget
+    json_file_path: Path
+    amdts_json: JSONObject
+    json_amdts: AmdtContainer
+
+
+async def fetch_stage(
+    paper: BatchPaper,
+    client: 'bills_api.BillsApiClient',
+    save_json: bool = True,
+    incremental: bool = False,
+    jobs: int = 1,
+) -> StageAmendments:
+    """
+    Download and parse the amendments for the bill stage of a paper. The
+    JSON is saved next to the paper.
+    """
+
+    import asyncio
+
+    target: ApiTarget = paper.target  # type: ignore
+    json_file_path = paper.xml_path.parent / target.json_file_name
+    amdts_json = await fetch_target_amendments(
+        target, client, json_file_path, save_json, incremental
+    )
+    json_amdts = await asyncio.to_thread(AmdtContainer.from_json, amdts_json, jobs=jobs)
+    return StageAmendments(target, json_file_path, amdts_json, json_amdts)
+
+
+def sync_batch_fetch_and_parse(
+    xml_paths: list[Path],
+    save_json: bool = True,
+    incremental: bool = False,
+    jobs: int = 1,
+) -> list[BatchPaper]:
+    """
+    Synchronous wrapper for async_batch_fetch_and_parse.
+    """
+
+    from lawchecker import bills_api
+
+    return bills_api.get_shared_session().run(
+        lambda client: async_batch_fetch_and_parse(
+            xml_paths, save_json, incremental, client=client, jobs=jobs
+        )
+    )
+
+
+async def async_batch_fetch_and_parse(
+    xml_paths: list[Path],
+    save_json: bool = True,
+    incremental: bool = False,
+    client: 'bills_api.BillsApiClient | None' = None,
+    jobs: int = 1,
+) -> list[BatchPaper]:
+    """
+    Parse several amendment papers and get the API amendments for each.
+
+    The bill and stage for every paper is found first, then the amendments
+    for each distinct bill stage are downloaded once, so papers from the
+    same stage share one download. Everything goes through one client so
+    the client's concurrency limit applies to the whole batch.
+
+    Papers which could not be checked have their error set. jobs is
+    passed on to AmdtContainer.from_json.
+    """
+
+    import asyncio
+
+    from lawchecker import bills_api
+
+    if client is None:
+        async with bills_api.BillsApiClient() as client:
+            return await async_batch_fetch_and_parse(
+                xml_paths, save_json, incremental, client, jobs
+            )
+
+    papers = [BatchPaper(path) for path in xml_paths]
+    await asyncio.gather(*(prepare_paper(paper, client) for paper in papers))
+
+    # the first paper for each bill stage decides where the JSON is saved
+    stage_papers: dict[tuple[int, int], BatchPaper] = {}
+    for paper in papers:
+        if paper.target is not None:
+            stage_papers.setdefault(paper.target.key, paper)
+
+    logger.notice(
+        f'{len(papers)} papers from {len(stage_papers)} bill stages.'
+        ' Downloading amendments...'
+    )
+
+    results = await asyncio.gather(
+        *(
+            fetch_stage(paper, client, save_json, incremental, jobs)
+            for paper in stage_papers.values()
+        ),
+        return_exceptions=True,
+    )
+    stage_amdts = dict(zip(stage_papers, results))
+
+    for paper in papers:
+        if paper.target is None:
+            continue
+        result = stage_amdts[paper.target.key]
+        if isinstance(result, BaseException):
+            paper.error = f'Could not get amendments from the API: {result!r}'
+        else:
+            paper.json_amdts = result.json_amdts
+
+    return papers
+
+
+async def refresh_stage(
+    stage: StageAmendments,
+    client: 'bills_api.BillsApiClient',
+    save_json: bool = True,
+) -> bool:
+    """
+    Check the Bills API for changes to the amendments for a stage and
+    download any which have changed. Returns True if anything changed.
+
+    Cached responses are always revalidated, which costs a conditional GET
+    (answered with 304 Not Modified if nothing has changed) per summary page.
+    Amendment details older than detail_refresh_age() are revalidated too,
+    even if the summaries have not changed (see find_unchanged_amendments).
+    """
+
+    import asyncio
+
+    from lawchecker import http_cache
+
+    target = stage.target
+    previous_fingerprints: dict[str, str] = (
+        stage.amdts_json.get('summaryFingerprints') or {}  # type: ignore
+    )
+    stale_ids = stale_detail_ids(stage.amdts_json)
+
+    with http_cache.max_cache_age(0):
+        summary = await get_amendments_summary_json(
+            target.bill_id, target.stage_id, client
         )
-        print('HERE!')
+        fingerprints = {
+            str(amendment.get('amendmentId', 0)): summary_fingerprint(amendment)
+            for amendment in summary
+        }
+        if fingerprints == previous_fingerprints and not stale_ids:
+            return False
+
         amdts_json = await get_amendments_detailed_json(
-            amendments_summary_json,
-            bill_id,
-            stage_id,
+            summary,
+            target.bill_id,
+            target.stage_id,
             client,
-            api_stage_description,
-            str(api_bill_short_title),
+            target.stage_description,
+            target.bill_short_title,
+            previous_json=stage.amdts_json,
         )
 
+    # reuse the Amendment objects for amendments which have not changed
+    unchanged_ids = {
+        amdt_id
+        for amdt_id, fingerprint in fingerprints.items()
+        if previous_fingerprints.get(amdt_id) == fingerprint
+        and amdt_id not in stale_ids
+    }
+    parsed_amendments = {
+        amendment.id: amendment
+        for amendment in stage.json_amdts.amendments
+        if str(amendment.id) in unchanged_ids
+    }
+    stage.json_amdts = await asyncio.to_thread(
+        AmdtContainer.from_json, amdts_json, parsed_amendments=parsed_amendments
+    )
+    stage.amdts_json = amdts_json
+
     if save_json:
-        _short_title = clean_filename(api_bill_short_title, file_name_safe=True)
-        _stage = clean_filename(api_stage_description, file_name_safe=True)
-        file_name = f'{_short_title}_{_stage}_amdts.json'
-        # file_name = create_friendly_name(file_name, lowercase=False)
-        xml_file_parent = amend_xml_path.parent
-        file_path = xml_file_parent / file_name
+        save_json_to_file(amdts_json, stage.json_file_path)
 
-        try:
-            with open(file_path, 'w') as f:
-                json.dump(amdts_json, f, indent=2, ensure_ascii=False)
-            logger.notice(f'Amendments details saved to file: {file_path}')
-        except Exception as e:
-            logger.error(f'Could not save amendments JSON to file: {file_path}')
-            logger.error(repr(e))
+    return True
 
-    return amdts_json
+
+async def async_watch_step(
+    papers: dict[Path, BatchPaper],
+    stages: dict[tuple[int, int], StageAmendments],
+    changed_files: set[Path],
+    poll_api: bool,
+    client: 'bills_api.BillsApiClient',
+    save_json: bool = True,
+    incremental: bool = False,
+    jobs: int = 1,
+) -> set[Path]:
+    """
+    One iteration of watch mode. papers and stages are kept between
+    iterations and updated in place.
+
+    Changed files are parsed again (removed files are forgotten), bill
+    stages not seen before are downloaded and, if poll_api is True, every
+    stage is checked for changes in the API.
+
+    Returns the papers whose reports need to be created again.
+    """
+
+    import asyncio
+
+    affected: set[Path] = set()
+
+    for path in changed_files:
+        papers.pop(path, None)
+
+    changed_papers = [BatchPaper(path) for path in changed_files if path.exists()]
+    await asyncio.gather(*(prepare_paper(paper, client) for paper in changed_papers))
+    for paper in changed_papers:
+        papers[paper.xml_path] = paper
+        affected.add(paper.xml_path)
+
+    new_stages: dict[tuple[int, int], BatchPaper] = {}
+    for paper in papers.values():
+        if paper.target is not None and paper.target.key not in stages:
+            new_stages.setdefault(paper.target.key, paper)
+
+    results = await asyncio.gather(
+        *(
+            fetch_stage(paper, client, save_json, incremental, jobs)
+            for paper in new_stages.values()
+        ),
+        return_exceptions=True,
+    )
+    for key, result in zip(new_stages, results):
+        if isinstance(result, BaseException):
+            logger.error(f'Could not get amendments from the API: {result!r}')
+        else:
+            stages[key] = result
+
+    if poll_api:
+        logger.info(f'Checking the Bills API for changes to {len(stages)} stages...')
+        for key, stage in stages.items():
+            try:
+                changed = await refresh_stage(stage, client, save_json)
+            except Exception as e:
+                logger.error(f'Could not check the Bills API for changes: {e!r}')
+                continue
+            if changed:
+                logger.notice(
+                    'Amendments changed in the API for'
+                    f' {stage.target.bill_short_title}'
+                    f' ({stage.target.stage_description})'
+                )
+                affected.update(
+                    path
+                    for path, paper in papers.items()
+                    if paper.target is not None and paper.target.key == key
+                )
+
+    # forget stages which no paper needs any more
+    in_use = {paper.target.key for paper in papers.values() if paper.target}
+    for key in stages.keys() - in_use:
+        del stages[key]
+
+    for path in affected:
+        paper = papers[path]
+        if paper.target is None:
+            continue
+        stage = stages.get(paper.target.key)
+        if stage is None:
+            paper.error = 'Could not get amendments from the API'
+        else:
+            paper.json_amdts = stage.json_amdts
+
+    return affected
 
 
 def sync_query_bills_api_from_ids(
@@ -2310,13 +2940,19 @@ def sync_query_bills_api_from_ids(
     stage_id: int,
     save_json: bool = True,
     json_file_path: Path | None = None,
+    incremental: bool = False,
 ) -> dict[str, JSON] | None:
     """
-    Synchronous wrapper for async_query_bills_api_from_ids.
+    Synchronous wrapper for async_query_bills_api_from_ids. Queries are run
+    on the shared background client so connections are reused between calls.
     """
 
-    return asyncio.run(
-        async_query_bills_api_from_ids(bill_id, stage_id, save_json, json_file_path)
+    from lawchecker import bills_api
+
+    return bills_api.get_shared_session().run(
+        lambda client: async_query_bills_api_from_ids(
+            bill_id, stage_id, save_json, json_file_path, incremental, client=client
+        )
     )
 
 
@@ -2325,22 +2961,38 @@ async def async_query_bills_api_from_ids(
     stage_id: int,
     save_json: bool = True,
     json_file_path: Path | None = None,
+    incremental: bool = False,
+    client: 'bills_api.BillsApiClient | None' = None,
 ) -> dict[str, JSON] | None:
     """
     Query the API for the bill XML files related to the amendment XML file.
+
+    If incremental is True, json_file_path is read first and only new or
+    changed amendments are downloaded.
+
+    If no client is given, one is created for the duration of the query.
     """
 
-    async with bills_api.BillsApiClient() as client:
-        amendments_summary_json = await get_amendments_summary_json(
-            bill_id, stage_id, client
-        )
-        print('HERE!')
-        amdts_json = await get_amendments_detailed_json(
-            amendments_summary_json,
-            bill_id,
-            stage_id,
-            client,
-        )
+    from lawchecker import bills_api
+
+    if client is None:
+        async with bills_api.BillsApiClient() as client:
+            return await async_query_bills_api_from_ids(
+                bill_id, stage_id, save_json, json_file_path, incremental, client
+            )
+
+    previous_json = load_previous_amdts_json(json_file_path) if incremental else None
+
+    amendments_summary_json = await get_amendments_summary_json(
+        bill_id, stage_id, client
+    )
+    amdts_json = await get_amendments_detailed_json(
+        amendments_summary_json,
+        bill_id,
+        stage_id,
+        client,
+        previous_json=previous_json,
+    )
 
     if save_json and not json_file_path:
         logger.warning(
@@ -2348,30 +3000,190 @@ async def async_query_bills_api_from_ids(
         )
 
     if save_json and json_file_path:
-        try:
-            with open(json_file_path, 'w') as f:
-                json.dump(amdts_json, f, indent=2, ensure_ascii=False)
-            logger.notice(f'Amendments details saved to file: {json_file_path}')
-        except Exception as e:
-            logger.error(f'Could not save amendments JSON to file: {json_file_path}')
-            logger.error(repr(e))
+        save_json_to_file(amdts_json, json_file_path)
 
     return amdts_json
 
 
 def save_json_to_file(json_data: dict[str, JSON], file_path: Path) -> None:
     """
-    Save the JSON data to a file.
+    Save the JSON data to a file. Files ending .json are saved as plain
+    JSON, otherwise the compressed format from amdt_storage is used.
     """
     try:
-        with open(file_path, 'w') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
+        amdt_storage.save_amdts(json_data, file_path)
         logger.notice(f'Amendments details saved to file: {file_path}')
     except Exception as e:
         logger.error(f'Could not save amendments JSON to file: {file_path}')
         logger.error(repr(e))
 
 
+def load_previous_amdts_json(file_path: Path | None) -> JSONObject | None:
+    """
+    Load the amendments JSON saved by a previous run (if there is one).
+    Plain .json files saved by older versions are used if there is no
+    compressed file.
+    """
+    if file_path is None:
+        return None
+    if not file_path.exists():
+        legacy_path = file_path.with_name(
+            file_path.name.removesuffix(amdt_storage.SUFFIX) + '.json'
+        )
+        if not legacy_path.exists():
+            return None
+        file_path = legacy_path
+    try:
+        previous_json = amdt_storage.load_amdts(file_path)
+    except Exception as e:
+        logger.warning(f'Could not read previous amendments JSON {file_path}: {e}')
+        return None
+
+    if not isinstance(previous_json, dict):
+        return None
+
+    logger.info(f'Loaded previous amendments JSON from: {file_path}')
+    return previous_json
+
+
+# fields which appear in both the amendment summary and detail responses
+SHARED_SUMMARY_FIELDS = (
+    'statusIndicator',
+    'decision',
+    'decisionExplanation',
+    'amendmentType',
+    'clause',
+    'schedule',
+    'pageNumber',
+    'lineNumber',
+    'amendmentPosition',
+    'marshalledListText',
+    'dNum',
+)
+
+
+def detail_refresh_age() -> float:
+    """
+    Amendment details downloaded longer ago than this (seconds) are
+    requested again, even if the amendment's summary has not changed.
+
+    This is the HTTP cache's time to live for amendment responses, so a
+    correction to the text alone is picked up as soon as it would be for any
+    other cached response. The request is usually answered with a cheap
+    304 Not Modified.
+    """
+    from lawchecker import http_cache
+
+    return http_cache.AMENDMENT_TTL
+
+
+def summary_fingerprint(
+    amendment_json: JSONObject, include_summary_text: bool = True
+) -> str:
+    """
+    Create a string which changes if anything in an amendment summary changes.
+
+    If include_summary_text is False, only fields which are also in the
+    amendment detail response are used so that the result can be compared
+    with a fingerprint of a detail response.
+    """
+    sponsors = amendment_json.get('sponsors') or []
+    data: dict[str, JSON] = {
+        key: amendment_json.get(key) for key in SHARED_SUMMARY_FIELDS
+    }
+    data['sponsors'] = [
+        [s.get('memberId'), s.get('name'), s.get('isLead'), s.get('sortOrder')]
+        for s in sponsors  # type: ignore
+        if isinstance(s, dict)
+    ]
+    if include_summary_text:
+        data['summaryText'] = amendment_json.get('summaryText')
+
+    return json.dumps(data, sort_keys=True, ensure_ascii=False)
+
+
+def stale_detail_ids(
+    previous_json: JSONObject, max_age: float | None = None
+) -> set[str]:
+    """
+    IDs of the amendments in previous_json whose details were downloaded
+    more than max_age seconds ago (default detail_refresh_age()), or at an
+    unknown time (older files).
+    """
+    if max_age is None:
+        max_age = detail_refresh_age()
+    fetched_at: dict[str, float] = (
+        previous_json.get('detailFetchedAt') or {}  # type: ignore
+    )
+    oldest = time.time() - max_age
+    return {
+        amdt_id
+        for item in previous_json.get('items') or []  # type: ignore
+        if isinstance(item, dict)
+        and (amdt_id := str(item.get('amendmentId', 0)))
+        and fetched_at.get(amdt_id, 0) < oldest
+    }
+
+
+def find_unchanged_amendments(
+    amendments_summary_json: list[JSONObject],
+    previous_json: JSONObject,
+    bill_id: int,
+    stage_id: int,
+    max_detail_age: float | None = None,
+) -> dict[str, JSONObject]:
+    """
+    Return previously downloaded amendment details (keyed by amendment ID)
+    for amendments whose summary has not changed.
+
+    The summary list has no last updated field, so the summary fields are
+    compared instead. Files saved with 'summaryFingerprints' are compared
+    on the whole summary (including summaryText). For older files the fields
+    shared by the summary and the detail response are compared.
+
+    A correction which only changes the detail (e.g. the amendment text)
+    does not change the summary, so details downloaded more than
+    max_detail_age seconds (default detail_refresh_age()) ago are never
+    treated as unchanged. Downloading them again is cheap if nothing has
+    changed: the request is revalidated with the ETag or Last-Modified date
+    kept by the HTTP cache.
+    """
+    if previous_json.get('billId') != bill_id or (
+        previous_json.get('stageId') != stage_id
+    ):
+        logger.info('Previous amendments JSON is for a different bill or stage.')
+        return {}
+
+    previous_items: dict[str, JSONObject] = {
+        str(item.get('amendmentId')): item
+        for item in previous_json.get('items') or []  # type: ignore
+        if isinstance(item, dict) and item.get('amendmentId')
+    }
+    previous_fingerprints: dict[str, str] = (
+        previous_json.get('summaryFingerprints') or {}  # type: ignore
+    )
+    stale_ids = stale_detail_ids(previous_json, max_detail_age)
+
+    unchanged: dict[str, JSONObject] = {}
+    for amendment in amendments_summary_json:
+        amdt_id = str(amendment.get('amendmentId', 0))
+        previous_item = previous_items.get(amdt_id)
+        if previous_item is None or amdt_id in stale_ids:
+            continue
+
+        if amdt_id in previous_fingerprints:
+            same = previous_fingerprints[amdt_id] == summary_fingerprint(amendment)
+        else:
+            same = summary_fingerprint(
+                amendment, include_summary_text=False
+            ) == summary_fingerprint(previous_item, include_summary_text=False)
+
+        if same:
+            unchanged[amdt_id] = previous_item
+
+    return unchanged
+
+
 def create_friendly_name(text: str, lowercase: bool = True) -> str:
     # Remove all non-alphanumeric characters (excluding underscores if needed)
     cleaned = re.sub(r'[^A-Za-z0-9]', '', text)
@@ -2382,9 +3194,11 @@ async def get_amendments_detailed_json(
     amendments_summary_json: list[JSONObject],
     bill_id: int,
     stage_id: int,
-    client: bills_api.BillsApiClient,
+    client: 'bills_api.BillsApiClient',
     stage_description: str = '',
     api_bill_short_title: str = '',
+    previous_json: JSONObject | None = None,
+    on_amendment: Callable[[JSONObject], None] | None = None,
 ) -> JSONObject:
     """
     Fetch detailed amendment information from the Bills API.
@@ -2398,6 +3212,11 @@ async def get_amendments_detailed_json(
         stage_id: The unique identifier for the bill stage.
         stage_description: Human-readable description of the stage (e.g., 'Committee').
         api_bill_short_title: The short title of the bill.
+        previous_json: Output of a previous run for the same bill and stage.
+            If given, only amendments which are new or whose summary has
+            changed are fetched. The rest are copied from previous_json.
+        on_amendment: Called with each amendment's JSON as soon as it is
+            downloaded (not called for amendments copied from previous_json).
 
     Returns:
         A dictionary containing the bill metadata and a list of detailed amendment
@@ -2415,20 +3234,53 @@ async def get_amendments_detailed_json(
     logger.info(f'{len(amendment_ids)=}')
     # logger.info(f'{amendment_ids=}')
 
+    fingerprints = {
+        str(amendment.get('amendmentId', 0)): summary_fingerprint(amendment)
+        for amendment in amendments_summary_json
+    }
+
+    unchanged: dict[str, JSONObject] = {}
+    if previous_json is not None:
+        unchanged = find_unchanged_amendments(
+            amendments_summary_json, previous_json, bill_id, stage_id
+        )
+        logger.notice(
+            f'{len(unchanged)} of {len(amendment_ids)} amendments unchanged'
+            ' since last download.'
+        )
+
     tasks = [
         client.get_amendment_json(bill_id, stage_id, amdt_id)
         for amdt_id in amendment_ids
+        if str(amdt_id) not in unchanged
     ]
 
     results = await async_progress_bar(
-        tasks, error_prefix='Amendment detail fetch failed'
+        tasks, error_prefix='Amendment detail fetch failed', on_result=on_amendment
     )
 
+    fetched_time = time.time()
+    fetched: dict[str, JSONObject] = {}
     for result in results:
         if isinstance(result, Exception):
             logger.error(f'Error fetching amendment detail: {result}')
             continue
-        json_amendments_list.append(result)
+        fetched[str(result.get('amendmentId', 0))] = result
+
+    previous_fetched_at: dict[str, float] = (
+        (previous_json or {}).get('detailFetchedAt') or {}  # type: ignore
+    )
+    detail_fetched_at: dict[str, float] = {}
+
+    # keep the order from the summary list
+    for amdt_id in amendment_ids:
+        key = str(amdt_id)
+        if key in unchanged:
+            json_amendments_list.append(unchanged[key])
+            detail_fetched_at[key] = previous_fetched_at.get(key, 0)
+        elif key in fetched:
+            json_amendments_list.append(fetched[key])
+            detail_fetched_at[key] = fetched_time
 
     # def _request_data(amendment_id: str):
     #     """Query the API using the shared SESSION and return response or None."""
@@ -2469,6 +3321,9 @@ async def get_amendments_detailed_json(
         'stageId': stage_id,
         'stageDescription': stage_description,
         'items': json_amendments_list,
+        # used to decide what has changed next time (see find_unchanged_amendments)
+        'summaryFingerprints': fingerprints,
+        'detailFetchedAt': detail_fetched_at,
     }
 
     return json_output
@@ -2477,7 +3332,7 @@ async def get_amendments_detailed_json(
 async def get_amendments_summary_json(
     bill_id: int,
     stage_id: int,
-    client: bills_api.BillsApiClient,
+    client: 'bills_api.BillsApiClient',
     store_json_path: Path | None = None,
 ) -> list[JSONObject]:
     # run the first query synchronously to get the total count
@@ -2597,26 +3452,22 @@ def get_url_for_amendment(
 
 def find_duplicate_sponsors(lst: list[Sponsor]) -> list[Sponsor]:
     """
-    Find and return a list of duplicate items in the given list.
+    Find and return a list of duplicate sponsors in the given list.
 
-    This function takes a list of strings and returns a list of items that
-    appear more than once in the original list. The returned list contains
-    the duplicate items sorted in ascending order.
+    Sponsors are compared by MNIS ID. Each duplicated sponsor is returned
+    once, in the order the duplicates are found.
     """
 
-    # Convert the list to a set to remove duplicates
-    unique_items = []
-    duplicate_items = []
+    seen_ids: set[int] = set()
+    duplicate_ids: set[int] = set()
+    duplicate_items: list[Sponsor] = []
 
     for sponsor in lst:
-        if sponsor in unique_items:
-            if sponsor not in duplicate_items:
-                duplicate_items.append(sponsor)
-        else:
-            unique_items.append(sponsor)
-
-    # logger.info(f'{unique_items=}')
-    # logger.info(f'{duplicate_items=}')
+        if sponsor.member_id not in seen_ids:
+            seen_ids.add(sponsor.member_id)
+        elif sponsor.member_id not in duplicate_ids:
+            duplicate_ids.add(sponsor.member_id)
+            duplicate_items.append(sponsor)
 
     return duplicate_items
 
@@ -2630,21 +3481,29 @@ def parse_arguments():
 Examples:
   %(prog)s amendments.xml
   %(prog)s amendments.xml --json amendments.json
+  %(prog)s amendments.xml --json amendments_amdts.jsonl.gz
   %(prog)s amendments.xml -o report.html
   %(prog)s amendments.xml --sp
+  %(prog)s papers_folder/
+  %(prog)s amendments_1.xml amendments_2.xml -o reports/
         """,
     )
     parser.add_argument(
-        'xml_file',
+        'xml_files',
         type=Path,
-        help='XML amendment or proceedings file path',
+        nargs='+',
+        metavar='xml_file',
+        help=(
+            'XML amendment or proceedings file path. Give several files or a'
+            ' folder to check many papers at once'
+        ),
     )
     parser.add_argument(
         '--json',
         type=Path,
         metavar='json_file',
         default=None,
-        help='Existing JSON file with amendments details',
+        help='Existing JSON (.json or .jsonl.gz) file with amendments details',
     )
     parser.add_argument(
         '-o',
@@ -2652,7 +3511,10 @@ Examples:
         type=Path,
         metavar='OUTPUT_FILE',
         default=None,
-        help='Where to save the output report HTML file',
+        help=(
+            'Where to save the output report HTML file'
+            ' (a folder when checking several papers)'
+        ),
     )
     parser.add_argument(
         '--sp',
@@ -2664,6 +3526,47 @@ Examples:
         action='store_true',
         help='Do not save JSON response to file when querying API',
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help=(
+            'Reuse the JSON saved by a previous run and only download'
+            ' amendments which are new or have changed'
+        ),
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=1,
+        help=(
+            'Number of processes used to decode the API amendments'
+            ' (0 for one per CPU, default 1)'
+        ),
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help=(
+            'Keep running: recreate reports when the XML files change and'
+            ' check the Bills API for changes every --poll-interval seconds'
+        ),
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=120,
+        metavar='SECONDS',
+        help='How often to check the Bills API for changes in watch mode',
+    )
+    parser.add_argument(
+        '--http-stats',
+        action='store_true',
+        help=(
+            'Print statistics for the requests made to the Bills API'
+            ' (they are always written to the log file)'
+        ),
+    )
     parser.add_argument(
         '--summary',
         action='store_true',
@@ -2688,6 +3591,10 @@ Examples:
     )
     args = parser.parse_args()
 
+    # several papers (or a folder of papers) are checked in one batch
+    args.batch = len(args.xml_files) > 1 or args.xml_files[0].is_dir()
+    args.xml_file = None if args.batch else args.xml_files[0]
+
     return args
 
 
@@ -2711,6 +3618,7 @@ def setup_logging(verbosity: int):
 
 def main():
     lawchecker_logger.setup_lawchecker_logging()
+    args = None
     try:
         args = parse_arguments()
 
@@ -2718,45 +3626,64 @@ def main():
         if (error_code := validate_arguments(args)) != 0:
             return error_code
 
+        if args.watch:
+            return run_watch(args)
+
+        if args.batch:
+            return run_batch(args)
+
         # Load or fetch amendments data
         if args.json:
             logger.info(f'Loading amendments from JSON file: {args.json}')
             try:
-                with args.json.open('r') as f:
-                    amendments_list_json = json.load(f)
+                # amendments are read from the file as they are parsed
+                amendments_list_json = amdt_storage.load_amdts(args.json, stream=True)
             except json.JSONDecodeError as e:
                 logger.error(f'Invalid JSON file {args.json}: {e}')
                 return 1
             except Exception as e:
                 logger.error(f'Error reading JSON file {args.json}: {e}')
                 return 1
+
+            if not amendments_list_json:
+                logger.error('No amendments found from JSON file or API.')
+                return 1
+
+            # Parse XML file
+            logger.info(f'Parsing XML file: {args.xml_file}')
+            try:
+                with args.xml_file.open('rb') as f:
+                    tree = etree.parse(f, parser=PARSER)
+                root = tree.getroot()
+            except Exception as e:
+                logger.error(f'Error parsing XML file {args.xml_file}: {e}')
+                return 1
+
+            xml_amdts = AmdtContainer.from_xml_element(root)
+            json_amdts = AmdtContainer.from_json(amendments_list_json, jobs=args.jobs)
         else:
+            # the XML is parsed while the amendments are downloaded
             logger.info('Querying API for amendments data...')
             save_json = not args.no_save_json
-            amendments_list_json = sync_query_bills_api(args.xml_file, save_json)
+            try:
+                containers = sync_fetch_and_parse(
+                    args.xml_file, save_json, args.incremental, args.jobs
+                )
+            except (etree.XMLSyntaxError, OSError) as e:
+                logger.error(f'Error parsing XML file {args.xml_file}: {e}')
+                return 1
 
-        if not amendments_list_json:
-            logger.error('No amendments found from JSON file or API.')
-            return 1
+            if containers is None:
+                logger.error('No amendments found from JSON file or API.')
+                return 1
 
-        # Parse XML file
-        logger.info(f'Parsing XML file: {args.xml_file}')
-        try:
-            with args.xml_file.open('rb') as f:
-                tree = etree.parse(f, parser=PARSER)
-            root = tree.getroot()
-        except Exception as e:
-            logger.error(f'Error parsing XML file {args.xml_file}: {e}')
-            return 1
+            xml_amdts, json_amdts = containers
 
-        # Find amendments in XML
-        xpath = "//xmlns:amendment[@name='hcamnd']/xmlns:amendmentBody[@eId]"
-        amendments_xml = root.xpath(xpath, namespaces=NSMAP)
-        logger.info(f'Found {len(amendments_xml)} amendments in XML')
+        logger.info(f'Found {len(xml_amdts)} amendments in XML')
 
         # Generate report
         logger.info('Generating report...')
-        report = Report(root, amendments_list_json)
+        report = Report(xml_amdts, json_amdts)
 
         # Determine output filename
         if args.output:
@@ -2764,31 +3691,14 @@ def main():
         else:
             output_file: Path = args.xml_file.with_suffix('.html')
 
-        if args.summary:
-            summary_json_file = output_file.with_name(
-                output_file.stem + '_summary.json'
-            )
-            with summary_json_file.open('w') as f:
-                json.dump(report.json_summary(), f, indent=2, ensure_ascii=False)
-            logger.info(f'Saved summary JSON file to: {summary_json_file}')
-        else:
-            logger.info('Skipping summary JSON file as --summary not specified.')
-
         # Generate appropriate output
         if args.sp:
+            if args.summary:
+                save_summary(report, output_file)
             logger.info('Creating SharePoint table...')
             report.create_table_for_sharepoint()
         else:
-            report.html_tree.write(
-                str(output_file),
-                method='html',
-                encoding='utf-8',
-                doctype='<!DOCTYPE html>',
-            )
-
-            msg = f'Wrote HTML report to: {output_file}'
-            print(msg)
-            logger.info(msg)
+            save_report(report, output_file, args.summary)
 
             if not args.no_browser:
                 # Open in browser if possible
@@ -2800,12 +3710,185 @@ def main():
     except Exception as e:
         logger.error(f'Unexpected error: {e}')
         return 1
+    finally:
+        if args is not None and args.http_stats:
+            print_http_stats()
 
     return 0
 
 
+def save_summary(report: Report, output_file: Path) -> None:
+    from lawchecker import bills_api
+
+    summary = report.json_summary()
+
+    # how the amendments were downloaded, to help with tuning
+    http_stats = bills_api.get_shared_session().stats
+    if http_stats is not None:
+        summary['http_stats'] = http_stats.to_json()
+
+    summary_json_file = output_file.with_name(output_file.stem + '_summary.json')
+    with summary_json_file.open('w') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    logger.info(f'Saved summary JSON file to: {summary_json_file}')
+
+
+def print_http_stats() -> None:
+    from lawchecker import bills_api
+
+    http_stats = bills_api.get_shared_session().stats
+    if http_stats is None or not http_stats.endpoints:
+        print('No requests were made to the Bills API.')
+        return
+    print(http_stats.format_table())
+
+
+def save_report(report: Report, output_file: Path, summary: bool = False) -> None:
+    """Write the HTML report and (optionally) the JSON summary next to it."""
+
+    if summary:
+        save_summary(report, output_file)
+    else:
+        logger.info('Skipping summary JSON file as --summary not specified.')
+
+    report.html_tree.write(
+        str(output_file),
+        method='html',
+        encoding='utf-8',
+        doctype='<!DOCTYPE html>',
+    )
+
+    msg = f'Wrote HTML report to: {output_file}'
+    print(msg)
+    logger.info(msg)
+
+
+def run_batch(args) -> int:
+    """
+    Create a report for every XML file given on the command line (folders
+    are searched for XML files). Returns 1 if any report failed.
+    """
+
+    xml_paths = find_xml_files(args.xml_files)
+    if not xml_paths:
+        logger.error('No XML files found.')
+        return 1
+
+    logger.info(f'Querying API for amendments data for {len(xml_paths)} papers...')
+    papers = sync_batch_fetch_and_parse(
+        xml_paths, not args.no_save_json, args.incremental, args.jobs
+    )
+
+    failed = 0
+    for paper in papers:
+        if paper.error is not None:
+            logger.error(f'{paper.xml_path.name}: {paper.error}')
+            failed += 1
+            continue
+
+        output_file = report_output_file(args, paper.xml_path)
+
+        try:
+            report = Report(paper.xml_amdts, paper.json_amdts)  # type: ignore
+            save_report(report, output_file, args.summary)
+        except Exception as e:
+            logger.error(f'{paper.xml_path.name}: Could not create report: {e!r}')
+            failed += 1
+
+    logger.notice(f'{len(papers) - failed} of {len(papers)} reports created.')
+    return 1 if failed else 0
+
+
+def report_output_file(args, xml_path: Path) -> Path:
+    """Where to save the report for xml_path."""
+
+    if not args.batch:
+        return args.output or xml_path.with_suffix('.html')
+
+    output_folder: Path = args.output or xml_path.parent
+    return output_folder / xml_path.with_suffix('.html').name
+
+
+def run_watch(args) -> int:
+    """
+    Create the reports, then keep running: recreate a report when its XML
+    file changes, and poll the Bills API every --poll-interval seconds and
+    recreate the reports for any stage whose amendments have changed.
+
+    Parsed papers and downloaded amendments are kept in memory between
+    iterations. Stop with Ctrl+C.
+    """
+
+    from lawchecker import bills_api
+
+    watcher = FileWatcher(args.xml_files)
+    if not watcher.files:
+        logger.error('No XML files found.')
+        return 1
+
+    papers: dict[Path, BatchPaper] = {}
+    stages: dict[tuple[int, int], StageAmendments] = {}
+    save_json = not args.no_save_json
+
+    changed = set(watcher.files)
+    poll_api = False
+    next_poll = time.monotonic() + args.poll_interval
+    opened: set[Path] = set()
+
+    while True:
+        step = functools.partial(
+            async_watch_step,
+            papers,
+            stages,
+            changed,
+            poll_api,
+            save_json=save_json,
+            incremental=args.incremental,
+            jobs=args.jobs,
+        )
+        affected = bills_api.get_shared_session().run(step)
+
+        for path in sorted(affected):
+            paper = papers[path]
+            if paper.error is not None:
+                logger.error(f'{path.name}: {paper.error}')
+                continue
+
+            output_file = report_output_file(args, path)
+            try:
+                report = Report(paper.xml_amdts, paper.json_amdts)  # type: ignore
+                save_report(report, output_file, args.summary)
+            except Exception as e:
+                logger.error(f'{path.name}: Could not create report: {e!r}')
+                continue
+
+            if not (args.batch or args.no_browser or output_file in opened):
+                webbrowser.open(output_file.resolve().as_uri())
+                opened.add(output_file)
+
+        logger.notice('Watching for changes. Press Ctrl+C to stop.')
+        changed = wait_for_changes(
+            watcher, timeout=max(0.0, next_poll - time.monotonic())
+        )
+        poll_api = time.monotonic() >= next_poll
+        if poll_api:
+            next_poll = time.monotonic() + args.poll_interval
+
+
 def validate_arguments(args):
     """Validate command line arguments and return error code if invalid."""
+
+    if args.watch and args.json:
+        logger.error('--json can not be used with --watch')
+        return 1
+
+    if args.watch and args.sp:
+        logger.error('--sp can not be used with --watch')
+        return 1
+
+    if args.batch:
+        return validate_batch_arguments(args)
+
     if not args.xml_file.exists():
         logger.error(f'XML file does not exist: {args.xml_file}')
         return 1
@@ -2834,5 +3917,32 @@ def validate_arguments(args):
     return 0
 
 
+def validate_batch_arguments(args):
+    """Validate command line arguments when there is more than one paper."""
+
+    for path in args.xml_files:
+        if not path.exists():
+            logger.error(f'XML file or folder does not exist: {path}')
+            return 1
+
+    if args.json:
+        logger.error('--json can only be used with a single XML file')
+        return 1
+
+    if args.sp:
+        logger.error('--sp can only be used with a single XML file')
+        return 1
+
+    # in batch mode the output is a folder
+    if args.output:
+        try:
+            args.output.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.error(f'Cannot create output directory {args.output}: {e}')
+            return 1
+
+    return 0
+
+
 if __name__ == '__main__':
     sys.exit(main())
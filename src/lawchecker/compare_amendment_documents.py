@@ -12,12 +12,13 @@ from lxml import etree, html
 from lxml.etree import QName, _Element
 from lxml.html import HtmlElement
 
-from lawchecker import lawchecker_logger, templates
+from lawchecker import jobs, lawchecker_logger, templates
 from lawchecker import xpath_helpers as xp
 from lawchecker.lawchecker_logger import logger
-from lawchecker.settings import COMPARE_REPORT_TEMPLATE, NSMAP2, PARSER, UKL
+from lawchecker.settings import NSMAP2, PARSER, UKL, get_settings
 from lawchecker.stars import BLACK_STAR, NO_STAR, WHITE_STAR, Star
 from lawchecker.utils import diff_xml_content, truncate_string
+from lawchecker.watch import FileWatcher, wait_for_changes
 
 # TODO: [x] put all sections in HTML document
 # Add messages for Nil return
@@ -59,6 +60,7 @@ class Amendment:
         )
         _xml = amdt.find('amendment/amendmentBody', namespaces=NSMAP2)
         self._names: list[str] | None = None
+        self._name_set: frozenset[str] | None = None
         self.star = Star(amdt.get(QName(UKL, 'statusIndicator'), default=''))
 
         if _num is not None and _num.text and _xml is not None:
@@ -85,6 +87,15 @@ class Amendment:
 
         return self._names
 
+    @property
+    def name_set(self) -> frozenset[str]:
+        """Set of names for fast membership tests"""
+
+        if self._name_set is None:
+            self._name_set = frozenset(self.names)
+
+        return self._name_set
+
 
 class SupDocument(Mapping):
     """Container for an amendment document aka official list"""
@@ -114,6 +125,7 @@ class SupDocument(Mapping):
         self.amendments: list[Amendment] = []
 
         for amdt_xml in xp.get_amendments(self.root):
+            jobs.check_cancelled()
             try:
                 amendment = Amendment(amdt_xml, self)
                 self.amendments.append(amendment)
@@ -207,12 +219,12 @@ class Report:
 
     def __init__(
         self,
-        old_file: Path | _Element,
-        new_file: Path | _Element,
+        old_file: 'Path | _Element | SupDocument',
+        new_file: 'Path | _Element | SupDocument',
         days_between_papers: bool = False,
     ):
         try:
-            self.html_tree = html.parse(COMPARE_REPORT_TEMPLATE)
+            self.html_tree = html.parse(get_settings().compare_report_template)
             self.html_root = self.html_tree.getroot()
         except Exception as e:
             logger.error(f'Error parsing HTML template file: {e}')
@@ -220,8 +232,15 @@ class Report:
 
         self.days_between_papers = days_between_papers
 
-        self.old_doc = SupDocument(old_file)
-        self.new_doc = SupDocument(new_file)
+        # documents can be passed in already parsed (e.g. in watch mode)
+        if isinstance(old_file, SupDocument):
+            self.old_doc = old_file
+        else:
+            self.old_doc = SupDocument(old_file)
+        if isinstance(new_file, SupDocument):
+            self.new_doc = new_file
+        else:
+            self.new_doc = SupDocument(new_file)
 
         self.removed_amdts: list[str] = []
         self.added_amdts: list[str] = []
@@ -253,6 +272,7 @@ class Report:
         # for each amendment in the document
         # populate the star check, name changes and changes to existing amendments
         for key, new_amdt in self.new_doc.items():
+            jobs.check_cancelled()
             if key not in self.old_doc:
                 # the star check only happens when there is no coresponding
                 # amendment in previous document
@@ -549,8 +569,12 @@ class Report:
             # warn in UI
             logger.warning(f'Duplicate names found in {new_amdt.num}')
 
-        added_names = [item for item in new_amdt.names if item not in old_amdt.names]
-        removed_names = [item for item in old_amdt.names if item not in new_amdt.names]
+        # names (not just member IDs) are compared as changes such as
+        # 'Olivia Blake' to 'Olivia Blake [R]' should be reported
+        new_names = new_amdt.name_set
+        old_names = old_amdt.name_set
+        added_names = [item for item in new_amdt.names if item not in old_names]
+        removed_names = [item for item in old_amdt.names if item not in new_names]
 
         if not added_names and not removed_names:
             # there have been no name changes
@@ -650,10 +674,20 @@ def main():
         help='Use this flag if there are sitting days between the documents compared',
     )
 
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and recreate the report when either document changes',
+    )
+
     args = parser.parse_args(sys.argv[1:])
 
     filename = 'html_diff.html'
 
+    if args.watch:
+        watch(args.old_doc, args.new_doc, filename, args.days_between)
+        return
+
     report = Report(args.old_doc, args.new_doc, days_between_papers=args.days_between)
 
     report.html_tree.write(
@@ -666,6 +700,53 @@ def main():
     webbrowser.open(Path(filename).resolve().as_uri())
 
 
+def watch(
+    old_path: Path, new_path: Path, filename: str, days_between: bool = False
+) -> None:
+    """
+    Create the report, then recreate it whenever one of the documents
+    changes. Only the changed document is parsed again. Stop with Ctrl+C.
+    """
+
+    docs = {
+        old_path.resolve(): SupDocument(old_path),
+        new_path.resolve(): SupDocument(new_path),
+    }
+    watcher = FileWatcher(docs.keys())
+    opened = False
+
+    try:
+        while True:
+            report = Report(
+                docs[old_path.resolve()],
+                docs[new_path.resolve()],
+                days_between_papers=days_between,
+            )
+            report.html_tree.write(
+                filename,
+                method='html',
+                encoding='utf-8',
+                doctype='<!DOCTYPE html>',
+            )
+            logger.notice(f'Report written to {filename}. Watching for changes...')
+
+            if not opened:
+                webbrowser.open(Path(filename).resolve().as_uri())
+                opened = True
+
+            while True:
+                changed = wait_for_changes(watcher)
+                try:
+                    for path in changed & docs.keys():
+                        docs[path] = SupDocument(path)
+                except (etree.XMLSyntaxError, OSError) as e:
+                    logger.error(f'Could not read {path}: {e}')
+                    continue
+                break
+    except KeyboardInterrupt:
+        logger.info('Stopped watching.')
+
+
 def find_duplicates(lst: list[str]) -> list[str]:
     """
     Find and return a list of duplicate items in the given list.
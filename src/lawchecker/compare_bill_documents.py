@@ -16,11 +16,11 @@ from lxml import etree, html
 from lxml.etree import _Element
 from lxml.html import HtmlElement
 
-from lawchecker import lawchecker_logger, templates
+from lawchecker import jobs, lawchecker_logger, templates
 from lawchecker import xpath_helpers as xp
 from lawchecker.compare_bill_numbering import CompareBillNumbering
 from lawchecker.lawchecker_logger import logger
-from lawchecker.settings import COMPARE_REPORT_TEMPLATE, NSMAP, NSMAP2, PARSER
+from lawchecker.settings import NSMAP, NSMAP2, PARSER, get_settings
 from lawchecker.utils import diff_xml_content
 
 
@@ -98,6 +98,7 @@ class Bill(Mapping):
         self.sections: list[Section] = []
 
         for sect_xml in xp.get_sections(self.root):
+            jobs.check_cancelled()
             try:
                 section = Section(sect_xml, self)
                 self.sections.append(section)
@@ -113,6 +114,7 @@ class Bill(Mapping):
                 schedule_number = schedule_number.replace('Schedule', 'S')
 
             for schedule_paragraphs in xp.get_sched_paras(schedules_xml):
+                jobs.check_cancelled()
                 try:
                     section = Section(schedule_paragraphs, self, schedule_number)
                     self.sections.append(section)
@@ -191,8 +193,9 @@ class Report:
         new_file: Path | _Element,
         days_between_papers: bool = False,
     ):
+        settings = get_settings()
         try:
-            self.html_tree = html.parse(COMPARE_REPORT_TEMPLATE.resolve())
+            self.html_tree = html.parse(settings.compare_report_template.resolve())
             self.html_root = self.html_tree.getroot()
         except Exception as e:
             logger.error(f'Error parsing HTML template file: {e}')
@@ -226,6 +229,7 @@ class Report:
         # for each amendment in the document
         # populate the star check, name changes and changes to existing amendments
         for key, new_sect in self.new_doc.items():
+            jobs.check_cancelled()
             if key not in self.old_doc:
                 continue
 
@@ -11,7 +11,7 @@ from lxml import etree
 from lxml.etree import _Element
 from lxml.html import HtmlElement
 
-from lawchecker import lawchecker_logger
+from lawchecker import jobs, lawchecker_logger
 from lawchecker.lawchecker_logger import logger
 from lawchecker.templates import Table
 
@@ -177,6 +177,100 @@ class Bill:
         return attrs
 
 
+class BillLineage:
+    """
+    Index of clause and schedule paragraph GUIDs across the versions of a
+    single bill. Lookups by GUID, or by eId within a version, are O(1).
+    """
+
+    def __init__(self, title: str, bills: Iterable[Bill]):
+        self.title = title
+
+        # versions are ordered by published date, oldest first
+        self.versions: list[str] = []
+
+        # GUID -> {version: eId}
+        self._guid_index: dict[str, dict[str, str]] = {}
+
+        # version -> {eId: GUID}
+        self._eid_index: dict[str, dict[str, str]] = {}
+
+        for bill in sorted(bills, key=lambda x: x.published_dt):
+            self._add_bill(bill)
+
+    def _add_bill(self, bill: Bill):
+        version = clean(bill.version, no_space=True)
+        sections = bill.get_sections()
+
+        # get_sections can return the same GUID more than once,
+        # the last eId returned for a GUID is the one to keep
+        guid_to_eid = dict(zip(sections['guid'], sections[version]))
+
+        if version not in self._eid_index:
+            self.versions.append(version)
+
+        self._eid_index[version] = {eid: guid for guid, eid in guid_to_eid.items()}
+
+        for guid, eid in guid_to_eid.items():
+            self._guid_index.setdefault(guid, {})[version] = eid
+
+    def resolve_version(self, version: str | None) -> str:
+        """
+        Return the version name as used in the index. Accepts either the
+        cleaned name (e.g. commons_as_introduced) or the name as it
+        appears in the bill (e.g. 'Commons, As Introduced'). If version
+        is None, the earliest version is returned.
+        """
+
+        if version is None:
+            return self.versions[0]
+
+        cleaned = clean(version, no_space=True)
+        if cleaned in self._eid_index:
+            return cleaned
+
+        # allow partial matches (e.g. 'lords report') if they are unambiguous
+        words = set(cleaned.split('_'))
+        matches = [v for v in self.versions if words.issubset(v.split('_'))]
+        if len(matches) == 1:
+            return matches[0]
+
+        raise KeyError(f'Version {version!r} not found for {self.title!r}')
+
+    def guid_for(self, eid: str, version: str | None = None) -> str | None:
+        """Return the GUID for the eId in the given version (if any)"""
+
+        return self._eid_index[self.resolve_version(version)].get(eid)
+
+    def eid_for(self, guid: str, version: str | None = None) -> str | None:
+        """Return the eId for the GUID in the given version (if any)"""
+
+        return self._guid_index.get(guid, {}).get(self.resolve_version(version))
+
+    def history(self, guid: str) -> list[tuple[str, str | None]]:
+        """
+        Return (version, eId) for every version of the bill in order.
+        eId is None for versions which do not contain the GUID.
+        """
+
+        eids = self._guid_index.get(guid, {})
+        return [(version, eids.get(version)) for version in self.versions]
+
+    def first_seen(self, guid: str) -> str | None:
+        """Return the earliest version which contains the GUID"""
+
+        for version, eid in self.history(guid):
+            if eid is not None:
+                return version
+        return None
+
+    def __contains__(self, guid: object) -> bool:
+        return guid in self._guid_index
+
+    def __len__(self) -> int:
+        return len(self._guid_index)
+
+
 class CompareBillNumbering:
     def __init__(self, xml_files: Iterable[tuple[etree._Element, str]]):
         """Sorts all bills into a dictionary with the bill title as the key.
@@ -188,6 +282,7 @@ class CompareBillNumbering:
 
         # parse each bill and store in dictionary
         for xml_file in xml_files:
+            jobs.check_cancelled()
             try:
                 bill = Bill(*xml_file)
                 self.bills_container.setdefault(bill.title, []).append(bill)
@@ -220,6 +315,7 @@ class CompareBillNumbering:
         xml_files = []
 
         for xml_file_path in in_folder.glob('*.xml'):
+            jobs.check_cancelled()
             try:
                 tree = etree.parse(str(xml_file_path))
                 root = tree.getroot()
@@ -288,6 +384,14 @@ class CompareBillNumbering:
 
         return comparison_tables
 
+    def lineage(self) -> dict[str, BillLineage]:
+        """Return a GUID lineage index for each bill, keyed by bill title"""
+
+        return {
+            title: BillLineage(title, bills)
+            for title, bills in self.bills_container.items()
+        }
+
     # Make the CSV
     def save_csv(self, out_folder: Path | None) -> list[Path]:
         out_folder = Path(out_folder or '.')
@@ -333,6 +437,44 @@ class CompareBillNumbering:
         return html_list
 
 
+def query(
+    compare: CompareBillNumbering,
+    ref: str,
+    version: str | None = None,
+    bill_title: str | None = None,
+) -> list[str]:
+    """
+    Look up a clause or schedule paragraph across bill versions.
+
+    ref can be a GUID or an eId (e.g. sec_47 or sched_3__para_12). If ref
+    is an eId it is looked up in the given version (defaults to the
+    earliest version). Returns lines of text suitable for printing.
+    """
+
+    lines: list[str] = []
+
+    for title, lineage in compare.lineage().items():
+        if bill_title and clean(bill_title) != title:
+            continue
+
+        try:
+            guid = ref if ref in lineage else lineage.guid_for(ref, version)
+        except KeyError as e:
+            logger.warning(e.args[0])
+            continue
+
+        if guid is None:
+            lines.append(f'{title}: {ref} not found')
+            continue
+
+        lines.append(f'{title}: {guid}')
+        for _version, eid in lineage.history(guid):
+            lines.append(f'    {_version}: {eid or "-"}')
+        lines.append(f'    First appeared in: {lineage.first_seen(guid)}')
+
+    return lines
+
+
 def cli():
     lawchecker_logger.setup_lawchecker_logging()
     parser = argparse.ArgumentParser(
@@ -360,13 +502,54 @@ def cli():
         ),
     )
 
+    subparsers = parser.add_subparsers(dest='command')
+
+    query_parser = subparsers.add_parser(
+        'query',
+        help='Find what a clause or schedule paragraph was in each bill version.',
+    )
+
+    query_parser.add_argument(
+        'ref',
+        help='eId (e.g. sec_47 or sched_3__para_12) or GUID to look up.',
+    )
+
+    query_parser.add_argument(
+        '--version',
+        help=(
+            'Bill version the eId refers to, e.g. "Commons, As Introduced"'
+            ' or commons_as_introduced. Defaults to the earliest version.'
+        ),
+    )
+
+    query_parser.add_argument(
+        '--bill',
+        help='Only search bills with this title.',
+    )
+
+    query_parser.add_argument(
+        '--input-folder',
+        type=Path,
+        default=argparse.SUPPRESS,
+        help=(
+            'Specify a different folder for finding bill XML.'
+            ' Defaults to current directory.'
+        ),
+    )
+
     args = parser.parse_args(sys.argv[1:])
 
     print(repr(args))
 
     input_folder = Path(args.input_folder or '.')
-    output_folder = Path(args.output_folder or '.')
     compile_ = CompareBillNumbering.from_folder(input_folder)
+
+    if args.command == 'query':
+        for line in query(compile_, args.ref, args.version, args.bill):
+            print(line)
+        return
+
+    output_folder = Path(args.output_folder or '.')
     compile_.save_csv(output_folder)
 
 
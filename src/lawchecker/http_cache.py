@@ -0,0 +1,243 @@
+"""
+Persistent on-disk cache for GET responses from the Bills API.
+
+Responses are keyed by URL plus query parameters. Each entry stores the
+body along with the ETag, Last-Modified and Date headers so stale entries
+can be revalidated with a conditional GET (a 304 response costs almost
+nothing compared to re-downloading the body).
+"""
+
+import getpass
+import hashlib
+import json
+import os
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from lawchecker.lawchecker_logger import logger
+
+DEFAULT_CACHE_DIR = Path('cache', getpass.getuser(), 'bills_api')
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# amendments can be corrected at any time
+AMENDMENT_TTL = 5 * MINUTE
+
+# (pattern matched against the URL path, time to live in seconds)
+# The first matching pattern wins so more specific patterns go first.
+ENDPOINT_TTLS: list[tuple[re.Pattern[str], float]] = [
+    (re.compile(r'/Amendments(/\d+)?$', re.IGNORECASE), AMENDMENT_TTL),
+    (re.compile(r'/Bills/\d+/Stages$', re.IGNORECASE), HOUR),
+    (re.compile(r'/Publications$', re.IGNORECASE), HOUR),
+    # reference data which almost never changes
+    (re.compile(r'/(Stages|BillTypes|PublicationTypes)$', re.IGNORECASE), 7 * DAY),
+]
+DEFAULT_TTL = 10 * MINUTE
+
+# upper limit on the time to live, set with max_cache_age
+_max_age: ContextVar[float | None] = ContextVar('max_age', default=None)
+
+# headers kept with the cached body
+STORED_HEADERS = ('content-type', 'etag', 'last-modified', 'date')
+
+
+def ttl_for_url(url: str) -> float:
+    """Return the time to live (seconds) for responses from this URL."""
+
+    path = httpx.URL(url).path.rstrip('/')
+    for pattern, ttl in ENDPOINT_TTLS:
+        if pattern.search(path):
+            break
+    else:
+        ttl = DEFAULT_TTL
+
+    max_age = _max_age.get()
+    if max_age is not None:
+        return min(ttl, max_age)
+    return ttl
+
+
+@contextmanager
+def max_cache_age(seconds: float) -> Iterator[None]:
+    """
+    Treat cached responses older than seconds as stale, within this block
+    (and tasks started in it). With 0 every request is revalidated with a
+    conditional GET, which is a cheap way to check for changes.
+    """
+
+    token = _max_age.set(seconds)
+    try:
+        yield
+    finally:
+        _max_age.reset(token)
+
+
+def cache_key(url: str, params: dict[str, Any] | None = None) -> str:
+    """Create a stable key from the URL and query parameters."""
+
+    request = httpx.Request('GET', url, params=params)
+    # sort the query string so parameter order does not matter
+    query = sorted(request.url.params.multi_items())
+    raw = f'{request.url.copy_with(query=None)}?{query}'
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    stored_at: float
+    body: bytes
+
+    def is_fresh(self, ttl: float) -> bool:
+        return (time.time() - self.stored_at) < ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers for revalidating this entry with a conditional GET."""
+
+        headers = {}
+        if etag := self.headers.get('etag'):
+            headers['If-None-Match'] = etag
+        if last_modified := self.headers.get('last-modified'):
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.body,
+            request=request,
+        )
+
+
+class ResponseCache:
+    """
+    Stores responses as a pair of files per entry: <key>.json holds the
+    metadata and <key>.body holds the response body. The least recently
+    used entries are evicted once the cache grows beyond max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self.cache_dir.glob('*.body'))
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f'{key}.json', self.cache_dir / f'{key}.body'
+
+    def get(self, key: str) -> CacheEntry | None:
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'Ignoring unreadable cache entry {meta_path}: {e!r}')
+            self.delete(key)
+            return None
+
+        # update access time for least recently used eviction
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+
+        return CacheEntry(
+            url=meta['url'],
+            status_code=meta['status_code'],
+            headers=meta['headers'],
+            stored_at=meta['stored_at'],
+            body=body,
+        )
+
+    def put(self, key: str, response: httpx.Response) -> None:
+        meta_path, body_path = self._paths(key)
+        headers = {
+            name: response.headers[name]
+            for name in STORED_HEADERS
+            if name in response.headers
+        }
+        meta = {
+            'url': str(response.request.url),
+            'status_code': response.status_code,
+            'headers': headers,
+            'stored_at': time.time(),
+        }
+
+        body = response.content
+        old_size = body_path.stat().st_size if body_path.exists() else 0
+
+        try:
+            body_path.write_bytes(body)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except OSError as e:
+            logger.warning(f'Could not write to HTTP cache: {e!r}')
+            return
+
+        self._size += len(body) - old_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as fresh again (after a 304 response)."""
+
+        meta_path, _ = self._paths(key)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            meta['stored_at'] = time.time()
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except Exception as e:
+            logger.warning(f'Could not update HTTP cache entry: {e!r}')
+
+    def delete(self, key: str) -> None:
+        meta_path, body_path = self._paths(key)
+        if body_path.exists():
+            self._size -= body_path.stat().st_size
+        meta_path.unlink(missing_ok=True)
+        body_path.unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under 90% of max_bytes."""
+
+        target = self.max_bytes * 0.9
+        bodies = sorted(
+            self.cache_dir.glob('*.body'), key=lambda p: p.stat().st_mtime
+        )
+        for body_path in bodies:
+            if self._size <= target:
+                break
+            self.delete(body_path.stem)
+
+        logger.info(f'HTTP cache evicted to {self._size} bytes')
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob('*.json'):
+            self.delete(path.stem)
+        self._size = 0
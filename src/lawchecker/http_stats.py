@@ -0,0 +1,189 @@
+"""
+Per-endpoint statistics for requests made by BillsApiClient.
+
+Used to find out why a run is slow: connection set up (DNS, TCP and TLS),
+server latency, retries or rate limiting. Numbers are grouped by endpoint,
+with the IDs in the URL replaced by {id}, e.g.
+/Bills/{id}/Stages/{id}/Amendments/{id}.
+"""
+
+import math
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+API_PREFIX = re.compile(r'^/api/v\d+')
+
+
+def endpoint_name(url: str | httpx.URL) -> str:
+    path = httpx.URL(url).path.rstrip('/')
+    path = API_PREFIX.sub('', path)
+    return ID_SEGMENT.sub('/{id}', path) or '/'
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(0, rank - 1)]
+
+
+@dataclass
+class EndpointStats:
+    # requests sent over the network (including retries)
+    requests: int = 0
+    # answered from the cache without a request
+    cache_hits: int = 0
+    # 304 responses to conditional requests
+    not_modified: int = 0
+    retries: int = 0
+    # timeouts and network errors
+    errors: int = 0
+    bytes_received: int = 0
+    status_codes: Counter = field(default_factory=Counter)
+    # seconds from sending the request to receiving the response
+    latencies: list[float] = field(default_factory=list)
+    # seconds spent opening new connections (DNS and TCP) and on TLS
+    connect_times: list[float] = field(default_factory=list)
+    tls_times: list[float] = field(default_factory=list)
+    # requests in flight (including this one) when each request was sent
+    in_flight_total: int = 0
+
+    def to_json(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'not_modified': self.not_modified,
+            'retries': self.retries,
+            'errors': self.errors,
+            'bytes_received': self.bytes_received,
+            'status_codes': {
+                str(code): count for code, count in sorted(self.status_codes.items())
+            },
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50) * 1000, 1),
+                'p95': round(percentile(latencies, 95) * 1000, 1),
+                'p99': round(percentile(latencies, 99) * 1000, 1),
+                'max': round((latencies[-1] if latencies else 0) * 1000, 1),
+            },
+            'new_connections': len(self.connect_times),
+            'connect_ms_total': round(sum(self.connect_times) * 1000, 1),
+            'tls_ms_total': round(sum(self.tls_times) * 1000, 1),
+            'mean_in_flight': (
+                round(self.in_flight_total / self.requests, 1) if self.requests else 0
+            ),
+        }
+
+
+class RequestTrace:
+    """
+    httpx 'trace' extension callback which times connection set up for
+    one request. httpcore only reports these events for new connections.
+    """
+
+    def __init__(self, stats: EndpointStats):
+        self.stats = stats
+        self._started: dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        # e.g. 'connection.connect_tcp.started', 'connection.start_tls.complete'
+        name, _, stage = event_name.rpartition('.')
+        if name not in ('connection.connect_tcp', 'connection.start_tls'):
+            return
+
+        if stage == 'started':
+            self._started[name] = time.monotonic()
+        elif stage == 'complete' and name in self._started:
+            elapsed = time.monotonic() - self._started.pop(name)
+            if name == 'connection.connect_tcp':
+                self.stats.connect_times.append(elapsed)
+            else:
+                self.stats.tls_times.append(elapsed)
+
+
+class HttpStats:
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.started = time.monotonic()
+
+    def endpoint(self, url: str | httpx.URL) -> EndpointStats:
+        name = endpoint_name(url)
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def request_started(self, stats: EndpointStats) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        stats.requests += 1
+        stats.in_flight_total += self.in_flight
+
+    def request_finished(
+        self,
+        stats: EndpointStats,
+        latency: float,
+        response: httpx.Response | None,
+    ) -> None:
+        """Record the outcome of a request (response is None on errors)."""
+        self.in_flight -= 1
+        if response is None:
+            stats.errors += 1
+            return
+        stats.latencies.append(latency)
+        stats.status_codes[response.status_code] += 1
+        stats.bytes_received += len(response.content)
+        if response.status_code == 304:
+            stats.not_modified += 1
+
+    def to_json(self) -> dict[str, Any]:
+        endpoints = {
+            name: stats.to_json() for name, stats in sorted(self.endpoints.items())
+        }
+        return {
+            'elapsed_seconds': round(time.monotonic() - self.started, 2),
+            'requests': sum(s['requests'] for s in endpoints.values()),
+            'cache_hits': sum(s['cache_hits'] for s in endpoints.values()),
+            'retries': sum(s['retries'] for s in endpoints.values()),
+            'bytes_received': sum(s['bytes_received'] for s in endpoints.values()),
+            'peak_in_flight': self.peak_in_flight,
+            'endpoints': endpoints,
+        }
+
+    def format_table(self) -> str:
+        """The statistics as a plain text table."""
+
+        header = (
+            f'{"Endpoint":<45} {"Reqs":>6} {"Cache":>6} {"304":>5} {"Retry":>5}'
+            f' {"Err":>4} {"p50ms":>7} {"p95ms":>7} {"p99ms":>7} {"KB":>8}'
+            f' {"Conn":>4} {"Flight":>6}'
+        )
+        lines = [header, '-' * len(header)]
+        for name, stats in self.to_json()['endpoints'].items():
+            latency = stats['latency_ms']
+            lines.append(
+                f'{name:<45} {stats["requests"]:>6} {stats["cache_hits"]:>6}'
+                f' {stats["not_modified"]:>5} {stats["retries"]:>5}'
+                f' {stats["errors"]:>4} {latency["p50"]:>7} {latency["p95"]:>7}'
+                f' {latency["p99"]:>7} {stats["bytes_received"] / 1024:>8.1f}'
+                f' {stats["new_connections"]:>4} {stats["mean_in_flight"]:>6}'
+            )
+
+        status_codes: Counter = Counter()
+        for stats in self.endpoints.values():
+            status_codes.update(stats.status_codes)
+        lines.append('')
+        lines.append(
+            f'Status codes: {dict(sorted(status_codes.items()))}.'
+            f' Peak requests in flight: {self.peak_in_flight}.'
+        )
+        return '\n'.join(lines)
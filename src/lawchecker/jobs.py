@@ -0,0 +1,329 @@
+"""
+Background jobs for the GUI.
+
+pywebview calls the Api methods on its own thread, so a long report blocked
+every other call from the UI until it finished, and could not be stopped.
+The long running Api methods now submit their work here and return the job
+ID straight away. Jobs run on a small pool of worker threads (so e.g. a bill
+compare can run while amendments are downloaded from the Bills API) and
+listeners, such as the webview, are told when a job starts, makes progress
+and finishes, along with its result.
+
+Cancelling is cooperative: the extraction and diff loops call
+check_cancelled() (or report_progress()), which raises JobCancelled once the
+job running on that thread has been cancelled. Outside a job they do
+nothing, so the command line tools are unaffected.
+"""
+
+import atexit
+import itertools
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from lawchecker.lawchecker_logger import logger
+
+DEFAULT_WORKERS = 4
+
+# listeners are told about progress at most this often (seconds) per job
+PROGRESS_INTERVAL = 0.1
+
+
+class JobState(StrEnum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+FINISHED_STATES = frozenset({JobState.DONE, JobState.FAILED, JobState.CANCELLED})
+
+
+class JobCancelled(Exception):
+    """Raised in a job which has been cancelled, to stop it."""
+
+
+class JobError(Exception):
+    """Raised by a job to fail with a message for the user."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    name: str
+    state: JobState = JobState.PENDING
+    # latest progress message, and progress through the current step
+    message: str = ''
+    done: int = 0
+    total: int = 0
+    # the return value of the job's function, or the error if it failed
+    result: Any = None
+    error: str = ''
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    _cancel_requested: threading.Event = field(
+        default_factory=threading.Event, repr=False
+    )
+    _finished: threading.Event = field(default_factory=threading.Event, repr=False)
+    _manager: 'JobManager | None' = field(default=None, repr=False, compare=False)
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    @property
+    def percent(self) -> int | None:
+        if self.total <= 0:
+            return None
+        return int(round(100.0 * self.done / self.total))
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the job to finish. Returns False on timeout."""
+        return self._finished.wait(timeout)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'name': self.name,
+            'state': str(self.state),
+            'message': self.message,
+            'done': self.done,
+            'total': self.total,
+            'percent': self.percent,
+            'result': self.result,
+            'error': self.error,
+        }
+
+
+JobListener = Callable[[Job], None]
+
+# the job running in this thread (or task)
+_current_job: ContextVar[Job | None] = ContextVar('current_job', default=None)
+
+
+def current_job() -> Job | None:
+    return _current_job.get()
+
+
+@contextmanager
+def job_context(job: Job | None) -> Iterator[None]:
+    """
+    Run the with block as part of job, e.g. work which a job hands to
+    another thread, so that it reports progress to and is stopped with the
+    job. Tasks and threads (asyncio.to_thread) started inside it inherit
+    the job.
+    """
+
+    token = _current_job.set(job)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+
+def check_cancelled() -> None:
+    """Raise JobCancelled if the current job has been cancelled."""
+
+    job = _current_job.get()
+    if job is not None and job._cancel_requested.is_set():
+        raise JobCancelled(job.name)
+
+
+class JobManager:
+    """Runs jobs on a pool of worker threads and tells listeners about them."""
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='lawchecker-job'
+        )
+        self._ids = itertools.count(1)
+        self._jobs: dict[str, Job] = {}
+        self._futures: dict[str, Future] = {}
+        self._listeners: list[JobListener] = []
+        # job ID -> time.monotonic() listeners were last told of its progress
+        self._last_progress: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: JobListener) -> Callable[[], None]:
+        """Add a listener. Returns a function which unsubscribes it."""
+
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _notify(self, job: Job) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(job)
+            except Exception as e:
+                logger.warning(f'Job listener failed: {e!r}')
+
+    def submit(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Job:
+        """Run func(*args, **kwargs) as a job. Returns the (pending) job."""
+
+        job = Job(f'job-{next(self._ids)}', name, _manager=self)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._notify(job)
+
+        with self._lock:
+            # under the lock so the future is recorded before the job ends
+            future = self._executor.submit(self._run, job, func, args, kwargs)
+            self._futures[job.job_id] = future
+        return job
+
+    def _run(self, job: Job, func: Callable[..., Any], args, kwargs) -> None:
+        if job.cancel_requested:
+            self._finish(job, JobState.CANCELLED)
+            return
+
+        job.state = JobState.RUNNING
+        self._notify(job)
+        try:
+            with job_context(job):
+                job.result = func(*args, **kwargs)
+            state = JobState.DONE
+        except JobCancelled:
+            logger.info(f'{job.name} cancelled.')
+            state = JobState.CANCELLED
+        except JobError as e:
+            logger.error(f'{job.name} failed: {e}')
+            job.error = str(e)
+            state = JobState.FAILED
+        except Exception as e:
+            logger.error(f'{job.name} failed: {e!r}')
+            job.error = str(e) or repr(e)
+            state = JobState.FAILED
+        self._finish(job, state)
+
+    def _finish(self, job: Job, state: JobState) -> None:
+        job.state = state
+        job.finished_at = time.time()
+        with self._lock:
+            self._futures.pop(job.job_id, None)
+            self._last_progress.pop(job.job_id, None)
+        job._finished.set()
+        self._notify(job)
+
+    def progress(
+        self,
+        job: Job,
+        message: str | None = None,
+        done: int | None = None,
+        total: int | None = None,
+    ) -> None:
+        """
+        Update a job's progress. Messages are always passed on to listeners
+        but counts only every PROGRESS_INTERVAL seconds (and when done).
+        """
+
+        if done is not None:
+            job.done = done
+        if total is not None:
+            job.total = total
+
+        now = time.monotonic()
+        if message is None:
+            last = self._last_progress.get(job.job_id, 0.0)
+            if now - last < PROGRESS_INTERVAL and job.done < job.total:
+                return
+        else:
+            job.message = message
+        self._last_progress[job.job_id] = now
+        self._notify(job)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Ask a job to stop. A job which has not started is cancelled straight
+        away. Returns False if there is no such job or it has finished.
+        """
+
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+
+        job._cancel_requested.set()
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            # it had not started so will never run
+            self._finish(job, JobState.CANCELLED)
+        else:
+            logger.info(f'Cancelling {job.name}...')
+        return True
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def active_jobs(self) -> list[Job]:
+        """Jobs which are pending or running."""
+        return [job for job in self.jobs() if not job.finished]
+
+    def shutdown(self) -> None:
+        """Cancel any unfinished jobs and stop the worker threads."""
+
+        for job in self.jobs():
+            if not job.finished:
+                self.cancel(job.job_id)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_manager: JobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> JobManager:
+    """Return the process wide JobManager, creating it if needed."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
+
+
+def close_manager() -> None:
+    global _manager
+    with _manager_lock:
+        manager, _manager = _manager, None
+    if manager is not None:
+        manager.shutdown()
+
+
+atexit.register(close_manager)
+
+
+def report_progress(
+    message: str | None = None, done: int | None = None, total: int | None = None
+) -> None:
+    """
+    Report the progress of the current job (if any) and stop it if it has
+    been cancelled.
+    """
+
+    job = _current_job.get()
+    if job is None:
+        return
+    check_cancelled()
+    if job._manager is not None:
+        job._manager.progress(job, message, done, total)
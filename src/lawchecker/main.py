@@ -1,5 +1,4 @@
 import io
-import json
 import logging
 import os
 import platform
@@ -8,12 +7,11 @@ import sys
 import time
 import traceback
 import webbrowser
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Literal, cast
 
-import httpx
-
 try:
     import webview
     from webview import Window  # TODO: fix this
@@ -23,21 +21,25 @@ except ImportError as e:
     raise e
 
 import lawchecker.lawchecker_logger as lawchecker_logger
+
+# The report modules (and httpx) are imported by the Api methods which use
+# them, so that they are not all loaded before the window opens.
 from lawchecker import (
     __version__,
-    added_names_report,
-    check_web_amdts,
+    amdt_storage,
     common,
+    jobs,
     lawchecker_logger,
-    pp_xml_lxml,
+    progress,
     settings,
 )
-from lawchecker.compare_amendment_documents import Report
-from lawchecker.compare_bill_documents import Report as BillReport
-from lawchecker.compare_bill_documents import diff_in_vscode
-from lawchecker.compare_bill_numbering import CompareBillNumbering
 from lawchecker.lawchecker_logger import logger
-from lawchecker.ui_feedback import ProgressModal, UILogHandler
+from lawchecker.ui_feedback import (
+    ProgressModal,
+    UILogHandler,
+    WebviewJobs,
+    WebviewProgress,
+)
 
 APP_FROZEN = getattr(sys, 'frozen', False)
 
@@ -95,6 +97,28 @@ class Api:
     def print_from_js(self, string: str) -> None:
         print(string)
 
+    def _start_job(self, name: str, func: Callable[..., Any], *args) -> str:
+        """
+        Run func in the background so the UI can carry on (and other Api
+        methods can be called) while it runs. Returns the job ID.
+        """
+
+        job = jobs.get_manager().submit(name, func, *args)
+        logger.info(f'Started {job.name} ({job.job_id})')
+        return job.job_id
+
+    def cancel_job(self, job_id: str) -> bool:
+        """Cancel a background job. Returns False if it has already finished."""
+
+        return jobs.get_manager().cancel(job_id)
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        job = jobs.get_manager().get(job_id)
+        return job.to_json() if job is not None else None
+
+    def list_jobs(self) -> list[dict[str, Any]]:
+        return [job.to_json() for job in jobs.get_manager().jobs()]
+
     def _open_file_dialog(self, file_type='') -> Path | None:
         # select a file
 
@@ -180,7 +204,8 @@ class Api:
             date_obj = datetime.strptime(date_str, '%Y-%m-%d')
             formatted_date = date_obj.strftime('%Y-%m-%d')
 
-            self.dated_folder_Path = settings.REPORTS_FOLDER.joinpath(formatted_date)
+            reports_folder = settings.get_settings().reports_folder
+            self.dated_folder_Path = reports_folder.joinpath(formatted_date)
             self.dated_folder_Path.mkdir(parents=True, exist_ok=True)
 
             settings.GLOBAL_VARS.anr_working_folder = self.dated_folder_Path
@@ -230,14 +255,15 @@ class Api:
         The user must download this first as there is security
         so we can't request it directly.
         """
-        if not settings.DASH_XML_URL:
+        dash_xml_url = settings.get_settings().dash_xml_url
+        if not dash_xml_url:
             logger.warning(
                 'No DASH_XML_URL set in settings. Likely there is no .env file'
                 '\nPlease create a .env file in the root of the project'
                 ' see .env.example for an example of the required format.'
             )
         try:
-            webbrowser.open(settings.DASH_XML_URL)  # type: ignore
+            webbrowser.open(dash_xml_url)
             logger.info('Dashboard XML opened in browser.')
         except Exception as e:
             logger.error(f'Error: Could not open browser {repr(e)}')
@@ -246,9 +272,8 @@ class Api:
         """
         Opens a file dialog to select the dashboard XML file.
         """
-        default_location = (
-            settings.PARENT_FOLDER
-        )  # if user did not create working folder
+        # if user did not create working folder
+        default_location = settings.get_settings().parent_folder
         if self.dated_folder_Path is not None:
             default_location = self.dated_folder_Path / settings.DASHBOARD_DATA_FOLDER
 
@@ -274,7 +299,7 @@ class Api:
         """
         Open a directory selection dialog to select the amendment XML directory.
         """
-        default_location = settings.PARENT_FOLDER
+        default_location = settings.get_settings().parent_folder
         if self.dated_folder_Path is not None:
             default_location = self.dated_folder_Path
 
@@ -291,16 +316,25 @@ class Api:
         return f'Selected directory: {self.lm_xml_folder}'
 
     def anr_run_xslts(self) -> str:
+        """
+        Start creating the Added Names report. Returns the job ID.
+        """
+
+        return self._start_job('Added names report', self._anr_run_xslts)
+
+    def _anr_run_xslts(self) -> str:
         """
         Run the transforms  to create the Added Names report.
         """
+        from lawchecker import added_names_report
+
         lm_xml_folder_Path: Path | None = None
 
         if self.lm_xml_folder:
             lm_xml_folder_Path = Path(self.lm_xml_folder)
 
         if not (self.dash_xml_file and Path(self.dash_xml_file).resolve().exists()):
-            return 'No XML file selected.'
+            raise jobs.JobError('No XML file selected.')
 
         input_Path = Path(self.dash_xml_file).resolve()
 
@@ -319,18 +353,23 @@ class Api:
 
             return 'Report created successfully.'
 
-        except Exception as e:
+        except jobs.JobCancelled:
+            raise
+        except Exception:
             traceback.print_exc(file=sys.stdout)
-            return f'Error: {str(e)}'
+            raise
 
     def _create_html_compare(
         self,
         report_type: Literal['bills', 'amendments'],
         days_between_papers: bool = False,
-    ):
+    ) -> str:
         """
         Create the compare report for either bills or amendments
         """
+        from lawchecker import pp_xml_lxml
+        from lawchecker.compare_amendment_documents import Report
+        from lawchecker.compare_bill_documents import Report as BillReport
 
         if report_type == 'bills':
             old_xml_path = self.com_bill_old_xml
@@ -343,12 +382,10 @@ class Api:
 
         # TODO: add better validation and error handling
         if not old_xml_path:
-            logger.error('No old XML file selected.')
-            return
+            raise jobs.JobError('No old XML file selected.')
 
         if not new_xml_path:
-            logger.error('No new XML file selected.')
-            return
+            raise jobs.JobError('No new XML file selected.')
 
         # Check the Old and New XML files can both be parsed as XML
         old_xml = pp_xml_lxml.load_xml(str(old_xml_path))
@@ -356,12 +393,10 @@ class Api:
 
         # TODO: Improve the below
         if not old_xml:
-            logger.error(f'Old XML file is not valid XML: {old_xml_path}')
-            return
+            raise jobs.JobError(f'Old XML file is not valid XML: {old_xml_path}')
 
         if not new_xml:
-            logger.error(f'New XML file is not valid XML: {new_xml_path}')
-            return
+            raise jobs.JobError(f'New XML file is not valid XML: {new_xml_path}')
 
         if report_type == 'bills':
             report = BillReport(
@@ -383,6 +418,7 @@ class Api:
             modal.update(f'Old XML path: {old_xml_path}', log=True)
             modal.update(f'New XML path: {new_xml_path}', log=True)
 
+            jobs.check_cancelled()
             out_html_path = old_xml_path.parent.joinpath(report_file_name)
 
             report.html_tree.write(
@@ -397,19 +433,30 @@ class Api:
 
             webbrowser.open(out_html_path.resolve().as_uri())
 
-    def bill_create_html_compare(self):
+        return f'HTML report created: {out_html_path}'
+
+    def bill_create_html_compare(self) -> str:
         """Create the compare report for bills"""
 
-        self._create_html_compare('bills')
+        return self._start_job(
+            'Compare bills report', self._create_html_compare, 'bills'
+        )
+
+    def bill_compare_in_vs_code(self) -> str:
+        return self._start_job(
+            'Compare bills in VS Code', self._bill_compare_in_vs_code
+        )
+
+    def _bill_compare_in_vs_code(self):
+        from lawchecker import pp_xml_lxml
+        from lawchecker.compare_bill_documents import Report as BillReport
+        from lawchecker.compare_bill_documents import diff_in_vscode
 
-    def bill_compare_in_vs_code(self):
         if not self.com_bill_old_xml:
-            logger.error('No old XML file selected.')
-            return
+            raise jobs.JobError('No old XML file selected.')
 
         if not self.com_bill_new_xml:
-            logger.error('No new XML file selected.')
-            return
+            raise jobs.JobError('No new XML file selected.')
 
         old_xml_path = Path(self.com_bill_old_xml).resolve()
         new_xml_path = Path(self.com_bill_new_xml).resolve()
@@ -420,36 +467,42 @@ class Api:
         new_xml = pp_xml_lxml.load_xml(str(new_xml_path))
 
         if not old_xml:
-            logger.error(f'Old XML file is not valid XML: {old_xml_path}')
-            return
+            raise jobs.JobError(f'Old XML file is not valid XML: {old_xml_path}')
 
         if not new_xml:
-            logger.error(f'New XML file is not valid XML: {new_xml_path}')
-            return
+            raise jobs.JobError(f'New XML file is not valid XML: {new_xml_path}')
 
         report = BillReport(
             old_xml_path,
             new_xml_path,
         )
 
+        jobs.check_cancelled()
         diff_in_vscode(report.old_doc.root, report.new_doc.root)
 
-    def compare_bill_numbering(self):
+    def compare_bill_numbering(self) -> str:
+        """
+        Start comparing the numbering of bills. Returns the job ID.
+        """
+
+        return self._start_job('Compare bill numbering', self._compare_bill_numbering)
+
+    def _compare_bill_numbering(self) -> str:
         """
         Executes the compare the numbering of bills
         """
+        from lawchecker.compare_bill_numbering import CompareBillNumbering
+
         print('compare_bill_numbering called')
 
         if not self.com_compare_number_dir:
-            print('Error: No directory selected.')
-            return 'Error: No directory selected.'
+            raise jobs.JobError('No directory selected.')
 
         compare_dir = Path(self.com_compare_number_dir).resolve()
         print(f'compare_dir resolved to: {compare_dir}')
 
         if not compare_dir.is_dir():
-            print('Error: Selected path is not a directory.')
-            return 'Error: Selected path is not a directory.'
+            raise jobs.JobError('Selected path is not a directory.')
 
         compare = CompareBillNumbering.from_folder(compare_dir)
         print('CompareBillNumbering instance created')
@@ -461,81 +514,117 @@ class Api:
                 for file in created_files:
                     modal.update(f'CSV file created: {file}')
 
-    def amend_create_html_compare(self, days_between_papers=False):
+        return f'{len(created_files)} CSV file(s) created.'
+
+    def amend_create_html_compare(self, days_between_papers=False) -> str:
         """
         Create the compare report for amendments
         """
 
-        self._create_html_compare('amendments', days_between_papers)
+        return self._start_job(
+            'Compare amendments report',
+            self._create_html_compare,
+            'amendments',
+            days_between_papers,
+        )
 
     def get_api_amendments_using_xml_for_params(
         self,
         file: Path | str | None,
         save_json: bool = True,
-    ) -> None:
+    ) -> str:
+        """
+        Start querying the Bills API for the amendments in the XML file.
+        Returns the job ID.
+        """
+
+        return self._start_job(
+            'Bills API amendments',
+            self._get_api_amendments_using_xml_for_params,
+            file,
+            save_json,
+        )
+
+    def _get_api_amendments_using_xml_for_params(
+        self,
+        file: Path | str | None,
+        save_json: bool = True,
+    ) -> str:
         """
         Query the Bills API for the amendments by first extracting data from the XML file.
         """
+        from lawchecker import check_web_amdts
+
         if not file:
-            # do we need an error here?
-            logger.notice('No XML file selected.')
-            return
+            raise jobs.JobError('No XML file selected.')
 
         if not isinstance(file, Path):
             file = Path(file)
 
         if not file.exists():
-            logger.error(f'File does not exist: {file}')
-            return
+            raise jobs.JobError(f'File does not exist: {file}')
 
         logger.info(f'file path: {file}')
 
-        json_amdts = None
-
         with ProgressModal() as modal:
             modal.update('Querying Bills API for amendments. Please wait...')
-            try:
-                json_amdts = check_web_amdts.sync_query_bills_api(file, save_json)
-                if not json_amdts:
-                    logger.error('No JSON returned from API.')
-            except Exception as e:
-                logger.error(f'Error querying API: {repr(e)}')
+            self.api_amend_json = None
+            json_amdts = check_web_amdts.sync_query_bills_api(file, save_json)
+            self.api_amend_json = json_amdts
+            if not json_amdts:
+                raise jobs.JobError('No JSON returned from API.')
 
             modal.update('Query complete.')
 
-        self.api_amend_json = json_amdts
+        return 'Query complete.'
 
     def get_api_amendments_with_ids(
         self, bill_id: str, stage_id: str, save_json: bool = True
-    ) -> None:
+    ) -> str:
+        """
+        Start querying the Bills API for the amendments using the bill and
+        stage IDs. Returns the job ID.
+        """
+
+        return self._start_job(
+            'Bills API amendments',
+            self._get_api_amendments_with_ids,
+            bill_id,
+            stage_id,
+            save_json,
+        )
+
+    def _get_api_amendments_with_ids(
+        self, bill_id: str, stage_id: str, save_json: bool = True
+    ) -> str:
         """
         Query the Bills API for the amendments using the bill and stage IDs.
         """
+        from lawchecker import check_web_amdts
+
         logger.info(
             f'get_api_amendments_with_ids called with {bill_id=} and {stage_id=}'
         )
         if not bill_id or not stage_id:
-            logger.error('Bill ID and Stage ID are required.')
-            return
+            raise jobs.JobError('Bill ID and Stage ID are required.')
         try:
             bill_id_int = int(bill_id)
             stage_id_int = int(stage_id)
         except ValueError:
-            logger.error('Bill ID and Stage ID must be integers.')
-            return
+            raise jobs.JobError('Bill ID and Stage ID must be integers.') from None
 
         if save_json:
             # we must have an xml file as the JSON file will be saved next to it
             if not self.api_amend_xml:
-                logger.error('No XML file selected.')
-                return
+                raise jobs.JobError('No XML file selected.')
 
         with ProgressModal() as modal:
             modal.update('Querying Bills API for amendments. Please wait...')
             json_file_path = None
             if save_json:
                 json_file_path = (
-                    Path(self.api_amend_xml).parent / f'{bill_id}_{stage_id}_amdts.json'
+                    Path(self.api_amend_xml).parent
+                    / f'{bill_id}_{stage_id}_amdts{amdt_storage.SUFFIX}'
                 )
             self.api_amend_json = check_web_amdts.sync_query_bills_api_from_ids(
                 bill_id_int, stage_id_int, save_json, json_file_path
@@ -564,6 +653,8 @@ class Api:
 
             modal.update('Query complete.')
 
+        return 'Query complete.'
+
     def data_is_avaliable(self) -> bool:
         """
         Check if the API data is available.
@@ -574,8 +665,9 @@ class Api:
         if not self.api_amend_json:
             if self.existing_json_amdts_file:
                 try:
-                    with open(self.existing_json_amdts_file, 'r') as f:
-                        self.api_amend_json = json.load(f)
+                    self.api_amend_json = amdt_storage.load_amdts(
+                        self.existing_json_amdts_file
+                    )
                 except Exception as e:
                     logger.error(f'Error loading JSON file: {repr(e)}')
                     return False
@@ -597,9 +689,14 @@ class Api:
     #     report.create_csv()
     #     # logger.warning("main.create_api_csv called")
 
-    def create_api_report(self):
+    def create_api_report(self) -> str:
+        return self._start_job('Bills API report', self._create_api_report)
+
+    def _create_api_report(self) -> str:
+        from lawchecker import check_web_amdts
+
         if not self.data_is_avaliable():
-            return
+            raise jobs.JobError('The XML file and API amendments are both needed.')
         report = check_web_amdts.Report(self.api_amend_xml, self.api_amend_json)
 
         # filename = "API_html_diff.html"
@@ -619,6 +716,7 @@ class Api:
 
         file_path = parent_path / file_name
 
+        jobs.check_cancelled()
         logger.info(f'Attempting to write report to {file_path}')
 
         report.html_tree.write(
@@ -632,6 +730,8 @@ class Api:
 
         webbrowser.open(Path(file_path).resolve().as_uri())
 
+        return f'Report created: {file_path}'
+
 
 def get_entrypoint():
     if not APP_FROZEN:  # unfrozen development
@@ -645,6 +745,8 @@ def get_entrypoint():
         # always as they may want to test the bundled HTML.
         # so we will check if it is running first
 
+        import httpx
+
         for _ in range(20):
             try:
                 get = httpx.get(url, timeout=0.05)
@@ -734,6 +836,11 @@ def main():
     gh.setLevel(level=lawchecker_logger.NOTICE_LEVEL)
     logger.addHandler(gh)
 
+    # progress bars and log messages are sent to the window in batches
+    progress.get_bus().subscribe(WebviewProgress(cast(Window, window)))
+    # as are the state and progress of background jobs
+    jobs.get_manager().subscribe(WebviewJobs(cast(Window, window)))
+
     try:
         webview.start(
             debug=debug,
@@ -743,6 +850,14 @@ def main():
     except Exception as e:
         logger.error(f'Error starting webview: {repr(e)}')
         raise e
+    finally:
+        # stop any jobs still running, then close the shared API connections
+        # once the window has closed
+        jobs.close_manager()
+        # (bills_api is only imported if the API was used)
+        bills_api = sys.modules.get('lawchecker.bills_api')
+        if bills_api is not None:
+            bills_api.close_shared_session()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,383 @@
+"""
+Cached directory of members eligible to sit in the Commons, from MNIS.
+
+The added names report underlines names which are not the name of a current
+member. The member list changes rarely, so it is saved to disk and only
+downloaded again once it is older than the time to live. The download runs
+on a background thread (start it with start_refresh before doing other work)
+and if it fails the last saved copy is used.
+"""
+
+import getpass
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+
+from lxml import etree
+
+from lawchecker.lawchecker_logger import logger
+
+ELIGIBLE_MEMBERS_URL = (
+    'https://data.parliament.uk/membersdataplatform/services/mnis/members/query/'
+    'House=Commons|IsEligible=true/'
+)
+
+DEFAULT_CACHE_FILE = Path('cache', getpass.getuser(), 'mnis', 'eligible_members.json')
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+DEFAULT_TIMEOUT = 10  # seconds
+
+# how long (seconds) to wait for a refresh before using a stale copy
+STALE_WAIT = 2.0
+
+HONORIFICS = re.compile(
+    r'^((the )?rt\.? hon\.? )?((?P<title>mr|mrs|ms|miss|mx|dr|sir|dame|lord|lady)\.? )?'
+)
+SUFFIXES = re.compile(r'( (mp|kc|qc|cbe|obe|mbe))+$')
+NOT_WORD = re.compile(r'[^\w ]+')
+
+# names which score below this are not suggested
+MIN_MATCH_SCORE = 0.5
+
+
+def normalise_name(name: str) -> str:
+    """Normalise a member's name for comparison, e.g. 'Dame  Meg Hillier'."""
+    name = unicodedata.normalize('NFKC', name).replace('’', "'")
+    name = re.sub(r'\s+', ' ', name)
+    return name.strip().casefold()
+
+
+def name_keys(name: str) -> list[str]:
+    """
+    Lookup keys for a name: normalised, and without an honorific or post
+    nominals (e.g. 'Rt Hon', 'Sir' or 'MP').
+    """
+
+    key = normalise_name(name)
+    keys = [key]
+    short_key = SUFFIXES.sub('', HONORIFICS.sub('', key))
+    if short_key and short_key != key:
+        keys.append(short_key)
+    return keys
+
+
+def split_title(key: str) -> tuple[str | None, str]:
+    """
+    Split a normalised name into its title (e.g. 'sir', or None if it has
+    none) and the rest of the name, without 'Rt Hon' or post nominals.
+    """
+
+    match = HONORIFICS.match(key)
+    assert match is not None  # everything in the pattern is optional
+    return match['title'], SUFFIXES.sub('', key[match.end() :])
+
+
+def trigrams(key: str) -> set[str]:
+    """Character trigrams of a normalised name, padded to weight the start."""
+    padded = f'  {NOT_WORD.sub("", key)} '
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    # the member's name as shown by MNIS
+    name: str
+    # similarity from 0 to 1, 1 for a match after normalising
+    score: float
+
+
+class MemberMatcher:
+    """
+    Finds the member whose name is most like a given name, using an index
+    of character trigrams so only members sharing a trigram are scored.
+    """
+
+    def __init__(self, names: Iterable[str], min_score: float = MIN_MATCH_SCORE):
+        self.min_score = min_score
+        self._exact: dict[str, str] = {}
+        # per key: the display name and the number of trigrams
+        self._names: list[str] = []
+        self._sizes: list[int] = []
+        # trigram -> keys containing it
+        self._index: defaultdict[str, list[int]] = defaultdict(list)
+        self._cache: dict[str, NameMatch | None] = {}
+
+        for name in names:
+            for key in name_keys(name):
+                if key in self._exact:
+                    continue
+                self._exact[key] = name
+                key_id = len(self._names)
+                grams = trigrams(key)
+                self._names.append(name)
+                self._sizes.append(len(grams))
+                for gram in grams:
+                    self._index[gram].append(key_id)
+
+    def match(self, name: str) -> NameMatch | None:
+        """
+        The best matching member, or None if no member scores at least
+        min_score. The score is the Dice coefficient of the trigrams.
+        """
+
+        if name in self._cache:
+            return self._cache[name]
+
+        keys = name_keys(name)
+        best: NameMatch | None = None
+        for key in keys:
+            if key in self._exact:
+                best = NameMatch(self._exact[key], 1.0)
+                break
+
+            grams = trigrams(key)
+            common: Counter[int] = Counter()
+            for gram in grams:
+                common.update(self._index.get(gram, ()))
+            for key_id, count in common.items():
+                score = 2 * count / (len(grams) + self._sizes[key_id])
+                if best is None or score > best.score:
+                    best = NameMatch(self._names[key_id], round(score, 2))
+
+        if best is not None and best.score < self.min_score:
+            best = None
+        self._cache[name] = best
+        return best
+
+
+@dataclass
+class MemberDirectory:
+    """Member names, as shown by MNIS, with a normalised name lookup."""
+
+    names: list[str] = field(default_factory=list)
+    # time.time() when downloaded
+    fetched_at: float = 0.0
+    # normalised name -> name
+    _lookup: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    # name without title -> (title, name) of the members with that name
+    _untitled: dict[str, list[tuple[str | None, str]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        for name in self.names:
+            key = normalise_name(name)
+            self._lookup.setdefault(key, name)
+            title, untitled = split_title(key)
+            if untitled:
+                self._untitled.setdefault(untitled, []).append((title, name))
+
+    @classmethod
+    def from_xml(cls, content: bytes, fetched_at: float | None = None):
+        """Create from the XML returned by the MNIS members query."""
+
+        root = etree.fromstring(content)
+        names = [
+            display_as
+            for member in root.iter('Member')
+            if (display_as := member.findtext('DisplayAs'))
+        ]
+        return cls(names, time.time() if fetched_at is None else fetched_at)
+
+    @classmethod
+    def load(cls, path: Path) -> 'MemberDirectory | None':
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(data['names'], data['fetched_at'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'Ignoring unreadable member list {path}: {e!r}')
+            return None
+
+    def save(self, path: Path) -> None:
+        data = {
+            'url': ELIGIBLE_MEMBERS_URL,
+            'fetched_at': self.fetched_at,
+            'names': self.names,
+        }
+        tmp_path = path.with_name(f'{path.name}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f'Could not save member list: {e!r}')
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def lookup(self, name: str) -> str | None:
+        """
+        Return the member's name as shown by MNIS, or None. 'Rt Hon' and
+        post nominals are ignored and a name without a title matches a
+        member with one, but a different title (e.g. 'Sir' for 'Mr') does
+        not match.
+        """
+
+        key = normalise_name(name)
+        if (display_as := self._lookup.get(key)) is not None:
+            return display_as
+
+        title, untitled = split_title(key)
+        for member_title, display_as in self._untitled.get(untitled, ()):
+            if title is None or member_title is None or title == member_title:
+                return display_as
+        return None
+
+    @cached_property
+    def matcher(self) -> MemberMatcher:
+        return MemberMatcher(self.names)
+
+    def suggest(self, name: str) -> NameMatch | None:
+        """The closest member's name, for a name which is not found."""
+        return self.matcher.match(name)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.lookup(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def fetch_member_directory(
+    url: str = ELIGIBLE_MEMBERS_URL, timeout: float = DEFAULT_TIMEOUT
+) -> MemberDirectory | None:
+    """Download the member list from MNIS. Returns None on failure."""
+    import httpx
+
+    try:
+        response = httpx.get(url, timeout=timeout)
+        response.raise_for_status()
+        directory = MemberDirectory.from_xml(response.content)
+    except httpx.HTTPError as e:
+        logger.info(f'Failed to fetch data from MNIS API: {e!r}')
+        return None
+    except etree.XMLSyntaxError as e:
+        logger.warning(f'Unexpected response from MNIS API: {e!r}')
+        return None
+
+    if not directory.names:
+        logger.warning('No members in the response from MNIS API.')
+        return None
+    return directory
+
+
+class MemberDirectoryCache:
+    """
+    The member list saved in cache_file, refreshed from MNIS on a background
+    thread once it is older than ttl seconds.
+    """
+
+    def __init__(
+        self,
+        cache_file: Path = DEFAULT_CACHE_FILE,
+        ttl: float = DEFAULT_TTL,
+        url: str = ELIGIBLE_MEMBERS_URL,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self.url = url
+        self.timeout = timeout
+
+        self._directory: MemberDirectory | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._refreshed = threading.Event()
+
+    def _is_fresh(self, directory: MemberDirectory | None) -> bool:
+        return directory is not None and directory.age() < self.ttl
+
+    def start_refresh(self, force: bool = False) -> None:
+        """
+        Start downloading the member list in the background, unless the
+        saved copy is still fresh (or a download is already running).
+        """
+
+        with self._lock:
+            if not self._loaded:
+                self._directory = MemberDirectory.load(self.cache_file)
+                self._loaded = True
+
+            if not force and self._is_fresh(self._directory):
+                return
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._refreshed.clear()
+            self._thread = threading.Thread(
+                target=self._refresh, name='mnis-refresh', daemon=True
+            )
+            self._thread.start()
+
+    def _refresh(self) -> None:
+        try:
+            directory = fetch_member_directory(self.url, self.timeout)
+            if directory is not None:
+                directory.save(self.cache_file)
+                with self._lock:
+                    self._directory = directory
+                logger.info(f'Downloaded {len(directory)} members from MNIS')
+        finally:
+            self._refreshed.set()
+
+    def get(self, wait: float = STALE_WAIT) -> MemberDirectory:
+        """
+        Return the member list. If the saved copy is stale, wait up to wait
+        seconds for the refresh before using it anyway. If there is no saved
+        copy, wait for the download to finish.
+        """
+
+        if self._thread is None:
+            self.start_refresh()
+
+        with self._lock:
+            directory = self._directory
+            refreshing = self._thread is not None and self._thread.is_alive()
+
+        if directory is not None and self._is_fresh(directory):
+            return directory
+
+        if refreshing:
+            self._refreshed.wait(None if directory is None else wait)
+            with self._lock:
+                directory = self._directory
+
+        if directory is None:
+            logger.warning(
+                'Member list from MNIS is not available. Names will not be checked.'
+            )
+            return MemberDirectory()
+
+        if not self._is_fresh(directory):
+            saved = time.strftime(
+                '%Y-%m-%d %H:%M', time.localtime(directory.fetched_at)
+            )
+            logger.info(f'Using member list from MNIS saved {saved}')
+        return directory
+
+
+_cache: MemberDirectoryCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_member_cache() -> MemberDirectoryCache:
+    """Return the process wide MemberDirectoryCache, creating it if needed."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MemberDirectoryCache()
+        return _cache
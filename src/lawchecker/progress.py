@@ -0,0 +1,207 @@
+"""
+Progress and message bus for the console and the webview UI.
+
+Long running tasks report progress many times a second (once per
+amendment downloaded) and every log record is shown in the UI's progress
+modal. Passing each of these straight to the webview is a synchronous
+round trip into the browser, so instead they are published here and
+subscribers get them in batches, at most `rate` times a second, from a
+background thread. Only the latest progress of each bar is kept between
+flushes.
+"""
+
+import atexit
+import itertools
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, TextIO
+
+DEFAULT_RATE = 10.0  # flushes per second
+
+
+@dataclass
+class BarState:
+    bar_id: str
+    done: int = 0
+    total: int = 0
+
+    @property
+    def percent(self) -> int:
+        if self.total <= 0:
+            return 100
+        return int(round(100.0 * self.done / self.total))
+
+
+@dataclass
+class ProgressUpdate:
+    """
+    Everything published since the previous flush.
+
+    events are in the order they were published and are one of
+    ('new_bar', bar_id), ('message', text) or ('end_bar', bar_id).
+    bars holds the latest state of every bar updated since the last flush.
+    """
+
+    events: list[tuple[str, str]] = field(default_factory=list)
+    bars: dict[str, BarState] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.events or self.bars)
+
+
+Subscriber = Callable[[ProgressUpdate], None]
+
+
+class ProgressBus:
+    def __init__(self, rate: float = DEFAULT_RATE):
+        self.interval = 1 / rate
+        self._subscribers: list[Subscriber] = []
+        self._pending = ProgressUpdate()
+        self._ids = itertools.count(1)
+
+        # protects _pending, and starting and stopping the worker thread
+        self._lock = threading.Lock()
+        # held while subscribers are called so flushes are not interleaved
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, subscriber: Subscriber) -> Callable[[], None]:
+        """Add a subscriber. Returns a function which unsubscribes it."""
+
+        self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    def _publish(self) -> None:
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name='progress-bus', daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def new_bar(self, total: int = 0) -> str:
+        """Start a new progress bar and return its ID."""
+
+        bar_id = f'bar-{next(self._ids)}'
+        with self._lock:
+            self._pending.events.append(('new_bar', bar_id))
+            self._pending.bars[bar_id] = BarState(bar_id, 0, total)
+        self._publish()
+        return bar_id
+
+    def progress(self, bar_id: str, done: int, total: int) -> None:
+        with self._lock:
+            self._pending.bars[bar_id] = BarState(bar_id, done, total)
+        self._publish()
+
+    def end_bar(self, bar_id: str) -> None:
+        """
+        Finish a progress bar. Everything published so far is flushed
+        straight away, so the finished bar is shown before anything the
+        caller does next.
+        """
+
+        with self._lock:
+            self._pending.events.append(('end_bar', bar_id))
+        self.flush()
+
+    def message(self, text: str) -> None:
+        with self._lock:
+            self._pending.events.append(('message', text))
+        self._publish()
+
+    def flush(self) -> None:
+        """Pass everything published so far to the subscribers."""
+
+        with self._flush_lock:
+            with self._lock:
+                update, self._pending = self._pending, ProgressUpdate()
+            if not update:
+                return
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber(update)
+                except Exception as e:
+                    # don't log, as log records are published here too
+                    print(f'Progress subscriber failed: {e!r}', file=sys.stderr)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            # collect everything published in the next interval
+            time.sleep(self.interval)
+            self.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        self.flush()
+
+
+class ConsoleProgress:
+    """Subscriber which draws progress bars in the console."""
+
+    def __init__(self, stream: TextIO | None = None, bar_len: int = 50):
+        self.stream = stream
+        self.bar_len = bar_len
+        self._bars: dict[str, BarState] = {}
+
+    def _draw(self, stream: TextIO, state: BarState) -> None:
+        filled_len = int(round(self.bar_len * state.percent / 100))
+        bar = '#' * filled_len + '-' * (self.bar_len - filled_len)
+        stream.write(f'[{bar}] {state.percent}%\r')
+
+    def __call__(self, update: ProgressUpdate) -> None:
+        # sys.stdout is looked up each time as it may be replaced
+        stream = self.stream or sys.stdout
+        self._bars.update(update.bars)
+
+        for kind, bar_id in update.events:
+            if kind == 'new_bar':
+                stream.write('\n')
+            elif kind == 'end_bar' and bar_id in self._bars:
+                self._draw(stream, self._bars.pop(bar_id))
+                stream.write('\n')
+
+        for bar_id in update.bars:
+            if bar_id in self._bars:
+                self._draw(stream, self._bars[bar_id])
+
+        stream.flush()
+
+
+_bus: ProgressBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_bus() -> ProgressBus:
+    """Return the process wide ProgressBus, creating it if needed."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = ProgressBus()
+            _bus.subscribe(ConsoleProgress())
+        return _bus
+
+
+def close_bus() -> None:
+    global _bus
+    with _bus_lock:
+        bus, _bus = _bus, None
+    if bus is not None:
+        bus.close()
+
+
+atexit.register(close_bus)
@@ -1,10 +1,10 @@
 import sys
+from dataclasses import dataclass
 from enum import Enum
-from importlib.resources import files
+from functools import cache
 from pathlib import Path
 from typing import Any
 
-from dotenv import dotenv_values
 from lxml import etree
 
 from lawchecker.lawchecker_logger import logger
@@ -18,43 +18,6 @@ class RtEnv(Enum):
     SCRIPT = 3  # with default unbundled interpreter
 
 
-RUNTIME_ENV = RtEnv.SCRIPT  # by default assume running as a script
-
-if hasattr(sys, 'executable') and hasattr(sys, '_MEIPASS'):
-    # we are using the bundled app on windows
-    RUNTIME_ENV = RtEnv.EXE
-elif hasattr(sys, 'frozen') and Path('../Resources').exists():
-    # we are using the bundled app on macos
-    RUNTIME_ENV = RtEnv.APP
-
-
-try:
-    # on the bundled app we expect the /env file to be in the temp folder
-    bundled_env = Path(sys._MEIPASS).joinpath('.env')  # type: ignore
-    if bundled_env.exists():
-        secrets = dotenv_values(bundled_env)
-    else:
-        raise Exception
-except Exception:
-    # probably on un-bundled version so try loading from local .env file
-    secrets = dotenv_values('.env')
-
-DASH_XML_KEY = 'LAWCHECKER_ADDED_NAMES_DASH_XML'
-DASH_XML_URL = ''
-
-# if no .env file error
-try:
-    DASH_XML_URL = secrets[DASH_XML_KEY]
-except KeyError:
-    # TODO: Log this
-    logger.info(
-        'Error: Either no .env file or the file does not have '
-        f' {DASH_XML_KEY} environment variable set.'
-        '\nPlease create a .env file in the root of the project'
-        ' see .env.example for an example of the required format.'
-    )
-
-
 # ---------------------- default files and paths --------------------- #
 DEFAULT_OUTPUT_NAME = 'Added_Names_Report.html'
 
@@ -70,34 +33,73 @@ TEMPLATES_FOLDER = 'templates'
 XML_FOLDER = 'Amendment_Paper_XML'
 DASHBOARD_DATA_FOLDER = 'Dashboard_Data'
 
-# path to folder containing the XSLT files
-match RUNTIME_ENV:
-    case RtEnv.EXE:
-        PARENT_FOLDER = Path(sys.executable).parent
-        logger.info(f'{PARENT_FOLDER=}')
-    case RtEnv.APP:
-        # I'm not sure that this is needed anymore as templates are now in
-        # lawchecker.app/Contents/Resources/lib/python3.12/lawchecker/templates
-        PARENT_FOLDER = Path('../Resources')
-    case _:
-        # assume running as python script via usual interpreter
-        # TODO: do we still need this?
-        PARENT_FOLDER = Path(__file__).parent
-        if not PARENT_FOLDER.joinpath('templates').exists():
-            PARENT_FOLDER = PARENT_FOLDER.parent
-
-
-REPORTS_FOLDER = (
-    Path.home() / 'UK Parliament' / 'PPU - Scripts' / 'added_names_report' / '_Reports'
-)
-
-if RUNTIME_ENV == RtEnv.SCRIPT or not REPORTS_FOLDER.exists():
-    # if running as a script or the REPORTS_FOLDER does not exist
-    REPORTS_FOLDER = PARENT_FOLDER / '_Reports'
-
-
-def get_template_path(template_name: str) -> Path:
+DASH_XML_KEY = 'LAWCHECKER_ADDED_NAMES_DASH_XML'
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Settings which depend on how lawchecker is running (e.g. a bundled app)
+    and on the .env file. Use get_settings() rather than creating these.
+    """
+
+    runtime_env: RtEnv
+    # folder containing the templates folder
+    parent_folder: Path
+    reports_folder: Path
+    dash_xml_url: str
+    html_template: Path
+    compare_report_template: Path
+
+
+def get_runtime_env() -> RtEnv:
+    if hasattr(sys, 'executable') and hasattr(sys, '_MEIPASS'):
+        # we are using the bundled app on windows
+        return RtEnv.EXE
+    elif hasattr(sys, 'frozen') and Path('../Resources').exists():
+        # we are using the bundled app on macos
+        return RtEnv.APP
+    return RtEnv.SCRIPT  # by default assume running as a script
+
+
+def load_secrets() -> dict[str, str | None]:
+    from dotenv import dotenv_values
+
+    try:
+        # on the bundled app we expect the /env file to be in the temp folder
+        bundled_env = Path(sys._MEIPASS).joinpath('.env')  # type: ignore
+        if bundled_env.exists():
+            return dotenv_values(bundled_env)
+        else:
+            raise Exception
+    except Exception:
+        # probably on un-bundled version so try loading from local .env file
+        return dotenv_values('.env')
+
+
+def get_parent_folder(runtime_env: RtEnv) -> Path:
+    # path to folder containing the XSLT files
+    match runtime_env:
+        case RtEnv.EXE:
+            parent_folder = Path(sys.executable).parent
+            logger.info(f'{parent_folder=}')
+        case RtEnv.APP:
+            # I'm not sure that this is needed anymore as templates are now in
+            # lawchecker.app/Contents/Resources/lib/python3.12/lawchecker/templates
+            parent_folder = Path('../Resources')
+        case _:
+            # assume running as python script via usual interpreter
+            # TODO: do we still need this?
+            parent_folder = Path(__file__).parent
+            if not parent_folder.joinpath('templates').exists():
+                parent_folder = parent_folder.parent
+    return parent_folder
+
+
+def get_template_path(template_name: str, parent_folder: Path | None = None) -> Path:
     """Get template path that works in all environments."""
+    from importlib.resources import files
+
     try:
         # Try using importlib.resources first (works in all environments)
         template_files = files('lawchecker') / 'templates'
@@ -110,28 +112,94 @@ def get_template_path(template_name: str) -> Path:
         logger.info(
             'Could not load template using importlib.resources. Falling back to PARENT_FOLDER method.'
         )
-        templates_path = PARENT_FOLDER / TEMPLATES_FOLDER / template_name
+        if parent_folder is None:
+            parent_folder = get_settings().parent_folder
+        templates_path = parent_folder / TEMPLATES_FOLDER / template_name
         if not templates_path.exists():
             logger.error(
                 f'Required template file not found: {templates_path}.'
                 ' You will not be able to generate reports without it.'
             )
-        return PARENT_FOLDER / TEMPLATES_FOLDER / template_name
+        return parent_folder / TEMPLATES_FOLDER / template_name
+
+
+@cache
+def get_settings() -> Settings:
+    """
+    Resolve the settings the first time they are needed (rather than when
+    lawchecker is imported) and return the same Settings after that.
+    """
+
+    runtime_env = get_runtime_env()
+    secrets = load_secrets()
+
+    # if no .env file error
+    dash_xml_url = secrets.get(DASH_XML_KEY)
+    if dash_xml_url is None:
+        # TODO: Log this
+        logger.info(
+            'Error: Either no .env file or the file does not have '
+            f' {DASH_XML_KEY} environment variable set.'
+            '\nPlease create a .env file in the root of the project'
+            ' see .env.example for an example of the required format.'
+        )
+        dash_xml_url = ''
+
+    parent_folder = get_parent_folder(runtime_env)
 
+    reports_folder = (
+        Path.home()
+        / 'UK Parliament'
+        / 'PPU - Scripts'
+        / 'added_names_report'
+        / '_Reports'
+    )
+
+    if runtime_env == RtEnv.SCRIPT or not reports_folder.exists():
+        # if running as a script or the REPORTS_FOLDER does not exist
+        reports_folder = parent_folder / '_Reports'
 
-HTML_TEMPLATE = get_template_path(AN_HTML_TEMPLATE)
+    html_template = get_template_path(AN_HTML_TEMPLATE, parent_folder)
 
-COMPARE_REPORT_TEMPLATE = get_template_path(COMPARE_REPORT_TEMPLATE_NAME)
+    compare_report_template = get_template_path(
+        COMPARE_REPORT_TEMPLATE_NAME, parent_folder
+    )
 
-logger.info(f'{HTML_TEMPLATE=}')
-logger.info(f'{COMPARE_REPORT_TEMPLATE=}')
+    logger.info(f'{html_template=}')
+    logger.info(f'{compare_report_template=}')
+
+    if not compare_report_template.exists():
+        compare_report_template = parent_folder.parent.parent.joinpath(
+            TEMPLATES_FOLDER, COMPARE_REPORT_TEMPLATE_NAME
+        )
 
-if not COMPARE_REPORT_TEMPLATE.exists():
-    COMPARE_REPORT_TEMPLATE = PARENT_FOLDER.parent.parent.joinpath(
-        TEMPLATES_FOLDER, COMPARE_REPORT_TEMPLATE_NAME
+    return Settings(
+        runtime_env=runtime_env,
+        parent_folder=parent_folder,
+        reports_folder=reports_folder,
+        dash_xml_url=dash_xml_url,
+        html_template=html_template,
+        compare_report_template=compare_report_template,
     )
 
 
+# the settings used to be module level constants
+_SETTINGS_ATTRIBUTES = {
+    'RUNTIME_ENV': 'runtime_env',
+    'PARENT_FOLDER': 'parent_folder',
+    'REPORTS_FOLDER': 'reports_folder',
+    'DASH_XML_URL': 'dash_xml_url',
+    'HTML_TEMPLATE': 'html_template',
+    'COMPARE_REPORT_TEMPLATE': 'compare_report_template',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SETTINGS_ATTRIBUTES:
+        return getattr(get_settings(), _SETTINGS_ATTRIBUTES[name])
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 class GLOBAL_VARS:
     anr_working_folder: Path | None = None
 
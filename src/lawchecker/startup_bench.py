@@ -0,0 +1,199 @@
+"""
+Benchmark how long lawchecker takes to start, using python -X importtime.
+
+Each command line tool is run with --help (which exits before doing any
+work) and the gui is measured up to the point where the window is created,
+i.e. importing lawchecker.main. The time reported is the time spent
+importing modules after the interpreter has started, which is what our
+imports control, and it is compared with a budget for each entry point.
+
+    python -m lawchecker.startup_bench
+    python -m lawchecker.startup_bench an_report web_amendments --top 10
+
+The exit status is 1 if any entry point is over budget or fails to start.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# the scripts in pyproject.toml: name -> (module, function). The gui is only
+# imported as its main function opens the window.
+ENTRY_POINTS: dict[str, tuple[str, str | None]] = {
+    'gui': ('lawchecker.main', None),
+    'an_report': ('lawchecker.added_names_report', 'main'),
+    'compare_report': ('lawchecker.compare_amendment_documents', 'main'),
+    'compare_bills': ('lawchecker.compare_bill_documents', 'main'),
+    'bill_numbering': ('lawchecker.compare_bill_numbering', 'cli'),
+    'web_amendments': ('lawchecker.check_web_amdts', 'main'),
+}
+
+# milliseconds of import time. lxml and logging alone take ~40 ms, so these
+# leave room for the modules each tool needs but not for the Bills API
+# client (httpx and asyncio add ~100 ms) or the other tools' modules. The
+# gui budget includes pywebview.
+BUDGETS: dict[str, float] = {
+    'gui': 250,
+    'an_report': 120,
+    'compare_report': 150,
+    'compare_bills': 150,
+    'bill_numbering': 120,
+    'web_amendments': 180,
+}
+
+IMPORT_TIME_PREFIX = 'import time:'
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    # microseconds, as reported by -X importtime
+    self_us: int
+    cumulative_us: int
+    # 0 for modules imported directly by the code being measured
+    depth: int
+
+
+@dataclass
+class StartupResult:
+    name: str
+    imports: list[ImportRecord] = field(default_factory=list)
+    returncode: int = 0
+    error: str = ''
+
+    @property
+    def import_ms(self) -> float:
+        return sum(r.cumulative_us for r in self.imports if r.depth == 0) / 1000
+
+    def slowest(self, count: int) -> list[ImportRecord]:
+        """The nested imports which took the longest (including their imports)."""
+
+        nested = [r for r in self.imports if r.depth > 0]
+        return sorted(nested, key=lambda r: r.cumulative_us, reverse=True)[:count]
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """
+    Parse the -X importtime lines from stderr, ignoring the imports made
+    while the interpreter starts up (everything up to and including site).
+    """
+
+    records: list[ImportRecord] = []
+    for line in stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len(IMPORT_TIME_PREFIX) :].split('|')
+            record = ImportRecord(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip()) - 1) // 2,
+            )
+        except ValueError:
+            # the header line
+            continue
+
+        if record.module == 'site' and record.depth == 0:
+            records.clear()
+        else:
+            records.append(record)
+    return records
+
+
+def startup_code(module: str, function: str | None) -> str:
+    if function is None:
+        return f'import {module}'
+    return f'from {module} import {function}; {function}()'
+
+
+def measure(name: str) -> StartupResult:
+    module, function = ENTRY_POINTS[name]
+    command = [sys.executable, '-X', 'importtime', '-c', startup_code(module, function)]
+    if function is not None:
+        command.append('--help')
+
+    # measure this copy of lawchecker, even if it is not the installed one
+    env = os.environ.copy()
+    src_folder = str(Path(__file__).resolve().parent.parent)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [src_folder, env.get('PYTHONPATH')])
+    )
+
+    completed = subprocess.run(command, capture_output=True, text=True, env=env)
+
+    result = StartupResult(
+        name, parse_importtime(completed.stderr), completed.returncode
+    )
+    if completed.returncode != 0:
+        errors = [
+            line
+            for line in completed.stderr.splitlines()
+            if line.strip() and not line.startswith(IMPORT_TIME_PREFIX)
+        ]
+        result.error = errors[-1] if errors else f'exit status {completed.returncode}'
+    return result
+
+
+def bench(names: list[str], repeat: int = 3, top: int = 0) -> bool:
+    """
+    Print the median import time for each entry point against its budget.
+    Returns False if any is over budget or fails to start.
+    """
+
+    all_ok = True
+    print(f'{"entry point":<16} {"import ms":>10} {"budget":>8}')
+
+    for name in names:
+        results = [measure(name) for _ in range(repeat)]
+        if failed := next((r for r in results if r.returncode != 0), None):
+            print(f'{name:<16} {"-":>10} {BUDGETS[name]:>8.0f}  FAILED: {failed.error}')
+            all_ok = False
+            continue
+
+        median = statistics.median(r.import_ms for r in results)
+        within_budget = median <= BUDGETS[name]
+        all_ok = all_ok and within_budget
+        status = 'ok' if within_budget else 'OVER BUDGET'
+        print(f'{name:<16} {median:>10.1f} {BUDGETS[name]:>8.0f}  {status}')
+
+        if top:
+            fastest = min(results, key=lambda r: r.import_ms)
+            for record in fastest.slowest(top):
+                ms = record.cumulative_us / 1000
+                print(f'    {ms:>8.1f}  {"  " * record.depth}{record.module}')
+
+    return all_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check the startup (import) time of lawchecker against budgets.'
+    )
+    parser.add_argument(
+        'names',
+        nargs='*',
+        metavar='NAME',
+        help=f'Entry points to measure (default all): {", ".join(ENTRY_POINTS)}',
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='Times to start each entry point'
+    )
+    parser.add_argument(
+        '--top', type=int, default=0, help='Also show the N slowest imports'
+    )
+    args = parser.parse_args()
+
+    if unknown := [name for name in args.names if name not in ENTRY_POINTS]:
+        parser.error(f'unknown entry point: {", ".join(unknown)}')
+
+    ok = bench(args.names or list(ENTRY_POINTS), args.repeat, args.top)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
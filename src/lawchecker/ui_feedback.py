@@ -1,8 +1,10 @@
+import json
 import logging
 
 import webview
 from webview import Window
 
+from lawchecker import jobs, progress
 from lawchecker.lawchecker_logger import logger
 
 
@@ -30,7 +32,8 @@ class ProgressModal:
                 logger.info(text)
 
         if isinstance(window, Window):
-            window.evaluate_js(f'progress_modal_update({repr(text)})')
+            # sent with the log messages so they stay in order
+            progress.get_bus().message(text)
 
     def __init__(self, window: Window | None = None) -> None:
         if window is not None:
@@ -52,9 +55,72 @@ class ProgressModal:
 
     def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
         if isinstance(self.window, Window):
+            # show any waiting messages before the OK button is enabled
+            progress.get_bus().flush()
+
+            # leave it disabled while other jobs are using the modal. When
+            # they finish, job_update() in the webview enables it.
+            current = jobs.current_job()
+            if any(job is not current for job in jobs.get_manager().active_jobs()):
+                return
             self.window.evaluate_js('enable_progress_modal_ok_button_element()')
 
 
+class WebviewProgress:
+    """
+    Progress bus subscriber which shows progress bars and messages in the
+    progress modal. Everything in an update is sent in one call to the
+    webview (two if a new progress bar is created).
+    """
+
+    def __init__(self, window: Window) -> None:
+        self.window = window
+        # progress bus bar ID -> ID of the bar in the webview
+        self.bar_ids: dict[str, str] = {}
+
+    def __call__(self, update: progress.ProgressUpdate) -> None:
+        script: list[str] = []
+
+        for kind, value in update.events:
+            if kind == 'message':
+                script.append(f'progress_modal_update({repr(value)});')
+            elif kind == 'new_bar':
+                # the webview makes the bar ID, so send what we have first
+                if script:
+                    self.window.run_js('\n'.join(script))
+                    script = []
+                self.bar_ids[value] = self.window.evaluate_js('newProgressBar()')
+
+        for bar_id, state in update.bars.items():
+            webview_id = self.bar_ids.get(bar_id)
+            if webview_id is not None:
+                script.append(
+                    f'updateProgressBar("{webview_id}", {state.percent});'
+                )
+
+        for kind, value in update.events:
+            if kind == 'end_bar':
+                self.bar_ids.pop(value, None)
+
+        if script:
+            self.window.run_js('\n'.join(script))
+
+
+class WebviewJobs:
+    """
+    Job listener which passes each job update to job_update() in the
+    webview, which shows the running jobs and lets them be cancelled.
+    """
+
+    def __init__(self, window: Window) -> None:
+        self.window = window
+
+    def __call__(self, job: jobs.Job) -> None:
+        job_json = json.dumps(job.to_json(), default=str)
+        # the check is for UI bundles built before jobs were added
+        self.window.run_js(f'window.job_update && window.job_update({job_json});')
+
+
 class UILogHandler(logging.StreamHandler):
     """
     Custom handler for passing logs to `pywebview` UI.
@@ -92,5 +158,6 @@ class UILogHandler(logging.StreamHandler):
         else:
             message = f'{record.levelname}: {message}'
 
-        # Pass `record.levelname` and `message` to modal
-        ProgressModal.static_update(self.window, message)
+        # Pass `record.levelname` and `message` to modal (via the progress bus,
+        # which sends messages to the webview in batches)
+        progress.get_bus().message(message)
@@ -0,0 +1,87 @@
+"""
+Helpers for the --watch mode of the command line tools.
+
+Files are polled (modification time and size) rather than using operating
+system notifications. This works the same on every platform and on
+network drives, and the number of files watched is small.
+"""
+
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from lawchecker.lawchecker_logger import logger
+
+# how often (seconds) to check watched files for changes
+FILE_POLL_INTERVAL = 1.0
+
+
+class FileWatcher:
+    """
+    Watch files, and folders of files matching pattern, for changes.
+
+    Each call to changes returns the files which have been added, modified
+    or removed since the previous call.
+    """
+
+    def __init__(self, paths: Iterable[Path], pattern: str = '*.xml'):
+        self.paths = [Path(path) for path in paths]
+        self.pattern = pattern
+        self._state = self._snapshot()
+
+    @property
+    def files(self) -> list[Path]:
+        """Files currently being watched."""
+        return list(self._state)
+
+    def _snapshot(self) -> dict[Path, tuple[int, int]]:
+        state: dict[Path, tuple[int, int]] = {}
+        for path in self.paths:
+            files = sorted(path.glob(self.pattern)) if path.is_dir() else [path]
+            for file in files:
+                try:
+                    stat = file.stat()
+                except OSError:
+                    # removed (or being replaced)
+                    continue
+                state[file.resolve()] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def changes(self) -> set[Path]:
+        state = self._snapshot()
+        changed = {
+            path
+            for path in state.keys() | self._state.keys()
+            if state.get(path) != self._state.get(path)
+        }
+        self._state = state
+        return changed
+
+
+def wait_for_changes(
+    watcher: FileWatcher, timeout: float | None = None
+) -> set[Path]:
+    """
+    Block until watched files change (or timeout seconds have passed) and
+    return the changed files. Once a change is seen, wait until the files
+    stop changing so half written files are not read.
+    """
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        changed = watcher.changes()
+        if changed:
+            while more := _changes_after_pause(watcher):
+                changed |= more
+            for path in sorted(changed):
+                logger.info(f'Changed: {path}')
+            return changed
+
+        if deadline is not None and time.monotonic() >= deadline:
+            return set()
+        time.sleep(FILE_POLL_INTERVAL)
+
+
+def _changes_after_pause(watcher: FileWatcher) -> set[Path]:
+    time.sleep(FILE_POLL_INTERVAL)
+    return watcher.changes()
@@ -0,0 +1,38 @@
+import json
+import sys
+from pathlib import Path
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker import amdt_storage
+
+AMDTS_JSON = {
+    "shortTitle": "Example Bill",
+    "billId": 1,
+    "stageId": 2,
+    "stageDescription": "Committee stage",
+    "items": [{"amendmentId": 3, "dNum": "abc"}, {"amendmentId": 4, "dNum": "déf"}],
+}
+
+
+def test_compressed_round_trip(tmp_path: Path):
+    path = tmp_path / f"example{amdt_storage.SUFFIX}"
+    amdt_storage.save_amdts(AMDTS_JSON, path)
+
+    assert amdt_storage.is_compressed(path)
+    assert amdt_storage.load_amdts(path) == AMDTS_JSON
+
+    header, items = amdt_storage.iter_amdts(path)
+    assert header["billId"] == 1
+    assert "items" not in header
+    assert next(items) == {"amendmentId": 3, "dNum": "abc"}
+
+
+def test_plain_json_still_loads(tmp_path: Path):
+    path = tmp_path / "example.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(AMDTS_JSON, f)
+
+    streamed = amdt_storage.load_amdts(path, stream=True)
+    assert streamed == AMDTS_JSON
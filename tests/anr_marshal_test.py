@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+from lxml import etree
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker.anr_marshal import MarshalIndex, load_marshal_files, sniff_bill_title
+from lawchecker.anr_post_processing_html import annotate_names, reorder_amendments
+
+marshal_file = Path(
+    "example_files/addedNames/Amendment_Paper_XML/victims_prisoners_rm_pbc_0628.xml"
+).resolve()
+
+BILL = "Victims and Prisoners Bill"
+
+
+def test_marshal_index():
+    index = MarshalIndex.from_trees([etree.parse(str(marshal_file))])
+
+    assert index.files == [marshal_file.name]
+    assert index.marshalled_order(BILL)[:3] == ["3", "4", "39"]
+    assert index.has_name(BILL, "3", "layla  MORAN")
+    assert index.has_name(BILL.replace("and", " and "), "3", "Wera Hobhouse")
+    assert not index.has_name(BILL, "4", "Layla Moran")
+    assert not index.has_name("Another Bill", "3", "Layla Moran")
+
+    ordered, was_reordered = reorder_amendments(
+        index, BILL, {"NC99": "new", "4": "four", "3": "three"}
+    )
+    assert was_reordered
+    assert [num for num, _ in ordered] == ["3", "4", "NC99"]
+
+    html = etree.fromstring(
+        '<div><div class="bill"><h1 class="bill-title">Victims and Prisoners Bill</h1>'
+        '<div class="amendment"><div class="num-info">'
+        '<h2 class="amendment-number">Amendment 3</h2></div>'
+        '<div class="names-to-add">'
+        '<div class="name"><span><a>Layla Moran</a></span></div>'
+        '<div class="name"><span><a>Richard Thomson</a></span></div>'
+        "</div></div></div></div>"
+    )
+    assert annotate_names(html, index)
+    assert [span.text for span in html.iter("span") if span.get("class")] == [
+        " ✔",
+        " ✘",
+    ]
+
+
+def test_load_marshal_files_skips_other_bills(tmp_path):
+    other_file = Path("example_files/amendments/energy_rm_rep_0904.xml").resolve()
+    for file in (marshal_file, other_file):
+        (tmp_path / file.name).write_bytes(file.read_bytes())
+
+    assert sniff_bill_title(marshal_file) == BILL
+
+    assert len(load_marshal_files(tmp_path)) == 2
+
+    trees = load_marshal_files(tmp_path, bill_titles=[BILL])
+    assert [Path(tree.docinfo.URL).name for tree in trees] == [marshal_file.name]
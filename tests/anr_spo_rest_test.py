@@ -0,0 +1,57 @@
+import io
+import sys
+from pathlib import Path
+
+from lxml import etree
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker.anr_bench import synthetic_export
+from lawchecker.anr_spo_rest import (
+    token_cache_info,
+    tokenize_amendment_numbers,
+    stream_transform,
+    tokenize_names,
+    transform,
+)
+
+
+def test_tokenize_amendment_numbers():
+    tokens = tokenize_amendment_numbers(" Amendments 20,  21 and New Clauses 9 to 11 ")
+    assert tokens.original_string == "Amendments 20, 21 and New Clauses 9 to 11"
+    # ranges are matched first
+    assert tokens.matched_numbers == ("NC9", "NC10", "NC11", "20", "21")
+    assert tokens.unmatched == "and"
+
+    assert tokenize_amendment_numbers("101–103, NS1").matched_numbers == (
+        "101",
+        "102",
+        "103",
+        "NS1",
+    )
+    assert tokenize_amendment_numbers(None).matched_numbers == ()
+
+
+def test_tokenize_names():
+    assert tokenize_names("Tulip Siddiq") == ("Tulip Siddiq",)
+    assert tokenize_names("- Rosie Duffield\n- Kim Leadbeater") == (
+        "Rosie Duffield",
+        "Kim Leadbeater",
+    )
+
+
+def test_transform_synthetic_export():
+    export = synthetic_export(200)
+    root = transform(etree.ElementTree(etree.fromstring(export)))
+    assert etree.tostring(stream_transform(io.BytesIO(export))) == etree.tostring(
+        root
+    )
+
+    items = root.findall("item")
+    assert len(items) == 200
+    assert all(
+        item.find("numbers/matched-numbers/amd-no") is not None for item in items
+    )
+    # the same cell text recurs so most rows are tokenized from the cache
+    assert token_cache_info()["tokenize_amendment_numbers"].hits > 100
@@ -0,0 +1,194 @@
+import asyncio
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker import bills_api
+from lawchecker.api_fixtures import RecordingTransport, ReplayTransport, fixture_name
+
+AMENDMENT_URL = f"{bills_api.BASE_URL}/Bills/1/Stages/2/Amendments/3"
+
+
+@pytest.fixture
+def fixture_dir(tmp_path: Path) -> Path:
+    fixture = {
+        "url": AMENDMENT_URL,
+        "status_code": 200,
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps({"amendmentId": 3, "dNum": "abc"}),
+    }
+    with open(tmp_path / fixture_name(httpx.URL(AMENDMENT_URL)), "w") as f:
+        json.dump(fixture, f)
+    return tmp_path
+
+
+def _get_amendment(transport: ReplayTransport) -> dict:
+    async def run():
+        client = bills_api.BillsApiClient(transport=transport, cache_dir=None)
+        # no need to wait long between retries in tests
+        client.scheduler.backoff_base = 0.001
+        async with client:
+            return await client.get_amendment_json(1, 2, 3)
+
+    return asyncio.run(run())
+
+
+def test_replay_serves_fixture(fixture_dir):
+    transport = ReplayTransport(fixture_dir)
+
+    assert _get_amendment(transport) == {"amendmentId": 3, "dNum": "abc"}
+    assert transport.stats.served == 1
+
+
+def test_client_retries_after_429(fixture_dir):
+    # max_in_flight=0 means every request is rate limited
+    transport = ReplayTransport(fixture_dir, max_in_flight=0, retry_after=0)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _get_amendment(transport)
+
+    # the first attempt plus max_retries
+    assert transport.stats.rate_limited == 5
+
+
+def test_http_stats_per_endpoint(fixture_dir):
+    transport = ReplayTransport(fixture_dir, max_in_flight=0, retry_after=0)
+
+    async def run():
+        client = bills_api.BillsApiClient(
+            transport=transport, cache_dir=None, max_retries=1
+        )
+        async with client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_amendment_json(1, 2, 3)
+        return client.stats.to_json()
+
+    stats = asyncio.run(run())
+    endpoint = stats["endpoints"]["/Bills/{id}/Stages/{id}/Amendments/{id}"]
+    assert endpoint["requests"] == 2
+    assert endpoint["retries"] == 1
+    assert endpoint["status_codes"] == {"429": 2}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_scheduler_increases_limit_after_fast_responses():
+    clock = FakeClock()
+    scheduler = bills_api.RequestScheduler(
+        initial_concurrency=4, max_concurrency=5, clock=clock
+    )
+
+    for _ in range(5):
+        scheduler.on_success(0.1, clock())
+    # roughly one for every `limit` fast responses
+    assert scheduler.concurrency == 5
+
+    for _ in range(20):
+        scheduler.on_success(0.1, clock())
+    assert scheduler.concurrency == 5
+
+
+def test_scheduler_decreases_once_per_generation():
+    clock = FakeClock()
+    scheduler = bills_api.RequestScheduler(initial_concurrency=8, clock=clock)
+    scheduler.on_success(0.1, clock())
+
+    # a burst of slow responses to requests sent at the same time
+    started = clock()
+    clock.now += 1
+    for _ in range(5):
+        scheduler.on_success(1.0, started)
+    assert scheduler.concurrency == 7
+
+    # as do 429s for requests sent before that decrease
+    scheduler.on_failure(started)
+    assert scheduler.concurrency == 7
+
+    # requests sent after the decrease count again
+    clock.now += 1
+    for _ in range(3):
+        scheduler.on_failure(clock())
+    assert scheduler.concurrency == 3
+
+    for _ in range(5):
+        clock.now += 1
+        scheduler.on_failure(clock())
+    assert scheduler.concurrency == scheduler.min_concurrency == 1
+
+
+def test_scheduler_token_bucket():
+    clock = FakeClock()
+    scheduler = bills_api.RequestScheduler(requests_per_second=2, burst=2, clock=clock)
+
+    async def take_two():
+        for _ in range(2):
+            async with scheduler.slot() as ticket:
+                ticket.record(200)
+
+    asyncio.run(take_two())
+    assert scheduler._tokens == 0
+
+    clock.now += 0.25
+    scheduler._refill(clock())
+    assert scheduler._tokens == 0.5
+
+    # never more than the burst size
+    clock.now += 10
+    scheduler._refill(clock())
+    assert scheduler._tokens == 2
+
+
+def test_scheduler_honours_retry_after():
+    clock = FakeClock()
+    scheduler = bills_api.RequestScheduler(backoff_cap=30, clock=clock)
+    request = httpx.Request("GET", AMENDMENT_URL)
+
+    response = httpx.Response(429, headers={"Retry-After": "5"}, request=request)
+    assert scheduler.backoff_delay(0, response) == 5
+    # new requests wait too
+    assert scheduler._paused_until == clock.now + 5
+
+    response = httpx.Response(429, headers={"Retry-After": "600"}, request=request)
+    assert scheduler.backoff_delay(0, response) == 30
+
+    assert bills_api.parse_retry_after(None) is None
+    assert bills_api.parse_retry_after("soon") is None
+    assert bills_api.parse_retry_after(" 2.5 ") == 2.5
+    assert bills_api.parse_retry_after("-3") == 0
+    assert bills_api.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert 3000 < bills_api.parse_retry_after("Fri, 01 Jan 9999 00:00:00 GMT")
+
+
+def test_recorder_handles_gzip_responses(tmp_path):
+    body = json.dumps({"amendmentId": 3}).encode("utf-8")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json", "content-encoding": "gzip"},
+            content=gzip.compress(body),
+        )
+
+    async def run():
+        recorder = RecordingTransport(tmp_path, transport=httpx.MockTransport(handler))
+        async with httpx.AsyncClient(transport=recorder) as client:
+            return await client.get(AMENDMENT_URL)
+
+    response = asyncio.run(run())
+    assert response.json() == {"amendmentId": 3}
+
+    with open(tmp_path / fixture_name(httpx.URL(AMENDMENT_URL))) as f:
+        assert json.load(f)["body"] == body.decode("utf-8")
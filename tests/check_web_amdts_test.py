@@ -0,0 +1,325 @@
+import argparse
+import asyncio
+import json
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker import bills_api
+from lawchecker.api_fixtures import ReplayTransport, fixture_name
+from lawchecker.check_web_amdts import (
+    AmdtContainer,
+    AmdtRef,
+    Amendment,
+    Sponsor,
+    async_batch_fetch_and_parse,
+    async_fetch_and_parse,
+    async_watch_step,
+    decode_amendments,
+    detail_refresh_age,
+    find_duplicate_sponsors,
+    find_unchanged_amendments,
+    run_batch,
+    summary_fingerprint,
+)
+
+
+def amendment_json(i: int) -> dict:
+    return {
+        "amendmentId": i,
+        "dNum": f"d{i}",
+        "marshalledListText": str(i),
+        "decision": "NoDecision",
+        "statusIndicator": None,
+        "amendmentLines": [
+            {"hangingIndentation": "", "text": f"Page 1, line {i}, leave out"},
+            {"text": '<span class="sub-para-num">(a)</span>“word”'},
+        ],
+        "explanatoryText": f"<p>Amendment {i} explained</p>",
+        "sponsors": [
+            {"name": "A Member", "memberId": 1, "isLead": True, "sortOrder": 1}
+        ],
+    }
+
+
+EXAMPLE_AMENDMENTS = Path(__file__).resolve().parent.parent / "example_files/amendments"
+BILL_TITLE = "Data Protection and Digital Information (No. 2) Bill"
+
+
+def write_api_fixtures(fixture_dir: Path, count: int) -> Path:
+    """
+    Fixtures for the example data protection papers: the bill is found
+    with ID 1, and its report stage (ID 2) has count amendments.
+    """
+    base = bills_api.BASE_URL
+    amendments = [amendment_json(i) for i in range(1, count + 1)]
+    bill = {
+        "billId": 1,
+        "shortTitle": BILL_TITLE,
+        "currentStage": {"id": 2, "description": "Report Stage"},
+    }
+    responses = {
+        httpx.URL(f"{base}/Bills", params={"SearchTerm": BILL_TITLE}): {
+            "items": [bill],
+            "totalResults": 1,
+        }
+    }
+    for skip in range(0, count, 20):
+        url = httpx.URL(
+            f"{base}/Bills/1/Stages/2/Amendments", params={"Skip": skip, "Take": 20}
+        )
+        responses[url] = {"items": amendments[skip : skip + 20], "totalResults": count}
+    for i, amendment in enumerate(amendments, start=1):
+        responses[httpx.URL(f"{base}/Bills/1/Stages/2/Amendments/{i}")] = amendment
+
+    fixture_dir.mkdir()
+    for url, body in responses.items():
+        fixture = {
+            "url": str(url),
+            "status_code": 200,
+            "headers": {"content-type": "application/json"},
+            "body": json.dumps(body),
+        }
+        with open(fixture_dir / fixture_name(url), "w") as f:
+            json.dump(fixture, f)
+    return fixture_dir
+
+
+def copy_paper(name: str, folder: Path) -> Path:
+    folder.mkdir(exist_ok=True)
+    return Path(shutil.copy(EXAMPLE_AMENDMENTS / name, folder))
+
+
+def run_with_client(transport, coro_factory, cache_dir=None):
+    async def run():
+        client = bills_api.BillsApiClient(transport=transport, cache_dir=cache_dir)
+        async with client:
+            return await coro_factory(client)
+
+    return asyncio.run(run())
+
+
+def test_parallel_decoding_keeps_order():
+    items = [amendment_json(i) for i in range(7)]
+
+    serial = decode_amendments(items)
+    parallel = decode_amendments(items, jobs=2, chunk_size=2)
+    assert parallel == serial
+    assert [record["amendmentId"] for record in parallel] == list(range(7))
+
+    assert Amendment.from_record(serial[3]) == Amendment.from_json(items[3])
+
+    container = AmdtContainer.from_json({"items": items + [{}]}, jobs=2)
+    assert [amdt.num for amdt in container.amendments] == [str(i) for i in range(7)]
+
+
+def test_lookup_falls_back_to_dnum():
+    same_num = [dict(amendment_json(i), marshalledListText="5") for i in (1, 2)]
+    no_dnum = dict(amendment_json(3), dNum="")
+    container = AmdtContainer([Amendment.from_json(a) for a in [*same_num, no_dnum]])
+    first, second, third = container.amendments
+
+    assert container.duplicate_amdt_nums == ["5"]
+    assert container[AmdtRef("5", "d2")] is second
+
+    # e.g. a running list without numbers, or an amendment renumbered since
+    assert container[AmdtRef("", "d2")] is second
+    assert container[AmdtRef("6", "d1")] is first
+
+    assert container[AmdtRef("3", "")] is third
+    # the number alone is not enough to find an amendment
+    with pytest.raises(KeyError):
+        container[AmdtRef("5", "")]
+    with pytest.raises(KeyError):
+        container[AmdtRef("3", "d3")]
+
+
+def test_sponsors_are_identified_by_member_id():
+    minister = Sponsor("Wes Streeting", 4, True, 1)
+    same_minister = Sponsor("Secretary Wes Streeting", 4, False, 3)
+    # two different members with the same name
+    smith = Sponsor("John Smith", 10, False, 2)
+    other_smith = Sponsor("John Smith", 11, False, 4)
+
+    assert minister == same_minister
+    assert hash(minister) == hash(same_minister)
+    assert smith != other_smith
+    assert len({minister, same_minister, smith, other_smith}) == 3
+
+    sponsors = [minister, smith, same_minister, other_smith, same_minister]
+    assert find_duplicate_sponsors(sponsors) == [same_minister]
+    assert find_duplicate_sponsors([smith, other_smith]) == []
+
+    data = amendment_json(1)
+    data["sponsors"] = [
+        {"name": s.name, "memberId": s.member_id, "isLead": s.is_lead, "sortOrder": 1}
+        for s in sponsors
+    ]
+    assert Amendment.from_json(data).sponsor_ids == frozenset({4, 10, 11})
+
+
+def test_old_amendment_details_are_fetched_again():
+    summary = [amendment_json(i) for i in range(1, 4)]
+    previous = {
+        "billId": 1,
+        "stageId": 2,
+        "items": summary,
+        "summaryFingerprints": {
+            str(item["amendmentId"]): summary_fingerprint(item) for item in summary
+        },
+        # amendment 3 has no time, as in files saved before it was recorded
+        "detailFetchedAt": {"1": time.time(), "2": time.time() - 120},
+    }
+
+    unchanged = find_unchanged_amendments(summary, previous, 1, 2)
+    assert sorted(unchanged) == ["1", "2"]
+
+    # e.g. a correction to the text of amendment 2 would not change its summary
+    unchanged = find_unchanged_amendments(summary, previous, 1, 2, max_detail_age=60)
+    assert sorted(unchanged) == ["1"]
+
+    # by default, details are as fresh as a cached amendment response
+    previous["detailFetchedAt"]["2"] = time.time() - detail_refresh_age() - 1
+    unchanged = find_unchanged_amendments(summary, previous, 1, 2)
+    assert sorted(unchanged) == ["1"]
+
+
+def test_amendments_are_parsed_while_downloading(tmp_path, monkeypatch):
+    transport = ReplayTransport(write_api_fixtures(tmp_path / "api", 30), latency=0.01)
+    paper = copy_paper("datapro_rm_rep_0825.xml", tmp_path / "papers")
+
+    # the number of responses served when each amendment was parsed
+    parsed = []
+    from_json = Amendment.from_json
+
+    def record(cls, data):
+        if threading.current_thread().name.startswith("amdt-parse"):
+            parsed.append(transport.stats.served)
+        return from_json(data)
+
+    monkeypatch.setattr(Amendment, "from_json", classmethod(record))
+
+    xml_amdts, json_amdts = run_with_client(
+        transport, lambda client: async_fetch_and_parse(paper, client=client)
+    )
+
+    assert xml_amdts.amendments
+    assert [amdt.num for amdt in json_amdts.amendments] == [
+        str(i) for i in range(1, 31)
+    ]
+    assert len(parsed) == 30
+    assert min(parsed) < transport.stats.served
+
+
+def test_parse_thread_errors_are_passed_on(tmp_path, monkeypatch):
+    transport = ReplayTransport(write_api_fixtures(tmp_path / "api", 3), latency=0.01)
+    paper = copy_paper("datapro_rm_rep_0825.xml", tmp_path / "papers")
+
+    from_json = Amendment.from_json
+
+    def fail(cls, data):
+        # AmdtContainer.from_json would parse it again without the error
+        if threading.current_thread().name.startswith("amdt-parse"):
+            raise RuntimeError("parse failed")
+        return from_json(data)
+
+    monkeypatch.setattr(Amendment, "from_json", classmethod(fail))
+
+    with pytest.raises(RuntimeError, match="parse failed"):
+        run_with_client(
+            transport, lambda client: async_fetch_and_parse(paper, client=client)
+        )
+
+
+def test_papers_for_the_same_stage_share_a_download(tmp_path, monkeypatch):
+    transport = ReplayTransport(write_api_fixtures(tmp_path / "api", 30), latency=0.01)
+    folder = tmp_path / "papers"
+    papers = [
+        copy_paper(name, folder)
+        for name in ("datapro_rm_rep_0721.xml", "datapro_rm_rep_0825.xml")
+    ]
+
+    results = run_with_client(
+        transport, lambda client: async_batch_fetch_and_parse(papers, client=client)
+    )
+
+    assert [paper.error for paper in results] == [None, None]
+    first, second = results
+    assert first.target == second.target
+    assert first.json_amdts is second.json_amdts
+    assert first.xml_amdts is not second.xml_amdts
+    # a bill search for each paper, then two summary pages and 30 amendments once
+    assert transport.stats.requests == 2 + 2 + 30
+
+    # and from the command line, a report for each paper
+    session = bills_api.ClientSession(transport=transport, cache_dir=None)
+    monkeypatch.setattr(bills_api, "_shared_session", session)
+    args = argparse.Namespace(
+        xml_files=[folder],
+        no_save_json=True,
+        incremental=False,
+        jobs=1,
+        summary=False,
+        batch=True,
+        output=tmp_path / "reports",
+    )
+    args.output.mkdir()
+    try:
+        assert run_batch(args) == 0
+    finally:
+        session.close()
+
+    assert transport.stats.requests == 2 * (2 + 2 + 30)
+    published = ("21 July 2023", "25 August 2023")
+    for paper, date in zip(papers, published, strict=True):
+        report = (args.output / paper.name).with_suffix(".html")
+        assert date in report.read_text(encoding="utf-8")
+
+
+def test_watch_step_reruns_changed_papers(tmp_path):
+    transport = ReplayTransport(write_api_fixtures(tmp_path / "api", 30))
+    folder = tmp_path / "papers"
+    changed, unchanged = (
+        copy_paper(name, folder)
+        for name in ("datapro_rm_rep_0721.xml", "datapro_rm_rep_0825.xml")
+    )
+    papers = {}
+    stages = {}
+
+    async def steps(client):
+        first = await async_watch_step(
+            papers, stages, {changed, unchanged}, False, client, save_json=False
+        )
+        first_paper = papers[changed]
+        requests = transport.stats.requests
+
+        second = await async_watch_step(
+            papers, stages, {changed}, True, client, save_json=False
+        )
+        return first, first_paper, transport.stats.requests - requests, second
+
+    first, first_paper, requests, second = run_with_client(
+        transport, steps, cache_dir=tmp_path / "cache"
+    )
+
+    assert first == {changed, unchanged}
+    assert list(stages) == [(1, 2)]
+    assert len(papers[unchanged].json_amdts) == 30
+
+    # the changed paper is parsed again, and reported on with the same
+    # amendments as nothing changed in the API
+    assert second == {changed}
+    assert papers[changed] is not first_paper
+    assert papers[changed].json_amdts is papers[unchanged].json_amdts
+
+    # its bill search is answered by the HTTP cache, but the summary pages
+    # are fetched again to look for changes although the cache is fresh
+    assert requests == 2
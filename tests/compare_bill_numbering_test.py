@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker.compare_bill_numbering import CompareBillNumbering
+
+
+@pytest.fixture(scope="module")
+def lineage():
+    compare = CompareBillNumbering.from_folder(
+        Path("example_files/bills").resolve()
+    )
+    return compare.lineage()["social housing (regulation)"]
+
+
+def test_lineage_versions_in_published_order(lineage):
+    assert lineage.versions == [
+        "lords_as_amended_in_committee",
+        "lords_as_amended_on_report",
+        "commons_as_brought_from_the_lords",
+        "commons_as_amended_in_public_bill_committee",
+    ]
+
+
+def test_lineage_round_trip(lineage):
+    guid = lineage.guid_for("sched_5__para_46", "Lords, As amended on Report")
+
+    assert guid is not None
+    assert lineage.eid_for(guid, "lords_as_amended_in_committee") == "sched_5__para_42"
+    assert lineage.first_seen(guid) == "lords_as_amended_in_committee"
+
+
+def test_lineage_unknown_version(lineage):
+    with pytest.raises(KeyError):
+        lineage.guid_for("sec_1", "commons_introduced")
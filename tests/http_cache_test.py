@@ -0,0 +1,121 @@
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker import bills_api, http_cache
+from lawchecker.http_cache import ResponseCache, cache_key, max_cache_age, ttl_for_url
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class FakeApi:
+    """Answers every request with the same amendment, or 304 if unchanged."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == ETAG:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"etag": ETAG, "last-modified": LAST_MODIFIED},
+            json={"amendmentId": 3},
+        )
+
+
+def get_amendments(cache_dir: Path, api: FakeApi, times: int, max_age=None) -> list:
+    async def run():
+        client = bills_api.BillsApiClient(
+            transport=httpx.MockTransport(api), cache_dir=cache_dir
+        )
+        async with client:
+            results = []
+            for _ in range(times):
+                if max_age is None:
+                    results.append(await client.get_amendment_json(1, 2, 3))
+                else:
+                    with max_cache_age(max_age):
+                        results.append(await client.get_amendment_json(1, 2, 3))
+            return results, client.cache
+
+    return asyncio.run(run())
+
+
+def test_fresh_response_is_served_from_cache(tmp_path):
+    api = FakeApi()
+
+    results, cache = get_amendments(tmp_path, api, times=3)
+
+    assert results == [{"amendmentId": 3}] * 3
+    assert len(api.requests) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # and from disk by a new client
+    results, cache = get_amendments(tmp_path, api, times=1)
+    assert results == [{"amendmentId": 3}]
+    assert len(api.requests) == 1
+
+
+def test_stale_response_is_revalidated(tmp_path):
+    api = FakeApi()
+    get_amendments(tmp_path, api, times=1)
+
+    # with max_cache_age(0) every cached response is stale
+    results, cache = get_amendments(tmp_path, api, times=2, max_age=0)
+
+    assert results == [{"amendmentId": 3}] * 2
+    assert len(api.requests) == 3
+    revalidation = api.requests[-1]
+    assert revalidation.headers["If-None-Match"] == ETAG
+    assert revalidation.headers["If-Modified-Since"] == LAST_MODIFIED
+    assert cache.revalidated == 2
+    assert cache.misses == 0
+
+
+def test_ttl_per_endpoint():
+    base = bills_api.BASE_URL
+    amendment_ttl = ttl_for_url(f"{base}/Bills/1/Stages/2/Amendments/3")
+    assert amendment_ttl == 5 * http_cache.MINUTE
+    assert ttl_for_url(f"{base}/Bills/1/Stages/2/Amendments") == amendment_ttl
+    assert ttl_for_url(f"{base}/Bills/1/Stages") == http_cache.HOUR
+    assert ttl_for_url(f"{base}/BillTypes") == 7 * http_cache.DAY
+    assert ttl_for_url(f"{base}/Bills") == http_cache.DEFAULT_TTL
+
+    with max_cache_age(60):
+        assert ttl_for_url(f"{base}/BillTypes") == 60
+        assert ttl_for_url(f"{base}/Bills/1/Stages/2/Amendments/3") == 60
+    assert ttl_for_url(f"{base}/BillTypes") == 7 * http_cache.DAY
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=250)
+    keys = [cache_key(f"{bills_api.BASE_URL}/Bills/{i}") for i in range(3)]
+
+    def response(i: int) -> httpx.Response:
+        request = httpx.Request("GET", f"{bills_api.BASE_URL}/Bills/{i}")
+        return httpx.Response(200, content=b"x" * 100, request=request)
+
+    cache.put(keys[0], response(0))
+    cache.put(keys[1], response(1))
+    # make the access times distinct, then use the first entry
+    for age, key in ((20, keys[0]), (10, keys[1])):
+        used = time.time() - age
+        os.utime(tmp_path / f"{key}.body", (used, used))
+    assert cache.get(keys[0]) is not None
+
+    cache.put(keys[2], response(2))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]).body == b"x" * 100
+    assert cache.get(keys[2]) is not None
+    assert cache._size == 200
@@ -0,0 +1,138 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker import bills_api, jobs
+from lawchecker.jobs import JobManager, JobState
+
+
+def wait_until(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.01)
+
+
+def test_job_result_and_failure():
+    manager = JobManager()
+    try:
+        job = manager.submit("add", lambda a, b: a + b, 1, 2)
+        assert job.wait(5)
+        assert job.state == JobState.DONE
+        assert job.result == 3
+
+        failed = manager.submit("fail", lambda: 1 / 0)
+        assert failed.wait(5)
+        assert failed.state == JobState.FAILED
+        assert "division" in failed.error
+        assert manager.cancel(failed.job_id) is False
+
+        def no_file():
+            raise jobs.JobError("No XML file selected.")
+
+        refused = manager.submit("refused", no_file)
+        assert refused.wait(5)
+        assert refused.state == JobState.FAILED
+        assert refused.to_json()["error"] == "No XML file selected."
+        assert refused.result is None
+    finally:
+        manager.shutdown()
+
+
+def test_cancel_running_and_pending_jobs():
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+
+    def work():
+        started.set()
+        while True:
+            jobs.report_progress("working")
+            time.sleep(0.01)
+
+    try:
+        running = manager.submit("running", work)
+        pending = manager.submit("pending", lambda: "never run")
+        assert started.wait(5)
+        assert manager.active_jobs() == [running, pending]
+
+        # the pending job is cancelled before it starts
+        assert manager.cancel(pending.job_id)
+        assert pending.state == JobState.CANCELLED
+
+        assert manager.cancel(running.job_id)
+        assert running.wait(5)
+        assert running.state == JobState.CANCELLED
+        assert pending.result is None
+        assert manager.active_jobs() == []
+    finally:
+        manager.shutdown()
+
+
+def test_jobs_run_concurrently():
+    manager = JobManager(max_workers=2)
+    barrier = threading.Barrier(2, timeout=5)
+    try:
+        first = manager.submit("first", barrier.wait)
+        second = manager.submit("second", barrier.wait)
+        # each would time out (and fail) if the other was not running
+        assert first.wait(5) and second.wait(5)
+        assert first.state == second.state == JobState.DONE
+    finally:
+        manager.shutdown()
+
+
+def test_listeners_are_told_about_progress():
+    manager = JobManager()
+    updates = []
+    manager.subscribe(lambda job: updates.append((job.state, job.message, job.done)))
+
+    def work():
+        jobs.report_progress("step 1")
+        for i in range(1, 1001):
+            jobs.report_progress(done=i, total=1000)
+        return "ok"
+
+    try:
+        job = manager.submit("progress", work)
+        assert job.wait(5)
+    finally:
+        manager.shutdown()
+
+    assert updates[0] == (JobState.PENDING, "", 0)
+    assert (JobState.RUNNING, "step 1", 0) in updates
+    assert updates[-1] == (JobState.DONE, "step 1", 1000)
+    # counts are throttled, but the last one is always passed on
+    assert (JobState.RUNNING, "step 1", 1000) in updates
+    assert len(updates) < 100
+    assert job.to_json()["percent"] == 100
+
+
+def test_outside_a_job_does_nothing():
+    assert jobs.current_job() is None
+    jobs.check_cancelled()
+    jobs.report_progress("not in a job", done=1, total=2)
+
+
+def test_cancel_stops_bills_api_query():
+    manager = JobManager()
+    session = bills_api.ClientSession(cache_dir=None)
+
+    def query():
+        return session.run(lambda client: asyncio.sleep(30))
+
+    try:
+        job = manager.submit("query", query)
+        wait_until(lambda: job.state == JobState.RUNNING)
+        start = time.monotonic()
+        manager.cancel(job.job_id)
+        assert job.wait(5)
+        assert job.state == JobState.CANCELLED
+        assert time.monotonic() - start < 2
+    finally:
+        manager.shutdown()
+        session.close()
@@ -0,0 +1,80 @@
+import sys
+import time
+from pathlib import Path
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker.mnis_members import (
+    MemberDirectory,
+    MemberDirectoryCache,
+    MemberMatcher,
+    NameMatch,
+)
+
+MNIS_XML = b"""<?xml version="1.0" encoding="utf-8"?>
+<Members>
+  <Member Member_Id="4656"><DisplayAs>Layla Moran</DisplayAs></Member>
+  <Member Member_Id="1"><DisplayAs>Mr Tobias Ellwood</DisplayAs></Member>
+  <Member Member_Id="2"><DisplayAs>Dame Diana Johnson</DisplayAs></Member>
+  <Member Member_Id="3"/>
+</Members>"""
+
+
+def test_member_lookup():
+    members = MemberDirectory.from_xml(MNIS_XML)
+
+    assert len(members) == 3
+    assert "Layla Moran" in members
+    assert "layla  moran" in members
+    assert members.lookup("Tobias Ellwood") == "Mr Tobias Ellwood"
+    assert "Diana Johnson" in members
+    assert "Diana Moran" not in members
+    assert "Rt Hon Diana Johnson MP" in members
+
+
+def test_wrong_title_is_not_a_member():
+    members = MemberDirectory.from_xml(MNIS_XML)
+
+    assert "Mr Tobias Ellwood" in members
+    assert "Mr. Tobias Ellwood MP" in members
+    assert "Sir Tobias Ellwood" not in members
+    assert "Ms Diana Johnson" not in members
+    # MNIS gives no title, so any title is accepted
+    assert members.lookup("Dr Layla Moran") == "Layla Moran"
+    # but the closest member is still suggested
+    assert members.suggest("Sir Tobias Ellwood").name == "Mr Tobias Ellwood"
+
+
+def test_member_matcher():
+    matcher = MemberMatcher(
+        ["Layla Moran", "Sarah Champion", "Dame Diana Johnson", "Wera Hobhouse"]
+    )
+
+    assert matcher.match("Dame Diana Johnson") == NameMatch("Dame Diana Johnson", 1.0)
+    assert matcher.match("Layla Morran").name == "Layla Moran"
+    assert matcher.match("Sarah Champian MP").name == "Sarah Champion"
+    assert matcher.match("Diana Jonson").name == "Dame Diana Johnson"
+    assert 0.5 <= matcher.match("Wera Hobhuose").score < 1
+    assert matcher.match("Totally Different") is None
+
+
+def test_cache_falls_back_to_saved_copy(tmp_path):
+    cache_file = tmp_path / "members.json"
+    stale = MemberDirectory.from_xml(MNIS_XML, fetched_at=time.time() - 3600)
+    stale.save(cache_file)
+
+    # nothing is listening on port 9 so the refresh fails
+    cache = MemberDirectoryCache(cache_file, ttl=60, url="http://127.0.0.1:9/")
+    cache.start_refresh()
+    members = cache.get(wait=5)
+    assert members.names == stale.names
+    assert MemberDirectory.load(cache_file) == stale
+
+    fresh = MemberDirectoryCache(cache_file, ttl=7200, url="http://127.0.0.1:9/")
+    assert fresh.get(wait=0).names == stale.names
+    # a fresh copy is used without a download
+    assert fresh._thread is None
+
+    missing = MemberDirectoryCache(tmp_path / "missing.json", url="http://127.0.0.1:9/")
+    assert len(missing.get()) == 0
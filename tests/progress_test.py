@@ -0,0 +1,65 @@
+import sys
+import threading
+from pathlib import Path
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker.progress import ProgressBus, ProgressUpdate
+
+
+def test_updates_are_batched():
+    updates: list[ProgressUpdate] = []
+    bus = ProgressBus(rate=1)
+    bus.subscribe(updates.append)
+
+    bar_id = bus.new_bar(100)
+    bus.message("first")
+    for done in range(1, 101):
+        bus.progress(bar_id, done, 100)
+    bus.message("second")
+    bus.end_bar(bar_id)
+    bus.close()
+
+    # everything published before end_bar arrives in one update
+    assert len(updates) == 1
+    update = updates[0]
+    assert update.events == [
+        ("new_bar", bar_id),
+        ("message", "first"),
+        ("message", "second"),
+        ("end_bar", bar_id),
+    ]
+    # only the latest progress is kept
+    assert update.bars[bar_id].percent == 100
+
+
+def test_one_worker_thread_for_concurrent_publishers():
+    started = []
+
+    class Bus(ProgressBus):
+        def _run(self):
+            started.append(threading.current_thread())
+            super()._run()
+
+    bus = Bus(rate=100)
+    updates: list[ProgressUpdate] = []
+    bus.subscribe(updates.append)
+    barrier = threading.Barrier(8)
+
+    def publish(i: int):
+        barrier.wait()
+        bus.message(f"from {i}")
+
+    threads = [threading.Thread(target=publish, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    bus.close()
+    bus._thread.join(5)
+
+    assert len(started) == 1
+    assert sorted(text for update in updates for _, text in update.events) == [
+        f"from {i}" for i in range(8)
+    ]
@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker import settings
+from lawchecker.startup_bench import measure, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | encodings
+import time:       200 |       1200 | site
+import time:       300 |        300 |   lxml.etree
+import time:       400 |        900 | lawchecker.utils
+import time:        50 |         50 | argparse
+"""
+
+
+def test_parse_importtime():
+    records = parse_importtime(IMPORTTIME)
+
+    # imports made by the interpreter itself (up to site) are ignored
+    assert [r.module for r in records] == ["lxml.etree", "lawchecker.utils", "argparse"]
+    assert [r.depth for r in records] == [1, 0, 0]
+    assert records[1].cumulative_us == 900
+
+
+def test_cli_help_does_not_import_reports_or_httpx():
+    for name in ("an_report", "compare_report", "web_amendments"):
+        result = measure(name)
+        assert result.returncode == 0, result.error
+
+        modules = {record.module for record in result.imports}
+        assert "httpx" not in modules
+        assert "asyncio" not in modules
+        # settings are only resolved (and the .env file read) when used
+        assert "dotenv" not in modules
+        assert "lawchecker.anr_post_processing_html" not in modules
+
+
+def test_settings_are_resolved_once():
+    assert settings.get_settings() is settings.get_settings()
+    assert settings.HTML_TEMPLATE == settings.get_settings().html_template
+    assert settings.get_settings().compare_report_template.exists()
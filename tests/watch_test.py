@@ -0,0 +1,55 @@
+import os
+import sys
+from pathlib import Path
+
+# the below line is only needed if you don't pip install the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lawchecker import watch
+from lawchecker.watch import FileWatcher, wait_for_changes
+
+
+def write(path: Path, text: str, mtime: float) -> Path:
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+    return path.resolve()
+
+
+def test_added_modified_and_removed_files(tmp_path):
+    folder = tmp_path / "papers"
+    folder.mkdir()
+    first = write(folder / "first.xml", "<a/>", 1000)
+    second = write(folder / "second.xml", "<b/>", 1000)
+    write(folder / "notes.txt", "not watched", 1000)
+    single = write(tmp_path / "single.xml", "<c/>", 1000)
+
+    watcher = FileWatcher([folder, tmp_path / "single.xml"])
+    assert sorted(watcher.files) == [first, second, single]
+    assert watcher.changes() == set()
+
+    # same size, newer modification time
+    write(folder / "first.xml", "<A/>", 2000)
+    # same modification time, different size
+    write(tmp_path / "single.xml", "<cc/>", 1000)
+    added = write(folder / "third.xml", "<d/>", 1000)
+    (folder / "second.xml").unlink()
+    write(folder / "more notes.txt", "not watched", 1000)
+
+    assert watcher.changes() == {first, single, added, second}
+    assert sorted(watcher.files) == [first, added, single]
+    assert watcher.changes() == set()
+
+    # a watched file which is put back is seen again
+    write(folder / "second.xml", "<b/>", 1000)
+    assert watcher.changes() == {second}
+
+
+def test_wait_for_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, "FILE_POLL_INTERVAL", 0.01)
+    paper = write(tmp_path / "paper.xml", "<a/>", 1000)
+    watcher = FileWatcher([tmp_path])
+
+    assert wait_for_changes(watcher, timeout=0.05) == set()
+
+    write(tmp_path / "paper.xml", "<a>changed</a>", 2000)
+    assert wait_for_changes(watcher, timeout=0) == {paper}